@@ -0,0 +1,371 @@
+"""A fake Mauro Data Mapper REST server for benchmarking pymauro without a real Mauro instance.
+
+The server keeps a generated catalogue of folders, data models, data classes, data elements, metadata and classifiers
+in memory and serves the endpoints used by pymauro.BaseClient: login and sessions, API keys, folders, data models,
+data classes, data elements, metadata, permissions, classifiers, codesets and versioned folders. Each response can be
+delayed to simulate network and server latency, and item descriptions padded to simulate larger payloads.
+
+Classes:
+    Catalogue
+    MockMauroServer
+
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+_DOMAINS = dict(folders="Folder", dataModels="DataModel", dataClasses="DataClass", dataElements="DataElement",
+                classifiers="Classifier")
+
+
+class Catalogue:
+    """
+    An in-memory catalogue generated from a shape: every folder holds data_models data models, each with classes
+    top-level data classes holding child_classes child data classes, and every data class holds elements data
+    elements. Every item has metadata metadata entries.
+
+    Attributes
+    ----------
+    folders : int
+        Number of top-level folders. Default value = 3
+    data_models : int
+        Number of data models per folder. Default value = 2
+    classes : int
+        Number of top-level data classes per data model. Default value = 5
+    child_classes : int
+        Number of child data classes per top-level data class. Default value = 2
+    elements : int
+        Number of data elements per data class. Default value = 5
+    metadata : int
+        Number of metadata entries per item. Default value = 2
+    classifiers : int
+        Number of classifiers, which classify the data models in turn. Default value = 5
+    description_size : int
+        Length of each item's description, to control payload size. Default value = 50
+
+    """
+
+    def __init__(self, folders=3, data_models=2, classes=5, child_classes=2, elements=5, metadata=2, classifiers=5,
+                 description_size=50):
+        self.lock = threading.Lock()
+        self.items = dict()
+        self.children = dict()
+        self.metadata = dict()
+        self.sessions = set()
+        self.user_id = str(uuid.uuid4())
+        self.description_size = description_size
+        self.logins = 0
+        self.refused_logins = 0
+        self.requests = 0
+        for folder_number in range(folders):
+            folder_id = self.add("Folder", None, "Folder " + str(folder_number))
+            for model_number in range(data_models):
+                model_id = self.add("DataModel", folder_id, "Data Model " + str(model_number), model=None)
+                for class_number in range(classes):
+                    class_id = self.add("DataClass", model_id, "Class " + str(class_number), model=model_id)
+                    self._add_elements(class_id, model_id, elements)
+                    for child_number in range(child_classes):
+                        child_id = self.add("DataClass", class_id, "Child " + str(child_number), model=model_id)
+                        self._add_elements(child_id, model_id, elements)
+        classifier_ids = [self.add("Classifier", None, "Classifier " + str(number)) for number in range(classifiers)]
+        if classifier_ids:
+            models = [item for item in self.items.values() if item['domainType'] == "DataModel"]
+            for number, model in enumerate(models):
+                classifier = self.items[classifier_ids[number % len(classifier_ids)]]
+                model['classifiers'] = [dict(id=classifier['id'], label=classifier['label'])]
+        for item_id in list(self.items):
+            for metadata_number in range(metadata):
+                self.add_metadata(item_id, "benchmark", "key " + str(metadata_number), "value")
+
+    def _add_elements(self, class_id, model_id, elements):
+        for element_number in range(elements):
+            self.add("DataElement", class_id, "Element " + str(element_number), model=model_id,
+                     dataType=dict(id=str(uuid.uuid4()), domainType="PrimitiveType", label="string"))
+
+    def add(self, domain_type, parent_id, label, model=None, **fields):
+        """
+        Adds an item and returns its id.
+        """
+        item_id = str(uuid.uuid4())
+        description = (label + " ") * (self.description_size // (len(label) + 1) + 1)
+        item = dict(id=item_id, domainType=domain_type, label=label, description=description[:self.description_size],
+                    lastUpdated=time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                    availableActions=["show", "update", "delete"], **fields)
+        if domain_type == "DataModel":
+            item.update(folder=parent_id, type="Data Asset", finalised=False, branchName="main")
+        elif domain_type == "DataClass":
+            item.update(model=model)
+            if parent_id != model:
+                item['parentDataClass'] = parent_id
+        elif domain_type == "DataElement":
+            item.update(model=model, dataClass=parent_id)
+        elif domain_type == "Folder" and parent_id is not None:
+            item['parentFolder'] = parent_id
+        with self.lock:
+            self.items[item_id] = item
+            self.children.setdefault(parent_id, []).append(item_id)
+        return item_id
+
+    def add_metadata(self, item_id, namespace, key, value):
+        """
+        Adds a metadata entry to an item and returns it.
+        """
+        entry = dict(id=str(uuid.uuid4()), namespace=namespace, key=key, value=value,
+                     lastUpdated=time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()))
+        with self.lock:
+            self.metadata.setdefault(item_id, []).append(entry)
+        return entry
+
+    def children_of(self, parent_id, domain_type):
+        """
+        The items of a domain type directly within parent_id, None being the root.
+        """
+        with self.lock:
+            return [self.items[child] for child in self.children.get(parent_id, ())
+                    if self.items[child]['domainType'] == domain_type]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Send each response's headers and body together, so Nagle's algorithm doesn't add delayed-ACK stalls
+    wbufsize = -1
+    disable_nagle_algorithm = True
+    catalogue = None
+    latency = 0.0
+    max_in_flight = None
+    overload_status = 429
+    in_flight = None
+    max_logins = None
+
+    def log_message(self, *args):
+        pass
+
+    def _wait(self):
+        """Waits before sending a prepared response, so that a slow response carries what was read beforehand."""
+        latency = self.latency.get(self.command, 0.0) if isinstance(self.latency, dict) else self.latency
+        if latency:
+            time.sleep(latency)
+
+    def _send(self, status, body=None, headers=None, wait=True):
+        data = b"" if body is None else json.dumps(body).encode()
+        if wait:
+            self._wait()
+        etag = '"' + hashlib.md5(data).hexdigest() + '"'
+        if self.command == "GET" and status == 200 and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if self.command == "GET":
+            self.send_header("ETag", etag)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    @staticmethod
+    def _page(items, query):
+        if query.get("all") == ["true"]:
+            return dict(count=len(items), items=items)
+        offset = int(query.get("offset", ["0"])[0])
+        limit = int(query.get("max", ["10"])[0])
+        return dict(count=len(items), items=items[offset:offset + limit])
+
+    def _authenticated(self):
+        if self.headers.get("apiKey"):
+            return True
+        match = re.search(r"JSESSIONID=([^;]+)", self.headers.get("Cookie", ""))
+        return bool(match and match.group(1) in self.catalogue.sessions)
+
+    def _handle(self):
+        if self.max_in_flight is None:
+            return self._respond()
+        with self.catalogue.lock:
+            overloaded = self.in_flight[0] >= self.max_in_flight
+            self.in_flight[0] += 1
+        try:
+            if overloaded:
+                length = int(self.headers.get("Content-Length") or 0)
+                self.rfile.read(length)
+                return self._send(self.overload_status, dict(status=self.overload_status, reason="Overloaded"),
+                                  wait=False)
+            return self._respond()
+        finally:
+            with self.catalogue.lock:
+                self.in_flight[0] -= 1
+
+    def _respond(self):
+        catalogue = self.catalogue
+        with catalogue.lock:
+            catalogue.requests += 1
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        segments = [segment for segment in url.path.split("/") if segment][1:]
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        if segments == ["authentication", "login"]:
+            if self.max_logins is not None and catalogue.logins >= self.max_logins:
+                with catalogue.lock:
+                    catalogue.refused_logins += 1
+                data = b"<html><body>Login is unavailable</body></html>"
+                self.send_response(500)
+                self.send_header("Content-Type", "text/html")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                return
+            session_id = uuid.uuid4().hex
+            with catalogue.lock:
+                catalogue.logins += 1
+                catalogue.sessions.add(session_id)
+            return self._send(200, dict(id=catalogue.user_id, emailAddress="benchmark@example.com"),
+                              {"Set-Cookie": "JSESSIONID=" + session_id + "; Path=/"})
+        if not self._authenticated():
+            return self._send(401, dict(status=401, reason="Unauthorized"))
+        try:
+            status, result = self._route(segments, query, body)
+        except KeyError:
+            status, result = 404, dict(status=404, path=url.path)
+        return self._send(status, result)
+
+    def _route(self, segments, query, body):
+        catalogue = self.catalogue
+        method = self.command
+        if segments[0] in ("session", "authentication"):
+            return 200, dict(authenticatedSession=True, applicationAdministrationSession=False)
+        if segments[0] == "catalogueUsers":
+            if method == "GET":
+                return 200, dict(count=0, items=[])
+            if method == "DELETE":
+                return 204, None
+            return 201 if method == "POST" else 200, dict(id=str(uuid.uuid4()), name=(body or {}).get('name'))
+        if segments[-1] == "catalogueItems":
+            catalogue.items[segments[-2]]
+            with catalogue.lock:
+                items = [item for item in catalogue.items.values()
+                         if any(classifier['id'] == segments[-2] for classifier in item.get('classifiers', ()))]
+            return 200, self._page(items, query)
+        if segments[-1] == "permissions":
+            user = dict(id=catalogue.user_id, emailAddress="benchmark@example.com")
+            return 200, dict(readableByEveryone=False, readableByAuthenticatedUsers=True, readableByUsers=[user],
+                             readableByGroups=[dict(id="readers", name="readers")], writeableByUsers=[user],
+                             writeableByGroups=[])
+        if len(segments) >= 3 and segments[2] == "metadata":
+            catalogue.items[segments[1]]
+            entries = catalogue.metadata.setdefault(segments[1], [])
+            if len(segments) == 3 and method == "POST":
+                return 201, catalogue.add_metadata(segments[1], body['namespace'], body['key'], body['value'])
+            if len(segments) == 3:
+                return 200, self._page(entries, query)
+            entry = [entry for entry in entries if entry['id'] == segments[3]][0]
+            if method == "PUT":
+                entry.update(body)
+            return 200, entry
+        if segments[0] in ("codeSets", "versionedFolders", "terminologies") or segments[-1] in (
+                "codeSets", "versionedFolders", "terminologies"):
+            return 200, dict(count=0, items=[])
+        # Collections and items, e.g. /folders/{id}/dataModels or /dataModels/{id}/dataClasses/{id}
+        if len(segments) % 2 == 1:
+            parent_id = segments[-2] if len(segments) > 1 else None
+            domain_type = _DOMAINS[segments[-1]]
+            if parent_id is not None:
+                catalogue.items[parent_id]
+            if method == "POST":
+                fields = dict((key, value) for key, value in body.items() if key != 'label')
+                model = segments[1] if segments[0] == "dataModels" else None
+                fields.pop('model', None)
+                return 201, catalogue.items[catalogue.add(domain_type, parent_id, body['label'], model=model,
+                                                          **fields)]
+            if parent_id is None and domain_type == "DataModel":
+                items = [item for item in catalogue.items.values() if item['domainType'] == "DataModel"]
+            else:
+                items = catalogue.children_of(parent_id, domain_type)
+            return 200, self._page(items, query)
+        item = catalogue.items[segments[-1]]
+        if method == "PUT":
+            item.update(body or {})
+        if method == "DELETE":
+            return 204, None
+        return 200, item
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+
+class MockMauroServer:
+    """
+    Serves a :class:`Catalogue` over HTTP on localhost from a background thread.
+
+    Attributes
+    ----------
+    catalogue : :class:`Catalogue`
+        (optional) The catalogue to serve. Default value = a Catalogue with default shape
+    latency : float or dict
+        Seconds to wait before sending each response once it has been prepared, or a dict of them by HTTP method,
+        e.g. dict(GET=0.5). Default value = 0
+    port : int
+        The port to listen on. Default value = 0 (any free port)
+    max_in_flight : int
+        (optional) Requests handled at once, beyond which requests are answered overload_status to simulate an
+        overloaded instance. Default value = None (no limit)
+    overload_status : int
+        The status requests beyond max_in_flight are answered with, e.g. 503 for an overloaded proxy.
+        Default value = 429
+    max_logins : int
+        (optional) Logins accepted, beyond which logging in is answered with an html error page rather than json,
+        to simulate a failing login. Default value = None (no limit)
+
+    Methods
+    -------
+    start
+    stop
+
+    """
+
+    def __init__(self, catalogue=None, latency=0.0, port=0, max_in_flight=None, max_logins=None,
+                 overload_status=429):
+        self.catalogue = catalogue if catalogue is not None else Catalogue()
+        handler = type("Handler", (_Handler,), dict(catalogue=self.catalogue, latency=latency,
+                                                    max_in_flight=max_in_flight, overload_status=overload_status,
+                                                    in_flight=[0],
+                                                    max_logins=max_logins))
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:" + str(self._server.server_address[1])
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Starts serving in a background thread.
+
+        :return: The server
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self):
+        """
+        Serves in the calling thread until stopped.
+        """
+        self._server.serve_forever()
+
+    def stop(self):
+        """
+        Stops serving and closes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
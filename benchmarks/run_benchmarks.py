@@ -0,0 +1,278 @@
+"""Benchmarks pymauro against a local mock Mauro server and writes the results as json.
+
+Each scenario is run --warmup times untimed, so that connections are open and caches are warm, then timed
+--repeat times, reporting the median requests per second and p50/p99 request latency of the runs, then run again
+under tracemalloc to measure peak memory. The mock server runs in a child process by default so that its own work
+does not count towards the client's time and memory; use --in-process to run it in a background thread instead.
+
+Results are written to stdout or --output. Passing a previous result file as --baseline compares the two runs and
+exits with status 1 if any scenario regressed by more than --tolerance. The p99 latency of a scenario is only
+compared when both runs timed at least --min-samples requests, as with fewer it is little more than the slowest one.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output results.json
+    python benchmarks/run_benchmarks.py --latency 0.005 --repeat 5 --baseline results.json
+
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymauro  # noqa: E402
+from mock_server import Catalogue, MockMauroServer  # noqa: E402
+
+
+class _LatencyCollector(pymauro.Metrics):
+    """Keeps the latency of every request so exact percentiles can be reported."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = []
+        self.errors = 0
+
+    def reset(self):
+        with self._lock:
+            self.latencies = []
+            self.errors = 0
+
+    def record_request(self, endpoint, status, elapsed, request_bytes, response_bytes, retries, reused, error=None):
+        with self._lock:
+            self.latencies.append(elapsed)
+            if error is not None or status is None or status >= 400:
+                self.errors += 1
+
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def _median(values):
+    values = sorted(value for value in values if value is not None)
+    if not values:
+        return None
+    middle = len(values) // 2
+    return values[middle] if len(values) % 2 else (values[middle - 1] + values[middle]) / 2
+
+
+def _single_get(client, context):
+    for number in range(context['calls']):
+        client.get_data_model(id_input=context['model_ids'][number % len(context['model_ids'])]).json()
+
+
+def _concurrent_get(client, context):
+    client.get_many_data_models(context['model_ids'], max_workers=context['workers'])
+    client.get_metadata_many("dataModels", context['model_ids'], max_workers=context['workers'])
+
+
+def _list_paging(client, context):
+    for model_id in context['model_ids']:
+        for _ in client.iter_data_classes(model_id, page_size=10):
+            pass
+
+
+def _list_streaming(client, context):
+    for model_id in context['model_ids']:
+        for _ in client.stream_data_classes(model_id):
+            pass
+
+
+def _tree_crawl(client, context):
+    for model_id in context['model_ids'][:context['crawls']]:
+        client.crawl_data_model(model_id, max_workers=context['workers'])
+
+
+def _bulk_import(client, context):
+    response = client.create_data_model(context['folder_id'], dict(label="Import " + str(time.time())))
+    data_classes = [dict(label="Class " + str(number),
+                         dataElements=[dict(label="Element " + str(element), dataType=dict(label="string"))
+                                       for element in range(context['import_elements'])])
+                    for number in range(context['import_classes'])]
+    results = client.import_data_classes(response.json()['id'], data_classes, max_workers=context['workers'])
+    failed = [result for result in results if not result.ok]
+    if failed:
+        raise RuntimeError("Bulk import failed for " + str(len(failed)) + " items, e.g. " + repr(failed[0]))
+
+
+SCENARIOS = dict(single_get=_single_get, concurrent_get=_concurrent_get, list_paging=_list_paging,
+                 list_streaming=_list_streaming, tree_crawl=_tree_crawl, bulk_import=_bulk_import)
+
+
+def _serve(connection, shape, latency, max_in_flight):
+    server = MockMauroServer(Catalogue(**shape), latency=latency, max_in_flight=max_in_flight)
+    connection.send(server.url)
+    server.serve_forever()
+
+
+def _run_scenario(name, url, context, measure_memory, adaptive, warmup=1, repeat=1):
+    collector = _LatencyCollector()
+    limiter = pymauro.AdaptiveLimiter(max_limit=max(8, context['workers'])) if adaptive else None
+    transport = pymauro.Transport(url, pool_size=context['workers'], metrics=collector, limiter=limiter)
+    client = pymauro.BaseClient(url, api_key="benchmark", transport=transport)
+    runs = []
+    try:
+        for _ in range(warmup):
+            SCENARIOS[name](client, context)
+        for _ in range(repeat):
+            collector.reset()
+            start = time.perf_counter()
+            SCENARIOS[name](client, context)
+            seconds = time.perf_counter() - start
+            runs.append(dict(requests=len(collector.latencies), errors=collector.errors, seconds=seconds,
+                             p50=_percentile(collector.latencies, 0.5), p99=_percentile(collector.latencies, 0.99)))
+    except Exception as error:  # e.g. the mock server answering 429 without an AdaptiveLimiter
+        client.close()
+        return dict(requests=len(collector.latencies), errors=collector.errors, failed=repr(error))
+    seconds = _median([run['seconds'] for run in runs])
+    result = dict(requests=_median([run['requests'] for run in runs]), errors=sum(run['errors'] for run in runs),
+                  seconds=seconds, repeats=repeat, samples=min(run['requests'] for run in runs),
+                  requests_per_second=_median([run['requests'] / run['seconds'] for run in runs if run['seconds']]),
+                  p50_ms=_milliseconds(_median([run['p50'] for run in runs])),
+                  p99_ms=_milliseconds(_median([run['p99'] for run in runs])))
+    if measure_memory:
+        tracemalloc.start()
+        SCENARIOS[name](client, context)
+        result['peak_memory_bytes'] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    client.close()
+    return result
+
+
+def _milliseconds(seconds):
+    return None if seconds is None else seconds * 1000
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, tolerance, min_samples=0):
+    """
+    Compares two result documents scenario by scenario.
+
+    :param results: dict - The current results
+    :param baseline: dict - The results to compare against
+    :param tolerance: float - The fractional change allowed before a scenario counts as regressed
+    :param min_samples: int - The requests both runs of a scenario must have timed for its p99 latency to be
+        compared. Results without a samples count, i.e. from before it was recorded, use their request count
+    :return: list of str - A description of each regression
+    """
+    regressions = []
+    for name, current in results['scenarios'].items():
+        previous = baseline.get('scenarios', {}).get(name)
+        if previous is None:
+            continue
+        checks = (("requests_per_second", -1), ("p99_ms", 1), ("peak_memory_bytes", 1))
+        for measure, worse in checks:
+            if current.get(measure) is None or not previous.get(measure):
+                continue
+            if measure == "p99_ms" and min(current.get('samples', current.get('requests') or 0),
+                                           previous.get('samples', previous.get('requests') or 0)) < min_samples:
+                print("%-16s %-20s skipped, fewer than %d samples" % (name, measure, min_samples), file=sys.stderr)
+                continue
+            change = (current[measure] - previous[measure]) / previous[measure]
+            print("%-16s %-20s %12.2f -> %12.2f (%+.1f%%)" % (name, measure, previous[measure], current[measure],
+                                                              change * 100), file=sys.stderr)
+            if change * worse > tolerance:
+                regressions.append(name + " " + measure + " changed by " + format(change, "+.1%"))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the mock server waits per request")
+    parser.add_argument("--description-size", type=int, default=200, help="characters per item description")
+    parser.add_argument("--folders", type=int, default=10)
+    parser.add_argument("--data-models", type=int, default=2)
+    parser.add_argument("--classes", type=int, default=20)
+    parser.add_argument("--child-classes", type=int, default=2)
+    parser.add_argument("--elements", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=8, help="concurrency of the concurrent scenarios")
+    parser.add_argument("--calls", type=int, default=200, help="requests made by single_get")
+    parser.add_argument("--crawls", type=int, default=3, help="data models crawled by tree_crawl")
+    parser.add_argument("--import-classes", type=int, default=20)
+    parser.add_argument("--import-elements", type=int, default=10)
+    parser.add_argument("--max-in-flight", type=int, help="requests the mock server handles at once before "
+                                                          "answering 429, to simulate an overloaded instance")
+    parser.add_argument("--adaptive", action="store_true", help="send requests through an AdaptiveLimiter")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory measurement")
+    parser.add_argument("--in-process", action="store_true", help="run the mock server in this process")
+    parser.add_argument("--output", help="file to write the json results to, instead of stdout")
+    parser.add_argument("--baseline", help="json results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed fractional regression")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs of each scenario before timing it")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs of each scenario, reporting the median")
+    parser.add_argument("--min-samples", type=int, default=100,
+                        help="requests a scenario must time in both runs for its p99 latency to be compared")
+    args = parser.parse_args(argv)
+    if args.warmup < 0 or args.repeat < 1:
+        parser.error("--warmup must be at least 0 and --repeat at least 1")
+
+    shape = dict(folders=args.folders, data_models=args.data_models, classes=args.classes,
+                 child_classes=args.child_classes, elements=args.elements, description_size=args.description_size)
+    process = None
+    if args.in_process:
+        server = MockMauroServer(Catalogue(**shape), latency=args.latency,
+                                 max_in_flight=args.max_in_flight).start()
+        url = server.url
+    else:
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_serve, args=(sender, shape, args.latency, args.max_in_flight),
+                                          daemon=True)
+        process.start()
+        url = receiver.recv()
+    try:
+        setup = pymauro.BaseClient(url, api_key="benchmark")
+        context = dict(model_ids=[model['id'] for model in setup.iter_data_models()],
+                       folder_id=next(setup.iter_folders())['id'], workers=args.workers, calls=args.calls,
+                       crawls=args.crawls, import_classes=args.import_classes,
+                       import_elements=args.import_elements)
+        setup.close()
+        scenarios = dict()
+        for name in args.scenarios:
+            print("Running " + name, file=sys.stderr)
+            scenarios[name] = _run_scenario(name, url, context, not args.no_memory, args.adaptive, args.warmup,
+                                            args.repeat)
+    finally:
+        if process is not None:
+            process.terminate()
+        else:
+            server.stop()
+
+    results = dict(meta=dict(timestamp=time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                             python=platform.python_version(), platform=platform.platform(), commit=_git_commit(),
+                             config=vars(args)),
+                   scenarios=scenarios)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file), args.tolerance, args.min_samples)
+        for regression in regressions:
+            print("Regression: " + regression, file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
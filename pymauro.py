@@ -9,13 +9,74 @@ Details on the endpoints themselves can be found at:
 https://maurodatamapper.github.io/rest-api/introduction/#testing
 
 Classes:
+    Result
+    ResponseCache
+    SQLiteCache
+    SyncState
+    ChangeSet
+    CatalogueIndex
+    CatalogueSnapshot
+    CSVWriter
+    NDJSONWriter
+    ColumnarTable
+    PermissionsAudit
+    MauroObject
+    Folder
+    DataModel
+    DataClass
+    DataElement
+    Metadata
+    Classifier
+    Metrics
+    MetricsRecorder
+    AdaptiveLimiter
+    Transport
     BaseClient
+    WriteBehindQueue
+    AsyncTransport
+    AsyncBaseClient
 
 Functions:
     test_my_url() - Not proven to work
+    to_typed() - Converts json responses to the typed objects above
+    iter_json_items() - Streams the items of a json response as they download
+    crawl_sharded() - Crawls a very large catalogue with a pool of worker processes
 
 """
+import array
+import asyncio
+import bisect
+import codecs
+import contextlib
+import csv
+import datetime
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import queue
+import re
+import shutil
+import sqlite3
+import ssl
+import struct
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 
 
 def test_my_url(url):
@@ -32,17 +93,4590 @@ returned. This function has not been proven to work - suspected endpoint mistake
     return response
 
 
-class BaseClient:
+class Result:
     """
-    A class to connect to a Mauro Data Mapper instance.
+    The outcome of one item of a bulk operation such as :meth:`BaseClient.import_data_classes`.
 
-    It is recommended that you provide both a username/password and API key as some methods only operate off the
-    provision of one and not the other.
+    Attributes
+    ----------
+    key
+        Identifies the item the result belongs to
+    value
+        The value produced for the item, e.g. the id of a created data class
+    response : :class:`Response`
+        The response to the item's request, or None if no request was needed or it could not be sent
+    error : Exception
+        The exception raised for the item, or None
 
-    The user must provide at least a username and password or an API key. A type error will return if the arguments
-    provided do not abide by this rule. When possible the called method will use the API key over the session id created
-    by login via username/password to prevent session time-outs.
+    """
+    __slots__ = ("key", "value", "response", "error")
+
+    def __init__(self, key, value=None, response=None, error=None):
+        self.key = key
+        self.value = value
+        self.response = response
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None and (self.response is None or self.response.ok)
+
+    def __repr__(self):
+        if self.error is not None:
+            return "Result(" + repr(self.key) + ", error=" + repr(self.error) + ")"
+        if self.response is not None and not self.response.ok:
+            return "Result(" + repr(self.key) + ", status=" + str(self.response.status_code) + ")"
+        return "Result(" + repr(self.key) + ", value=" + repr(self.value) + ")"
+
+
+_DOMAIN_TYPES = ["folders", "dataModels", "dataClasses", "dataElements", "dataTypes", "terminologies", "terms",
+                 "referenceDataModels"]
+
+
+def _check_domain_type(catalogue_item_domain_type):
+    if catalogue_item_domain_type not in _DOMAIN_TYPES:
+        raise ValueError("catalogueItemDomainType must be in " + str(_DOMAIN_TYPES))
+
+
+def _map_concurrent(function, keys, max_workers):
+    """
+    Calls function on each distinct key concurrently with up to max_workers threads, collecting a :class:`Result`
+    per key holding the response, its parsed json as value if successful, or the exception raised.
+
+    :param function: Callable taking a key and returning a :class:`Response' object
+    :param keys: Iterable of keys. Duplicates are requested once.
+    :param max_workers: int - Maximum number of calls in flight at once
+    :return: dict of key to :class:`Result`, in the order the keys were first given
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    keys = list(dict.fromkeys(keys))
+
+    def call(key):
+        response = None
+        try:
+            response = function(key)
+            return Result(key, value=response.json() if response.ok else None, response=response)
+        except (requests.RequestException, ValueError) as error:
+            return Result(key, response=response, error=error)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pymauro") as executor:
+        return dict((result.key, result) for result in executor.map(call, keys))
+
+
+def _run_tree(roots, visit, max_workers, max_pending=None):
+    """
+    Calls visit on every node of a tree, where visit returns the node's children. A node is only visited after its
+    parent, while siblings and unrelated subtrees are visited concurrently by up to max_workers threads.
+
+    By default every node is queued as soon as its parent has been visited. With max_pending, at most that many
+    nodes are queued at once and the rest wait on a stack, so the tree is walked depth first and the nodes held in
+    memory are bounded by the tree's depth times its breadth rather than its size.
+
+    :param roots: Iterable of the top-level nodes
+    :param visit: Callable taking a node and returning an iterable of its children
+    :param max_workers: int - Maximum number of nodes visited at once
+    :param max_pending: int - (optional) Maximum number of nodes queued at once
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    waiting = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pymauro") as executor:
+
+        def submit(nodes):
+            if max_pending is None:
+                pending.update(executor.submit(visit, node) for node in nodes)
+                return
+            waiting.extend(reversed(list(nodes)))
+            while waiting and len(pending) < max_pending:
+                pending.add(executor.submit(visit, waiting.pop()))
+
+        pending = set()
+        submit(roots)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    submit(future.result())
+                submit(())
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _endpoint_template(path):
+    """
+    The endpoint a path was requested from, with the query string dropped and ids replaced by {id},
+    e.g. /api/dataModels/{id}/dataClasses.
+
+    :param path: The path appended to the baseurl
+    :return: str
+    """
+    path = path.split('?', 1)[0]
+    return '/'.join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split('/'))
+
+
+_ID_SEGMENT = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|[0-9]+)$")
+
+
+def _request_key(identity, path, params=None):
+    """
+    Identifies a GET request by the user making it (hashed, so no credential is kept) and its path and params.
+
+    :return: tuple of (identity hash, path including any params)
+    """
+    identity = hashlib.sha256(str(identity).encode()).hexdigest()[:16]
+    if params:
+        path = path + ('&' if '?' in path else '?') + urlencode(sorted(dict(params).items()))
+    return identity, path
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _SingleFlight:
+    """
+    Coalesces concurrent identical calls: while a call for a key is in flight, further calls for the same key wait
+    for it and receive its result, or its exception, instead of making their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = dict()
+        self.coalesced = 0
+
+    def do(self, key, function, on_coalesced=None):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+        if not leader:
+            if on_coalesced is not None:
+                on_coalesced()
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def forget(self, predicate):
+        """
+        Stops later calls joining the calls in flight whose key matches predicate, so that they make their own.
+        Calls already waiting still receive the result.
+        """
+        with self._lock:
+            for key in [key for key in self._calls if predicate(key)]:
+                del self._calls[key]
+
+
+class _CacheEntry:
+    __slots__ = ("response", "expires", "etag", "last_modified")
+
+    def __init__(self, response, expires, etag=None, last_modified=None):
+        self.response = response
+        self.expires = expires
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def fresh(self):
+        return time.time() < self.expires
+
+    def validators(self):
+        headers = dict()
+        if self.etag is not None:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified is not None:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    A bounded, least-recently-used cache of successful GET responses for :class:`BaseClient`.
+
+    Cached responses are served without contacting the server until their time to live expires. An expired response
+    that carried an ETag or Last-Modified header is then revalidated with a conditional request, and kept if the
+    server answers 304 Not Modified. Requests that modify the catalogue invalidate every cached response for the
+    items in their path and every listing of the collection they belong to. Cached responses are indexed by the
+    ids and collections in their path, so that invalidating only touches the entries affected. Responses are cached
+    per API key or username, so a cache may be shared by clients of different users.
+
+    Attributes
+    ----------
+    max_entries : int
+        Maximum number of responses kept. The least recently used are evicted first. Default value = 1024
+    ttl : float
+        Seconds a response is served from the cache before being revalidated. Default value = 60
+    endpoint_ttls : dict
+        (optional) Time to live overrides by endpoint, e.g. {"/api/dataModels/{id}/metadata": 300, "/permissions": 0}.
+        A key matches every endpoint ending in it, the longest match winning, and a ttl of 0 disables caching.
+
+    Methods
+    -------
+    stats
+    clear
+    generation
+    store
+    invalidate
+
+    """
+
+    def __init__(self, max_entries=1024, ttl=60, endpoint_ttls=None):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.endpoint_ttls = dict(endpoint_ttls or {})
+        self._entries = OrderedDict()
+        self._tagged = dict()  # tag -> set of keys of the entries it affects, see _cache_tags
+        self._generation = 0  # Number of invalidations so far
+        self._invalidated = deque(maxlen=1024)  # (generation, tags) of the latest invalidations
+        self._lock = threading.Lock()
+        self._counters = dict(hits=0, misses=0, revalidations=0, stores=0, invalidations=0, evictions=0)
+
+    def __repr__(self):
+        return "Mauro Response Cache Object"
+
+    def __len__(self):
+        with self._lock:
+            return self._count()
+
+    def stats(self):
+        """
+        Counts of cache activity: hits (including revalidations), misses, revalidations, stores, invalidations and
+        evictions, plus the current number of entries.
+
+        :return: dict
+        """
+        with self._lock:
+            return dict(self._counters, entries=self._count())
+
+    def clear(self):
+        """
+        Removes every cached response.
+        """
+        with self._lock:
+            self._delete_all()
+
+    def ttl_for(self, path):
+        """
+        The time to live for a response from path, according to endpoint_ttls.
+
+        :param path: The path appended to the baseurl
+        :return: float
+        """
+        template = _endpoint_template(path)
+        matches = [key for key in self.endpoint_ttls if template.endswith(key)]
+        if not matches:
+            return self.ttl
+        return self.endpoint_ttls[max(matches, key=len)]
+
+    def make_key(self, identity, path, params=None):
+        return _request_key(identity, path, params)
+
+    def lookup(self, key):
+        """
+        The entry for key, or None. Counts a hit if the entry is fresh and a miss otherwise.
+        """
+        with self._lock:
+            entry = self._load(key)
+            if entry is not None and entry.fresh():
+                self._counters['hits'] += 1
+            else:
+                self._counters['misses'] += 1
+            return entry
+
+    def generation(self):
+        """
+        The number of invalidations made so far, to be read before sending a request whose response will be stored.
+
+        :return: int
+        """
+        with self._lock:
+            return self._generation
+
+    def store(self, key, path, response, generation=None):
+        """
+        Caches response if it was successful and its endpoint is cacheable.
+
+        :param key: The key from :meth:`make_key`
+        :param path: The path the response was requested from
+        :param response: :class:`Response' object
+        :param generation: int - (optional) The :meth:`generation` read before the request was sent. The response is
+            not cached if an invalidation affecting path has been made since, as it may predate the write. Only
+            invalidations made through this cache object are seen, not those of other processes.
+        """
+        ttl = self.ttl_for(path)
+        if response.status_code != 200 or ttl <= 0 or path.startswith(("/api/session/", "/api/authentication/")):
+            return
+        entry = _CacheEntry(response, time.time() + ttl, response.headers.get('ETag'),
+                            response.headers.get('Last-Modified'))
+        with self._lock:
+            if generation is not None and self._invalidated_since(generation, path):
+                return
+            self._save(key, entry)
+            self._counters['stores'] += 1
+            self._counters['evictions'] += self._evict()
+
+    def revalidated(self, key, entry):
+        """
+        Renews entry after the server confirmed it is unchanged.
+        """
+        entry.expires = time.time() + self.ttl_for(key[1])
+        with self._lock:
+            self._renew(key, entry)
+            self._counters['revalidations'] += 1
+            self._counters['hits'] += 1
+            self._counters['misses'] -= 1
+
+    def invalidate(self, path):
+        """
+        Removes the cached responses affected by a request modifying path: those for any item whose id is in path,
+        those below the first item in path, every listing of that item's collection, e.g. the data models of each
+        folder when a data model is modified, and every listing of the collection path ends in, e.g. /api/dataModels
+        when a data model is created in a folder.
+
+        :param path: The path of the modifying request
+        """
+        tags = _invalidation_tags(path)
+        with self._lock:
+            self._generation += 1
+            self._invalidated.append((self._generation, tags))
+            self._counters['invalidations'] += self._delete_tagged(tags)
+
+    def _invalidated_since(self, generation, path):
+        """Whether an invalidation made after generation may have affected path, to be called with the lock held."""
+        if generation == self._generation:
+            return False
+        if not self._invalidated or self._invalidated[0][0] > generation + 1:
+            return True  # Some of the invalidations since have been forgotten
+        tags = _cache_tags(path)
+        return any(number > generation and not tags.isdisjoint(invalidated)
+                   for number, invalidated in self._invalidated)
+
+    # Storage, always called with the lock held. Overridden by persistent caches such as SQLiteCache.
+
+    def _count(self):
+        return len(self._entries)
+
+    def _load(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def _save(self, key, entry):
+        if key not in self._entries:
+            for tag in _cache_tags(key[1]):
+                self._tagged.setdefault(tag, set()).add(key)
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+    def _renew(self, key, entry):
+        pass
+
+    def _untag(self, key):
+        for tag in _cache_tags(key[1]):
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
+
+    def _evict(self):
+        evicted = 0
+        while len(self._entries) > self.max_entries:
+            self._untag(self._entries.popitem(last=False)[0])
+            evicted += 1
+        return evicted
+
+    def _delete_tagged(self, tags):
+        stale = set()
+        for tag in tags:
+            stale.update(self._tagged.get(tag, ()))
+        for key in stale:
+            del self._entries[key]
+            self._untag(key)
+        return len(stale)
+
+    def _delete_all(self):
+        self._entries.clear()
+        self._tagged.clear()
+
+
+def _cache_tags(path):
+    """
+    The tags a cached response for path is indexed by: 'id:' plus each id in the path, 'root:' plus its first item,
+    e.g. 'root:api/dataModels/{id}', and 'list:' plus the collection if it is a listing, e.g. 'list:dataModels'.
+    """
+    segments = path.split('?', 1)[0].strip('/').split('/')
+    tags = set("id:" + segment for segment in segments if _ID_SEGMENT.match(segment))
+    if len(segments) > 2:
+        tags.add("root:" + '/'.join(segments[:3]))
+    if not _ID_SEGMENT.match(segments[-1]):
+        tags.add("list:" + segments[-1])
+    return tags
+
+
+def _invalidation_tags(path):
+    """
+    The tags of the cached responses affected by a request modifying path, see :meth:`ResponseCache.invalidate`:
+    those of each id in the path, of the first item in the path and of the listings of its collection, and of the
+    listings of the collection the path ends in, where an item is created.
+    """
+    segments = path.split('?', 1)[0].strip('/').split('/')
+    tags = set("id:" + segment for segment in segments if _ID_SEGMENT.match(segment))
+    if len(segments) > 2:
+        tags.add("root:" + '/'.join(segments[:3]))
+    if len(segments) > 1:
+        tags.add("list:" + segments[1])
+    if not _ID_SEGMENT.match(segments[-1]):
+        tags.add("list:" + segments[-1])  # An item created in, or an action on, a collection
+    return tags
+
+
+_SQLITE_CACHE_VERSION = 2  # The user_version of SQLiteCache files, bumped whenever their schema changes
+
+
+class SQLiteCache(ResponseCache):
+    """
+    A persistent :class:`ResponseCache` stored in an SQLite database, so that cached responses survive the process
+    and are shared by every process using the same file.
+
+    Response bodies are stored zlib compressed. Entries are revalidated with the server exactly as in
+    :class:`ResponseCache`, and the least recently used are evicted once either max_entries or max_bytes of
+    compressed bodies is exceeded. The number and size of the entries are kept up to date by triggers, and each
+    entry's tags in an indexed table, so that neither storing nor invalidating scans the whole cache. A file
+    written by an earlier version of pymauro is cleared when opened.
+
+    Attributes
+    ----------
+    path : str
+        The database file, created if it does not exist
+    max_entries : int
+        Maximum number of responses kept. Default value = 100000
+    max_bytes : int
+        Maximum total size in bytes of the compressed bodies kept. Default value = 1 GiB
+    ttl : float
+        Seconds a response is served from the cache before being revalidated. Default value = 3600
+    endpoint_ttls : dict
+        (optional) Time to live overrides by endpoint, see :class:`ResponseCache`
+
+    Methods
+    -------
+    stats
+    clear
+    invalidate
+    close
+
+    """
+
+    def __init__(self, path, max_entries=100000, max_bytes=2 ** 30, ttl=3600, endpoint_ttls=None):
+        super().__init__(max_entries=max_entries, ttl=ttl, endpoint_ttls=endpoint_ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA recursive_triggers=ON")  # So that INSERT OR REPLACE fires the delete trigger
+        with self._transaction():
+            if self._connection.execute("PRAGMA user_version").fetchone()[0] < _SQLITE_CACHE_VERSION:
+                for table in ("responses", "tags", "stats"):
+                    self._connection.execute("DROP TABLE IF EXISTS " + table)
+                self._connection.execute("PRAGMA user_version=" + str(_SQLITE_CACHE_VERSION))
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (identity TEXT, path TEXT, expires REAL, etag TEXT, "
+                "last_modified TEXT, status INTEGER, headers TEXT, url TEXT, encoding TEXT, body BLOB, "
+                "size INTEGER, accessed REAL, PRIMARY KEY (identity, path))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+            # The tags of each entry, see _cache_tags, so that invalidating is a single indexed DELETE
+            self._connection.execute("CREATE TABLE IF NOT EXISTS tags (tag TEXT, identity TEXT, path TEXT, "
+                                     "PRIMARY KEY (tag, identity, path)) WITHOUT ROWID")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS tags_entry ON tags (identity, path)")
+            # The number and total size of the entries, kept by the triggers below
+            self._connection.execute("CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY CHECK (id = 0), "
+                                     "entries INTEGER, size INTEGER)")
+            self._connection.execute("INSERT OR IGNORE INTO stats VALUES (0, 0, 0)")
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN "
+                "UPDATE stats SET entries = entries + 1, size = size + new.size; END")
+            self._connection.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN "
+                "UPDATE stats SET entries = entries - 1, size = size - old.size; "
+                "DELETE FROM tags WHERE identity = old.identity AND path = old.path; END")
+
+    def __repr__(self):
+        return "Mauro SQLite Cache Object"
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        self._connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._connection.execute("ROLLBACK")
+            raise
+        self._connection.execute("COMMIT")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+    def stats(self):
+        """
+        Counts of cache activity by this process, see :meth:`ResponseCache.stats`, plus the current number of
+        entries and total size of the compressed bodies in the database.
+
+        :return: dict
+        """
+        with self._lock:
+            entries, size = self._connection.execute("SELECT entries, size FROM stats").fetchone()
+            return dict(self._counters, entries=entries, bytes=size)
+
+    def _count(self):
+        return self._connection.execute("SELECT entries FROM stats").fetchone()[0]
+
+    def _load(self, key):
+        row = self._connection.execute(
+            "SELECT expires, etag, last_modified, status, headers, url, encoding, body FROM responses "
+            "WHERE identity = ? AND path = ?", key).fetchone()
+        if row is None:
+            return None
+        self._connection.execute("UPDATE responses SET accessed = ? WHERE identity = ? AND path = ?",
+                                 (time.time(),) + tuple(key))
+        expires, etag, last_modified, status, headers, url, encoding, body = row
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(json.loads(headers))
+        response.url = url
+        response.encoding = encoding
+        response._content = zlib.decompress(body)
+        return _CacheEntry(response, expires, etag, last_modified)
+
+    def _save(self, key, entry):
+        response = entry.response
+        body = zlib.compress(response.content)
+        with self._transaction():
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                tuple(key) + (entry.expires, entry.etag, entry.last_modified, response.status_code,
+                              json.dumps(dict(response.headers)), response.url, response.encoding, body, len(body),
+                              time.time()))
+            self._connection.executemany("INSERT OR IGNORE INTO tags VALUES (?, ?, ?)",
+                                         [(tag,) + tuple(key) for tag in _cache_tags(key[1])])
+
+    def _renew(self, key, entry):
+        self._connection.execute("UPDATE responses SET expires = ? WHERE identity = ? AND path = ?",
+                                 (entry.expires,) + tuple(key))
+
+    def _evict(self):
+        entries, size = self._connection.execute("SELECT entries, size FROM stats").fetchone()
+        evicted = 0
+        while entries > self.max_entries or size > self.max_bytes:
+            oldest = self._connection.execute(
+                "SELECT identity, path, size FROM responses ORDER BY accessed LIMIT 100").fetchall()
+            if not oldest:
+                break
+            for identity, path, entry_size in oldest:
+                if entries <= self.max_entries and size <= self.max_bytes:
+                    break
+                self._connection.execute("DELETE FROM responses WHERE identity = ? AND path = ?", (identity, path))
+                entries -= 1
+                size -= entry_size
+                evicted += 1
+        return evicted
+
+    def _delete_tagged(self, tags):
+        return self._connection.execute(
+            "DELETE FROM responses WHERE (identity, path) IN (SELECT identity, path FROM tags WHERE tag IN ("
+            + ", ".join("?" * len(tags)) + "))", tuple(tags)).rowcount
+
+    def _delete_all(self):
+        with self._transaction():
+            self._connection.execute("DELETE FROM responses")
+
+
+def _watermark(item):
+    """What identifies a version of an item: its lastUpdated, and its version if it has one."""
+    return [item.get('lastUpdated'), item.get('modelVersion') or item.get('documentationVersion')]
+
+
+_PATH_PREFIXES = dict(folders="fo", dataModels="dm", dataClasses="dc", dataElements="de")
+
+
+def _child_listings(kind, item_id, data_model_id):
+    """The listings that hold the children of an item of a kind, as (kind, parent id, data model id) tasks."""
+    if kind == "folders":
+        return [("folders", item_id, None), ("dataModels", item_id, None)]
+    if kind == "dataModels":
+        return [("dataClasses", item_id, item_id)]
+    if kind == "dataClasses":
+        return [("dataClasses", item_id, data_model_id), ("dataElements", item_id, data_model_id)]
+    return []
+
+
+class SyncState:
+    """
+    The watermarks recorded by :meth:`BaseClient.sync_catalogue`: for every item synced, its kind, parent, data
+    model and the lastUpdated and version it had when last seen. The state is kept in memory and, if a path is given,
+    loaded from and saved to a json file so that each run only fetches what changed since the previous one.
+
+    Attributes
+    ----------
+    path : str
+        (optional) The json file to load the state from and save it to. Default value = None (memory only)
+    synced : str
+        When the state was last saved, as an ISO 8601 UTC time, or None
+
+    Methods
+    -------
+    get
+    save
+    clear
+
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.synced = None
+        self._items = dict()  # id -> [kind, parent id, data model id, watermark]
+        self._children = dict()  # parent id -> set of child ids
+        if path is not None:
+            try:
+                with open(path) as state_file:
+                    data = json.load(state_file)
+            except FileNotFoundError:
+                data = None
+            if data is not None:
+                self.synced = data.get('synced')
+                for item_id, entry in data['items'].items():
+                    self._put(item_id, entry)
+
+    def __repr__(self):
+        return "Mauro Sync State Object (" + str(len(self._items)) + " items)"
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def get(self, item_id):
+        """
+        The recorded entry for an item.
+
+        :param item_id: The item id
+        :return: dict with 'kind', 'parent', 'dataModel' and 'watermark', or None if the item is not recorded
+        """
+        entry = self._items.get(item_id)
+        if entry is None:
+            return None
+        return dict(kind=entry[0], parent=entry[1], dataModel=entry[2], watermark=entry[3])
+
+    def save(self):
+        """
+        Writes the state to its path, replacing the previous file only once the new one is complete.
+        """
+        self.synced = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        if self.path is None:
+            return
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as state_file:
+            json.dump(dict(synced=self.synced, items=self._items), state_file, separators=(',', ':'))
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        """
+        Forgets every item, so that the next sync fetches and reports the whole catalogue as added.
+        """
+        self._items.clear()
+        self._children.clear()
+
+    def _put(self, item_id, entry):
+        previous = self._items.get(item_id)
+        if previous is not None and previous[1] != entry[1]:
+            self._children.get(previous[1], set()).discard(item_id)
+        self._items[item_id] = entry
+        self._children.setdefault(entry[1], set()).add(item_id)
+
+    def _children_of(self, parent_id, kind):
+        return [child for child in self._children.get(parent_id, ()) if self._items[child][0] == kind]
+
+    def _remove(self, item_id, keep=()):
+        """Forgets an item and everything below it except the items in keep, returning the forgotten entries."""
+        removed = []
+        stack = [item_id]
+        while stack:
+            current = stack.pop()
+            if current in keep:
+                continue
+            entry = self._items.pop(current, None)
+            if entry is None:
+                continue
+            self._children.get(entry[1], set()).discard(current)
+            stack.extend(self._children.pop(current, ()))
+            removed.append(dict(id=current, kind=entry[0], parent=entry[1], dataModel=entry[2], watermark=entry[3]))
+        return removed
+
+
+class ChangeSet:
+    """
+    The changes found by :meth:`BaseClient.sync_catalogue`.
+
+    Attributes
+    ----------
+    added : list of dict
+        Items not seen by the previous sync, as listed by the server
+    modified : list of dict
+        Items whose lastUpdated or version changed, or that moved to another parent, as listed by the server
+    deleted : list of dict
+        Items no longer found, with everything recorded below them, as their :meth:`SyncState.get` entry plus 'id'
+    listings : int
+        Number of item listings fetched to find the changes
+
+    """
+    __slots__ = ("added", "modified", "deleted", "listings")
+
+    def __init__(self):
+        self.added = []
+        self.modified = []
+        self.deleted = []
+        self.listings = 0
+
+    def __len__(self):
+        return len(self.added) + len(self.modified) + len(self.deleted)
+
+    def __repr__(self):
+        return "ChangeSet(added=" + str(len(self.added)) + ", modified=" + str(len(self.modified)) + \
+            ", deleted=" + str(len(self.deleted)) + ")"
+
+
+_KINDS = dict(Folder="folders", VersionedFolder="folders", DataModel="dataModels", DataClass="dataClasses",
+              DataElement="dataElements", Classifier="classifiers")
+
+
+def _kind(item):
+    """The endpoint name for an item's domain type, e.g. 'dataClasses' for a DataClass."""
+    domain_type = item.get('domainType') or ""
+    return _KINDS.get(domain_type) or domain_type[:1].lower() + domain_type[1:] + "s"
+
+
+class CatalogueIndex:
+    """
+    A local index over a snapshot of the catalogue, built by :meth:`BaseClient.index_catalogue`, that answers
+    queries from memory without requests to the server.
+
+    Items are indexed by kind, by label (case-insensitively), by metadata namespace, key and value, and by
+    classifier id and label, and their parent/child links are kept so that a subtree can be walked. Queries look up
+    the most selective index and filter the few candidates it returns, so they take time in proportion to the
+    number of matches rather than the size of the catalogue. Results are returned in the order items were added.
+
+    An index can be read from several threads once built, but must not be added to while being queried.
+
+    Methods
+    -------
+    from_ndjson
+    add_item
+    add_metadata
+    add_classifier
+    get
+    kind
+    metadata
+    parent
+    children
+    ancestors
+    descendants
+    find_by_label
+    match_label
+    find_by_metadata
+    find_by_classifier
+    write_snapshot
+
+    """
+
+    def __init__(self):
+        self._items = dict()
+        self._kinds = dict()
+        self._parents = dict()
+        self._children = dict()
+        self._metadata = dict()
+        self._by_kind = dict()
+        self._by_label = dict()
+        self._by_namespace = dict()
+        self._by_key = dict()
+        self._by_key_value = dict()
+        self._by_classifier = dict()
+        self._classified = OrderedDict()  # (item id, classifier id) -> classifier label, for write_snapshot
+        self._classifier_ids = dict()  # item id -> ids of the classifiers classifying it
+
+    def __repr__(self):
+        return "Mauro Catalogue Index Object (" + str(len(self._items)) + " items)"
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    @staticmethod
+    def _index(index, term, item_id):
+        index.setdefault(term, dict())[item_id] = None  # A dict as an insertion ordered set
+
+    @classmethod
+    def from_ndjson(cls, path):
+        """
+        Loads the output of :func:`crawl_sharded`: one json object per line holding an 'item' and its 'parent' id.
+
+        :param path: str - The file to read
+        :return: :class:`CatalogueIndex`
+        """
+        index = cls()
+        with open(path, encoding="utf-8") as lines:
+            for line in lines:
+                record = json.loads(line)
+                index.add_item(record['item'], record.get('parent'))
+        return index
+
+    def add_item(self, item, parent_id=None, kind=None):
+        """
+        Adds an item, replacing any item with the same id together with the metadata and classifiers indexed for it.
+        Its metadata is added separately, as are classifiers not listed in the item's 'classifiers'.
+
+        :param item: dict - The item as returned by the server
+        :param parent_id: (optional) The id of the folder, data model or data class holding the item
+        :param kind: str - (optional) The kind of item, e.g. 'dataClasses'. Default value = from its domainType
+        """
+        item_id = item['id']
+        kind = kind if kind is not None else _kind(item)
+        if item_id in self._items:
+            self._unlink(item_id)
+        self._items[item_id] = item
+        self._kinds[item_id] = kind
+        self._parents[item_id] = parent_id
+        if parent_id is not None:
+            self._children.setdefault(parent_id, []).append(item_id)
+        self._index(self._by_kind, kind, item_id)
+        self._index(self._by_label, str(item.get('label', "")).lower(), item_id)
+        for classifier in item.get('classifiers') or ():
+            self.add_classifier(item_id, classifier)
+
+    def _unlink(self, item_id):
+        """Removes a replaced item from its parent and every index, dropping its metadata and classifiers."""
+        siblings = self._children.get(self._parents.get(item_id))
+        if siblings is not None and item_id in siblings:
+            siblings.remove(item_id)
+        self._by_kind.get(self._kinds[item_id], {}).pop(item_id, None)
+        self._by_label.get(str(self._items[item_id].get('label', "")).lower(), {}).pop(item_id, None)
+        for entry in self._metadata.pop(item_id, ()):
+            self._by_namespace.get(entry.get('namespace'), {}).pop(item_id, None)
+            self._by_key.get(entry.get('key'), {}).pop(item_id, None)
+            self._by_key_value.get((entry.get('key'), entry.get('value')), {}).pop(item_id, None)
+        for classifier_id in self._classifier_ids.pop(item_id, ()):
+            label = self._classified.pop((item_id, classifier_id), None)
+            self._by_classifier.get(classifier_id, {}).pop(item_id, None)
+            if label is not None:
+                self._by_classifier.get(str(label).lower(), {}).pop(item_id, None)
+
+    def add_metadata(self, item_id, entries):
+        """
+        Adds metadata entries to an item.
+
+        :param item_id: The item id
+        :param entries: Iterable of dict - Metadata entries as returned by the server, with 'namespace', 'key'
+            and 'value'
+        """
+        item_metadata = self._metadata.setdefault(item_id, [])
+        for entry in entries:
+            item_metadata.append(entry)
+            self._index(self._by_namespace, entry.get('namespace'), item_id)
+            self._index(self._by_key, entry.get('key'), item_id)
+            self._index(self._by_key_value, (entry.get('key'), entry.get('value')), item_id)
+
+    def add_classifier(self, item_id, classifier):
+        """
+        Records that an item is classified by a classifier.
+
+        :param item_id: The item id
+        :param classifier: dict - The classifier as returned by the server, with 'id' and 'label'
+        """
+        self._index(self._by_classifier, classifier.get('id'), item_id)
+        self._index(self._classifier_ids, item_id, classifier.get('id'))
+        self._classified[(item_id, classifier.get('id'))] = classifier.get('label')
+        if classifier.get('label') is not None:
+            self._index(self._by_classifier, str(classifier['label']).lower(), item_id)
+
+    def get(self, item_id):
+        """
+        :param item_id: The item id
+        :return: dict - The item, or None if it is not indexed
+        """
+        return self._items.get(item_id)
+
+    def kind(self, item_id):
+        """
+        :param item_id: The item id
+        :return: str - The kind of the item, e.g. 'dataClasses', or None if it is not indexed
+        """
+        return self._kinds.get(item_id)
+
+    def metadata(self, item_id):
+        """
+        :param item_id: The item id
+        :return: list of dict - The item's metadata entries
+        """
+        return list(self._metadata.get(item_id, ()))
+
+    def parent(self, item_id):
+        """
+        :param item_id: The item id
+        :return: dict - The folder, data model or data class holding the item, or None
+        """
+        return self._items.get(self._parents.get(item_id))
+
+    def children(self, item_id, kind=None):
+        """
+        :param item_id: The item id
+        :param kind: str - (optional) Only children of this kind, e.g. 'dataElements'
+        :return: list of dict - The items directly held by the item
+        """
+        return [self._items[child] for child in self._children.get(item_id, ())
+                if kind is None or self._kinds[child] == kind]
+
+    def ancestors(self, item_id):
+        """
+        :param item_id: The item id
+        :return: list of dict - The item's parent, its parent's parent and so on up to a top-level folder
+        """
+        ancestors = []
+        parent_id = self._parents.get(item_id)
+        while parent_id is not None and parent_id in self._items:
+            ancestors.append(self._items[parent_id])
+            parent_id = self._parents.get(parent_id)
+        return ancestors
+
+    def descendants(self, item_id, kind=None):
+        """
+        :param item_id: The item id
+        :param kind: str - (optional) Only descendants of this kind
+        :return: list of dict - Every item below the item, parents before their children
+        """
+        descendants = []
+        queue = list(self._children.get(item_id, ()))
+        for child in queue:
+            if kind is None or self._kinds[child] == kind:
+                descendants.append(self._items[child])
+            queue.extend(self._children.get(child, ()))
+        return descendants
+
+    def _select(self, candidates, kind, within, predicate=None):
+        """The items among candidates of a kind, below within, and passing predicate."""
+        if kind is not None:
+            of_kind = self._by_kind.get(kind, {})
+            if len(of_kind) < len(candidates):
+                candidates, of_kind = of_kind, candidates
+            candidates = [item_id for item_id in candidates if item_id in of_kind]
+        return [self._items[item_id] for item_id in candidates
+                if item_id in self._items
+                and (within is None or any(ancestor['id'] == within for ancestor in self.ancestors(item_id)))
+                and (predicate is None or predicate(item_id))]
+
+    def find_by_label(self, label, kind=None, within=None):
+        """
+        Finds the items with a label, ignoring case.
+
+        :param label: str - The label
+        :param kind: str - (optional) Only items of this kind, e.g. 'dataClasses'
+        :param within: (optional) Only items below this item id
+        :return: list of dict
+        """
+        return self._select(self._by_label.get(str(label).lower(), {}), kind, within)
+
+    def match_label(self, pattern, kind=None, within=None):
+        """
+        Finds the items whose label matches a regular expression, ignoring case. The pattern is tested once per
+        distinct label rather than once per item.
+
+        :param pattern: str or compiled pattern - Searched for anywhere in the label, see :func:`re.search`
+        :param kind: str - (optional) Only items of this kind
+        :param within: (optional) Only items below this item id
+        :return: list of dict
+        """
+        pattern = re.compile(pattern, re.IGNORECASE) if isinstance(pattern, str) else pattern
+        candidates = dict()
+        for label, item_ids in self._by_label.items():
+            if pattern.search(label):
+                candidates.update(item_ids)
+        return self._select(candidates, kind, within)
+
+    def find_by_metadata(self, key=None, value=None, namespace=None, kind=None, within=None):
+        """
+        Finds the items with a metadata entry matching every one of key, value and namespace given.
+
+        :param key: str - (optional) The metadata key
+        :param value: str - (optional) The metadata value
+        :param namespace: str - (optional) The metadata namespace
+        :param kind: str - (optional) Only items of this kind, e.g. 'dataElements'
+        :param within: (optional) Only items below this item id
+        :return: list of dict
+        """
+        if key is None and value is None and namespace is None:
+            raise TypeError("You must provide at least one of key, value and namespace.")
+        if key is not None and value is not None:
+            candidates = self._by_key_value.get((key, value), {})
+        elif key is not None:
+            candidates = self._by_key.get(key, {})
+        elif namespace is not None:
+            candidates = self._by_namespace.get(namespace, {})
+        else:
+            candidates = dict()
+            for (_, entry_value), item_ids in self._by_key_value.items():
+                if entry_value == value:
+                    candidates.update(item_ids)
+
+        def matches(item_id):
+            return any((key is None or entry.get('key') == key) and (value is None or entry.get('value') == value)
+                       and (namespace is None or entry.get('namespace') == namespace)
+                       for entry in self._metadata.get(item_id, ()))
+
+        return self._select(candidates, kind, within, matches)
+
+    def find_by_classifier(self, classifier, kind=None, within=None):
+        """
+        Finds the items classified by a classifier.
+
+        :param classifier: str - The classifier id, or its label ignoring case
+        :param kind: str - (optional) Only items of this kind
+        :param within: (optional) Only items below this item id
+        :return: list of dict
+        """
+        candidates = self._by_classifier.get(classifier) or self._by_classifier.get(str(classifier).lower(), {})
+        return self._select(candidates, kind, within)
+
+    def write_snapshot(self, path):
+        """
+        Writes the index to a compact binary file that :class:`CatalogueSnapshot` opens without parsing it.
+
+        Every distinct string - ids, labels, kinds and metadata - is stored once in a string table and referred to
+        by number. Each item is a fixed-size record of string numbers and the record numbers of its parent, its
+        children and its metadata, and the rest of the item's json is stored separately and only decoded when the
+        item is read. Each classifier link added by :meth:`add_classifier` is stored as the classifier's id and label
+        strings and the item's record number. Tables of item records sorted by id and by label allow lookups by
+        binary search. The file is written to a temporary name and then moved into place, so readers never see a
+        partial snapshot.
+
+        :param path: str - The file to write
+        """
+        numbers = dict((item_id, number) for number, item_id in enumerate(self._items))
+        strings = dict()
+
+        def intern(value):
+            if value is None:
+                return _NONE
+            value = str(value)
+            number = strings.get(value)
+            if number is None:
+                number = strings[value] = len(strings)
+            return number
+
+        nodes = bytearray()
+        children = array.array('I')
+        metadata = array.array('I')
+        extras = []
+        for item_id, item in self._items.items():
+            parent = numbers.get(self._parents.get(item_id), _NONE)
+            child_numbers = [numbers[child] for child in self._children.get(item_id, ())]
+            entries = self._metadata.get(item_id, ())
+            nodes += _SNAPSHOT_NODE.pack(intern(item_id), intern(item.get('label')), intern(self._kinds[item_id]),
+                                         parent, len(children), len(child_numbers), len(metadata) // 3, len(entries))
+            children.extend(child_numbers)
+            for entry in entries:
+                metadata.extend((intern(entry.get('namespace')), intern(entry.get('key')),
+                                 intern(entry.get('value'))))
+            extras.append(json.dumps(dict((key, value) for key, value in item.items() if key not in ('id', 'label')),
+                                     separators=(',', ':')).encode())
+        classified = array.array('I')
+        for (item_id, classifier_id), label in self._classified.items():
+            if item_id in numbers:
+                classified.extend((intern(classifier_id), intern(label), numbers[item_id]))
+        string_data = [value.encode() for value in strings]
+        ids = [str(item_id) for item_id in self._items]
+        by_id = array.array('I', sorted(range(len(ids)), key=ids.__getitem__))
+        labels = ["" if item.get('label') is None else str(item['label']).lower() for item in self._items.values()]
+        by_label = array.array('I', sorted(range(len(numbers)), key=labels.__getitem__))
+
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as snapshot:
+            snapshot.write(bytes(_SNAPSHOT_HEADER.size))
+            sections = []
+            for section in (_offsets(string_data), b"".join(string_data), nodes, children.tobytes(),
+                            metadata.tobytes(), _offsets(extras), b"".join(extras), by_id.tobytes(),
+                            by_label.tobytes(), classified.tobytes()):
+                sections.append(snapshot.tell())
+                snapshot.write(section)
+            snapshot.seek(0)
+            snapshot.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, len(numbers), len(strings), len(metadata) // 3,
+                                                 len(classified) // 3, *sections))
+        os.replace(temporary, path)
+
+
+_NONE = 0xFFFFFFFF  # The string or record number standing for None in a snapshot
+_SNAPSHOT_MAGIC = b"PYMAURO2"
+# Magic, then counts of items, strings, metadata entries and classifier links, then the file offsets of the
+# sections in order: string offsets, string data, item records, children, metadata, extra offsets, extra data,
+# by id, by label, classifier links
+_SNAPSHOT_HEADER = struct.Struct("<8sIIII10Q")
+# Item record: id, label and kind strings, parent record, first child and count, first metadata entry and count
+_SNAPSHOT_NODE = struct.Struct("<8I")
+_SNAPSHOT_ENTRY = struct.Struct("<3I")  # Metadata entry: namespace, key and value strings
+_SNAPSHOT_LINK = struct.Struct("<3I")  # Classifier link: classifier id and label strings, item record
+
+
+def _offsets(blobs):
+    """The start of each blob followed by the end of the last, as a table of 64-bit offsets."""
+    offsets = array.array('Q', [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return offsets.tobytes()
+
+
+class CatalogueSnapshot:
+    """
+    A read-only view of a snapshot written by :meth:`CatalogueIndex.write_snapshot`, memory-mapped rather than read
+    so that opening it takes constant time whatever its size, and processes opening the same file share its pages.
+
+    Nothing is decoded until it is asked for: looking up an item by id or label is a binary search of the sorted
+    record tables, and an item's json is only parsed when it is read. Use :meth:`to_index` to load the whole
+    snapshot into a :class:`CatalogueIndex` for metadata and classifier queries.
+
+    A snapshot may be read from several threads at once.
+
+    Attributes
+    ----------
+    path : str
+        The snapshot file
+
+    Methods
+    -------
+    get
+    kind
+    metadata
+    parent
+    children
+    ancestors
+    find_by_label
+    to_index
+    close
+
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as snapshot:
+            self._map = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count, self._strings, self._entries, self._links, *sections = _SNAPSHOT_HEADER.unpack_from(
+            self._map, 0)
+        if magic != _SNAPSHOT_MAGIC:
+            self._map.close()
+            raise ValueError(str(path) + " is not a catalogue snapshot written by this version of pymauro.")
+        (self._string_offsets, self._string_data, self._nodes, self._children, self._metadata, self._extra_offsets,
+         self._extra_data, self._by_id, self._by_label, self._classified) = sections
+
+    def __repr__(self):
+        return "Mauro Catalogue Snapshot Object (" + str(self._count) + " items)"
+
+    def __len__(self):
+        return self._count
+
+    def __contains__(self, item_id):
+        return self._find(item_id) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Unmaps the file. Items already read remain usable.
+        """
+        self._map.close()
+
+    def _string(self, number):
+        if number == _NONE:
+            return None
+        start, end = struct.unpack_from("<2Q", self._map, self._string_offsets + number * 8)
+        return self._map[self._string_data + start:self._string_data + end].decode()
+
+    def _node(self, number):
+        return _SNAPSHOT_NODE.unpack_from(self._map, self._nodes + number * _SNAPSHOT_NODE.size)
+
+    def _u32(self, table, position):
+        return struct.unpack_from("<I", self._map, table + position * 4)[0]
+
+    def _search(self, table, target, key):
+        """The position of the first record in a sorted table whose key is not less than target."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if key(self._u32(table, middle)) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, item_id):
+        item_id = str(item_id)
+        position = self._search(self._by_id, item_id, lambda number: self._string(self._node(number)[0]))
+        if position < self._count:
+            number = self._u32(self._by_id, position)
+            if self._string(self._node(number)[0]) == item_id:
+                return number
+        return None
+
+    def _item(self, number):
+        item_id, label = self._node(number)[:2]
+        start, end = struct.unpack_from("<2Q", self._map, self._extra_offsets + number * 8)
+        item = json.loads(self._map[self._extra_data + start:self._extra_data + end])
+        item['id'] = self._string(item_id)
+        if label != _NONE:
+            item['label'] = self._string(label)
+        return item
+
+    def get(self, item_id):
+        """
+        :param item_id: The item id
+        :return: dict - The item, or None if it is not in the snapshot
+        """
+        number = self._find(item_id)
+        return None if number is None else self._item(number)
+
+    def kind(self, item_id):
+        """
+        :param item_id: The item id
+        :return: str - The kind of the item, e.g. 'dataClasses', or None if it is not in the snapshot
+        """
+        number = self._find(item_id)
+        return None if number is None else self._string(self._node(number)[2])
+
+    def metadata(self, item_id):
+        """
+        :param item_id: The item id
+        :return: list of dict - The item's metadata entries, with 'namespace', 'key' and 'value'
+        """
+        number = self._find(item_id)
+        return [] if number is None else self._entries_of(number)
+
+    def _entries_of(self, number):
+        first, count = self._node(number)[6:8]
+        return [dict(zip(("namespace", "key", "value"), map(self._string, _SNAPSHOT_ENTRY.unpack_from(
+            self._map, self._metadata + (first + entry) * _SNAPSHOT_ENTRY.size)))) for entry in range(count)]
+
+    def parent(self, item_id):
+        """
+        :param item_id: The item id
+        :return: dict - The folder, data model or data class holding the item, or None
+        """
+        number = self._find(item_id)
+        if number is None or self._node(number)[3] == _NONE:
+            return None
+        return self._item(self._node(number)[3])
+
+    def children(self, item_id, kind=None):
+        """
+        :param item_id: The item id
+        :param kind: str - (optional) Only children of this kind, e.g. 'dataElements'
+        :return: list of dict - The items directly held by the item
+        """
+        number = self._find(item_id)
+        if number is None:
+            return []
+        first, count = self._node(number)[4:6]
+        children = (self._u32(self._children, first + child) for child in range(count))
+        return [self._item(child) for child in children
+                if kind is None or self._string(self._node(child)[2]) == kind]
+
+    def ancestors(self, item_id):
+        """
+        :param item_id: The item id
+        :return: list of dict - The item's parent, its parent's parent and so on up to a top-level folder
+        """
+        ancestors = []
+        number = self._find(item_id)
+        parent = self._node(number)[3] if number is not None else _NONE
+        while parent != _NONE:
+            ancestors.append(self._item(parent))
+            parent = self._node(parent)[3]
+        return ancestors
+
+    def find_by_label(self, label, kind=None):
+        """
+        Finds the items with a label, ignoring case.
+
+        :param label: str - The label
+        :param kind: str - (optional) Only items of this kind, e.g. 'dataClasses'
+        :return: list of dict
+        """
+        label = str(label).lower()
+
+        def key(number):
+            return (self._string(self._node(number)[1]) or "").lower()
+
+        found = []
+        position = self._search(self._by_label, label, key)
+        while position < self._count:
+            number = self._u32(self._by_label, position)
+            if key(number) != label:
+                break
+            if kind is None or self._string(self._node(number)[2]) == kind:
+                found.append(self._item(number))
+            position += 1
+        return found
+
+    def to_index(self):
+        """
+        Decodes the whole snapshot into a :class:`CatalogueIndex`.
+
+        :return: :class:`CatalogueIndex`
+        """
+        index = CatalogueIndex()
+        items = [self._item(number) for number in range(self._count)]
+        for number, item in enumerate(items):
+            node = self._node(number)
+            parent = items[node[3]]['id'] if node[3] != _NONE else None
+            index.add_item(item, parent, self._string(node[2]))
+            if node[7]:
+                index.add_metadata(item['id'], self._entries_of(number))
+        for link in range(self._links):
+            classifier_id, label, number = _SNAPSHOT_LINK.unpack_from(self._map,
+                                                                      self._classified + link * _SNAPSHOT_LINK.size)
+            index.add_classifier(items[number]['id'], dict(id=self._string(classifier_id), label=self._string(label)))
+        return index
+
+
+METADATA_COLUMNS = ("id", "domainType", "path", "namespace", "key", "value")
+
+
+class _ChunkedWriter:
+    """
+    Buffers rows and writes them to a file chunk_rows at a time, opening the file if given a path.
+    """
+
+    def __init__(self, file, chunk_rows=10000):
+        self._owns_file = isinstance(file, (str, os.PathLike))
+        self._file = open(file, "w", newline="", encoding="utf-8") if self._owns_file else file
+        self.chunk_rows = chunk_rows
+        self.rows = 0
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, row):
+        """
+        Adds a row, writing out the buffered rows once there are chunk_rows of them.
+
+        :param row: tuple - The values of the columns, in order
+        """
+        self._buffer.append(row)
+        self.rows += 1
+        if len(self._buffer) >= self.chunk_rows:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes out the buffered rows.
+        """
+        if self._buffer:
+            self._write_chunk(self._buffer)
+            self._buffer = []
+        self._file.flush()
+
+    def close(self):
+        """
+        Writes out the buffered rows and closes the file if it was opened by the writer.
+        """
+        self.flush()
+        if self._owns_file:
+            self._file.close()
+
+
+class CSVWriter(_ChunkedWriter):
+    """
+    Writes rows, such as those of :meth:`BaseClient.harvest_metadata`, to a CSV file in chunks.
+
+    Attributes
+    ----------
+    file : str or file object
+        The path of the file to create, or an open text file
+    columns : tuple of str
+        The header row, or None for no header. Default value = METADATA_COLUMNS
+    chunk_rows : int
+        Number of rows buffered before being written. Default value = 10000
+    rows : int
+        Number of rows written so far
+
+    Methods
+    -------
+    write
+    flush
+    close
+
+    """
+
+    def __init__(self, file, columns=METADATA_COLUMNS, chunk_rows=10000):
+        super().__init__(file, chunk_rows)
+        self._writer = csv.writer(self._file)
+        if columns is not None:
+            self._writer.writerow(columns)
+
+    def __repr__(self):
+        return "Mauro CSV Writer Object (" + str(self.rows) + " rows)"
+
+    def _write_chunk(self, rows):
+        self._writer.writerows(rows)
+
+
+class NDJSONWriter(_ChunkedWriter):
+    """
+    Writes rows, such as those of :meth:`BaseClient.harvest_metadata`, to a newline-delimited json file in chunks,
+    each row as an object keyed by column.
+
+    Attributes
+    ----------
+    file : str or file object
+        The path of the file to create, or an open text file
+    columns : tuple of str
+        The keys of each object. Default value = METADATA_COLUMNS
+    chunk_rows : int
+        Number of rows buffered before being written. Default value = 10000
+    rows : int
+        Number of rows written so far
+
+    Methods
+    -------
+    write
+    flush
+    close
+
+    """
+
+    def __init__(self, file, columns=METADATA_COLUMNS, chunk_rows=10000):
+        super().__init__(file, chunk_rows)
+        self.columns = columns
+
+    def __repr__(self):
+        return "Mauro NDJSON Writer Object (" + str(self.rows) + " rows)"
+
+    def _write_chunk(self, rows):
+        self._file.write("".join(json.dumps(dict(zip(self.columns, row)), separators=(',', ':')) + "\n"
+                                 for row in rows))
+
+
+class ColumnarTable:
+    """
+    An in-memory table of rows, such as those of :meth:`BaseClient.harvest_metadata`, stored column by column.
+
+    Each column is dictionary encoded: its distinct values are kept once and every row holds a 32-bit number per
+    column, so ids, domain types, paths, namespaces and keys that repeat across many rows cost four bytes each.
+
+    Attributes
+    ----------
+    columns : tuple of str
+        The column names. Default value = METADATA_COLUMNS
+
+    Methods
+    -------
+    write
+    close
+    column
+    rows
+    distinct
+
+    """
+
+    def __init__(self, columns=METADATA_COLUMNS):
+        self.columns = tuple(columns)
+        self._codes = [array.array('I') for _ in self.columns]
+        self._values = [[] for _ in self.columns]
+        self._numbers = [dict() for _ in self.columns]
+
+    def __repr__(self):
+        return "Mauro Columnar Table Object (" + str(len(self)) + " rows)"
+
+    def __len__(self):
+        return len(self._codes[0]) if self._codes else 0
+
+    def write(self, row):
+        """
+        Adds a row.
+
+        :param row: tuple - The values of the columns, in order
+        """
+        for codes, values, numbers, value in zip(self._codes, self._values, self._numbers, row):
+            number = numbers.get(value)
+            if number is None:
+                number = numbers[value] = len(values)
+                values.append(value)
+            codes.append(number)
+
+    def close(self):
+        """
+        Does nothing; a table has no file to close. Present so that a table can be used in place of a writer.
+        """
+
+    def column(self, name):
+        """
+        :param name: str - The column name
+        :return: list - The column's value in every row
+        """
+        position = self.columns.index(name)
+        values = self._values[position]
+        return [values[code] for code in self._codes[position]]
+
+    def distinct(self, name):
+        """
+        :param name: str - The column name
+        :return: list - The column's distinct values, in the order first seen
+        """
+        return list(self._values[self.columns.index(name)])
+
+    def rows(self):
+        """
+        :return: generator of tuple - Every row, in the order written
+        """
+        for row in zip(*self._codes):
+            yield tuple(values[code] for values, code in zip(self._values, row))
+
+
+def _permission_set(permissions):
+    """
+    Flattens a permissions response into a sorted tuple of (principal, access) pairs, principals being 'everyone',
+    'authenticated', 'user:<email address>' or 'group:<name>' and access 'read' or 'write'.
+    """
+    access = dict()
+    if permissions.get('readableByEveryone'):
+        access['everyone'] = "read"
+    if permissions.get('readableByAuthenticatedUsers'):
+        access['authenticated'] = "read"
+    for level in ("readable", "writeable"):
+        for user in permissions.get(level + "ByUsers") or ():
+            principal = "user:" + str(user.get('emailAddress') or user.get('id'))
+            if level == "writeable" or principal not in access:
+                access[principal] = "write" if level == "writeable" else "read"
+        for group in permissions.get(level + "ByGroups") or ():
+            principal = "group:" + str(group.get('name') or group.get('id'))
+            if level == "writeable" or principal not in access:
+                access[principal] = "write" if level == "writeable" else "read"
+    return tuple(sorted(access.items()))
+
+
+class PermissionsAudit:
+    """
+    The result of :meth:`BaseClient.audit_permissions`: who can read and write each folder, data model and
+    terminology.
+
+    Permissions are stored compactly. Each distinct set of (principal, access) pairs is kept once and items refer
+    to it by number, so the many items that inherit the same permissions from their folder share one set. Principals
+    are 'everyone', 'authenticated', 'user:<email address>' or 'group:<name>', and access is 'read' or 'write'.
+
+    An audit can be saved and loaded, and passed to the next :meth:`BaseClient.audit_permissions` so that only items
+    added or changed since are checked again.
+
+    Attributes
+    ----------
+    audited : str
+        When the audit was made, as an ISO 8601 UTC time
+    checked : int
+        Number of items whose permissions were fetched by the run that made the audit
+    errors : dict
+        Item id to the exception raised fetching its permissions, for items left unchecked
+
+    Methods
+    -------
+    items
+    permissions
+    inherited
+    principals
+    items_for
+    matrix
+    save
+    load
+
+    """
+
+    def __init__(self):
+        self.audited = None
+        self.checked = 0
+        self.errors = dict()
+        self._items = dict()  # id -> [kind, label, parent id, watermark, permission set number]
+        self._sets = []
+        self._set_numbers = dict()
+        self._by_principal = None
+
+    def __repr__(self):
+        return "Mauro Permissions Audit Object (" + str(len(self._items)) + " items, " + str(len(self._sets)) + \
+            " distinct permission sets)"
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, item_id):
+        return item_id in self._items
+
+    def _intern(self, permission_set):
+        number = self._set_numbers.get(permission_set)
+        if number is None:
+            number = self._set_numbers[permission_set] = len(self._sets)
+            self._sets.append(permission_set)
+        return number
+
+    def _record(self, item_id, kind, label, parent_id, watermark, permission_set):
+        self._items[item_id] = [kind, label, parent_id, watermark, self._intern(permission_set)]
+        self._by_principal = None
+
+    def items(self, kind=None):
+        """
+        :param kind: str - (optional) Only items of this kind, e.g. 'dataModels'
+        :return: list of dict - The id, kind, label and parent of each audited item
+        """
+        return [dict(id=item_id, kind=entry[0], label=entry[1], parent=entry[2])
+                for item_id, entry in self._items.items() if kind is None or entry[0] == kind]
+
+    def permissions(self, item_id):
+        """
+        :param item_id: The item id
+        :return: dict - Principal to access for the item, or None if it was not audited
+        """
+        entry = self._items.get(item_id)
+        return None if entry is None else dict(self._sets[entry[4]])
+
+    def inherited(self, item_id):
+        """
+        :param item_id: The item id
+        :return: bool - Whether the item has exactly the permissions of the folder holding it
+        """
+        entry = self._items.get(item_id)
+        parent = self._items.get(entry[2]) if entry is not None else None
+        return parent is not None and parent[4] == entry[4]
+
+    def principals(self):
+        """
+        :return: list of str - Every principal with access to any audited item
+        """
+        return sorted(self._principal_sets())
+
+    def _principal_sets(self):
+        if self._by_principal is None:
+            by_principal = dict()
+            for number, permission_set in enumerate(self._sets):
+                for principal, access in permission_set:
+                    by_principal.setdefault(principal, []).append((number, access))
+            self._by_principal = by_principal
+        return self._by_principal
+
+    def items_for(self, principal):
+        """
+        :param principal: str - e.g. 'user:someone@example.com' or 'group:readers'
+        :return: dict - Item id to the principal's access, for every item the principal can read
+        """
+        access_by_set = dict(self._principal_sets().get(principal, ()))
+        return dict((item_id, access_by_set[entry[4]]) for item_id, entry in self._items.items()
+                    if entry[4] in access_by_set)
+
+    def matrix(self):
+        """
+        :return: dict - Principal to a dict of item id to access, for every principal and item
+        """
+        return dict((principal, self.items_for(principal)) for principal in self.principals())
+
+    def save(self, path):
+        """
+        Writes the audit to a json file.
+
+        :param path: str - The file to write
+        """
+        temporary = path + ".tmp"
+        with open(temporary, "w") as audit_file:
+            json.dump(dict(audited=self.audited, checked=self.checked, sets=self._sets, items=self._items),
+                      audit_file, separators=(',', ':'))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads an audit written by :meth:`save`.
+
+        :param path: str - The file to read
+        :return: :class:`PermissionsAudit`
+        """
+        with open(path) as audit_file:
+            data = json.load(audit_file)
+        audit = cls()
+        audit.audited = data.get('audited')
+        audit.checked = data.get('checked', 0)
+        for permission_set in data['sets']:
+            audit._intern(tuple(tuple(pair) for pair in permission_set))
+        audit._items = data['items']
+        return audit
+
+
+class MauroObject:
+    """
+    Base class of the lightweight typed views of Mauro json: :class:`Folder`, :class:`DataModel`, :class:`DataClass`,
+    :class:`DataElement`, :class:`Metadata` and :class:`Classifier`.
+
+    The commonly used fields are held as attributes in __slots__ and any other fields are kept as a single compact
+    json string, decoded only when :attr:`extra` or :meth:`get` is used. This needs a fraction of the memory of the
+    nested dicts returned by :meth:`Response.json`.
+
+    Methods
+    -------
+    from_dict
+    from_response
+    get
+    to_dict
+
+    """
+    __slots__ = ("_extra",)
+    _fields = ()  # Pairs of (json key, attribute name)
+    _interned = ()  # Attributes holding strings repeated across many objects, e.g. domainType
+
+    def __init__(self, extra=None, **kwargs):
+        for _, name in self._fields:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError("Unexpected fields " + str(sorted(kwargs)))
+        self._extra = json.dumps(extra, separators=(',', ':')) if extra else None
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds the typed object from a dict parsed from Mauro json.
+
+        :param data: dict - A single item
+        :return: The typed object
+        """
+        obj = cls.__new__(cls)
+        data = dict(data)
+        for key, name in cls._fields:
+            value = data.pop(key, None)
+            if name in cls._interned and isinstance(value, str):
+                value = sys.intern(value)
+            setattr(obj, name, value)
+        obj._extra = json.dumps(data, separators=(',', ':')) if data else None
+        return obj
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Builds typed objects from a response: a list of them if the response is a paginated list with 'items', a
+        single object otherwise. Raises :class:`requests.HTTPError` if the response was not successful.
+
+        :param response: :class:`Response' object
+        :return: list or object
+        """
+        response.raise_for_status()
+        data = json.loads(response.content)
+        if isinstance(data, dict) and isinstance(data.get('items'), list):
+            return [cls.from_dict(item) for item in data['items']]
+        return cls.from_dict(data)
+
+    @property
+    def extra(self):
+        """
+        The fields without an attribute of their own, decoded on every access.
+        """
+        return json.loads(self._extra) if self._extra is not None else dict()
+
+    def get(self, key, default=None):
+        """
+        The value of a field by its json key, whether or not it has an attribute.
+
+        :param key: The json key e.g. 'lastUpdated'
+        :param default: - (optional) Returned if the field is absent
+        """
+        for json_key, name in self._fields:
+            if json_key == key:
+                value = getattr(self, name)
+                return default if value is None else value
+        return self.extra.get(key, default)
+
+    def to_dict(self):
+        """
+        The object as a dict in the shape of the original json.
+
+        :return: dict
+        """
+        data = self.extra
+        for key, name in self._fields:
+            value = getattr(self, name)
+            if value is not None:
+                data[key] = value
+        return data
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        label = getattr(self, 'label', None) or getattr(self, 'key', None)
+        return type(self).__name__ + "(id=" + repr(getattr(self, 'id', None)) + ", " + repr(label) + ")"
+
+
+class Folder(MauroObject):
+    """
+    A folder. See :class:`MauroObject`.
+    """
+    __slots__ = ("id", "label", "domain_type", "description", "last_updated", "has_child_folders")
+    _fields = (("id", "id"), ("label", "label"), ("domainType", "domain_type"), ("description", "description"),
+               ("lastUpdated", "last_updated"), ("hasChildFolders", "has_child_folders"))
+    _interned = ("domain_type",)
+
+
+class DataModel(MauroObject):
+    """
+    A data model. See :class:`MauroObject`.
+    """
+    __slots__ = ("id", "label", "domain_type", "description", "last_updated", "model_type", "finalised",
+                 "model_version", "branch_name")
+    _fields = (("id", "id"), ("label", "label"), ("domainType", "domain_type"), ("description", "description"),
+               ("lastUpdated", "last_updated"), ("type", "model_type"), ("finalised", "finalised"),
+               ("modelVersion", "model_version"), ("branchName", "branch_name"))
+    _interned = ("domain_type", "model_type", "branch_name")
+
+
+class DataClass(MauroObject):
+    """
+    A data class. See :class:`MauroObject`.
+    """
+    __slots__ = ("id", "label", "domain_type", "description", "last_updated", "model", "parent_data_class",
+                 "min_multiplicity", "max_multiplicity")
+    _fields = (("id", "id"), ("label", "label"), ("domainType", "domain_type"), ("description", "description"),
+               ("lastUpdated", "last_updated"), ("model", "model"), ("parentDataClass", "parent_data_class"),
+               ("minMultiplicity", "min_multiplicity"), ("maxMultiplicity", "max_multiplicity"))
+    _interned = ("domain_type", "model", "parent_data_class")
+
+
+class DataElement(MauroObject):
+    """
+    A data element. See :class:`MauroObject`. Its data_type attribute holds the label of its data type; the full
+    data type is available from get('dataType').
+    """
+    __slots__ = ("id", "label", "domain_type", "description", "last_updated", "model", "data_class", "data_type",
+                 "min_multiplicity", "max_multiplicity")
+    _fields = (("id", "id"), ("label", "label"), ("domainType", "domain_type"), ("description", "description"),
+               ("lastUpdated", "last_updated"), ("model", "model"), ("dataClass", "data_class"),
+               ("minMultiplicity", "min_multiplicity"), ("maxMultiplicity", "max_multiplicity"))
+    _interned = ("domain_type", "model", "data_class", "data_type")
+
+    def __init__(self, extra=None, data_type=None, **kwargs):
+        super().__init__(extra=extra, **kwargs)
+        self.data_type = data_type
+
+    @classmethod
+    def from_dict(cls, data):
+        obj = super().from_dict(data)
+        data_type = data.get('dataType')
+        if isinstance(data_type, dict):
+            data_type = data_type.get('label')
+        obj.data_type = sys.intern(data_type) if isinstance(data_type, str) else data_type
+        return obj
+
+
+class Metadata(MauroObject):
+    """
+    A metadata entry of a catalogue item. See :class:`MauroObject`.
+    """
+    __slots__ = ("id", "namespace", "key", "value", "last_updated")
+    _fields = (("id", "id"), ("namespace", "namespace"), ("key", "key"), ("value", "value"),
+               ("lastUpdated", "last_updated"))
+    _interned = ("namespace", "key")
+
+
+class Classifier(MauroObject):
+    """
+    A classifier. See :class:`MauroObject`.
+    """
+    __slots__ = ("id", "label", "domain_type", "description", "last_updated")
+    _fields = (("id", "id"), ("label", "label"), ("domainType", "domain_type"), ("description", "description"),
+               ("lastUpdated", "last_updated"))
+    _interned = ("domain_type",)
+
+
+_TYPED_CLASSES = dict(Folder=Folder, VersionedFolder=Folder, DataModel=DataModel, DataClass=DataClass,
+                      DataElement=DataElement, Classifier=Classifier)
+
+
+def to_typed(value):
+    """
+    Converts Mauro json to the matching typed objects, chosen by each item's domainType. Metadata entries, which have
+    no domainType, are recognised by their namespace.
+
+    :param value: A dict, a list of dicts, a paginated list with 'items' or a :class:`Response' object
+    :return: A typed object or a list of them. Items of unknown types are returned unchanged.
+    """
+    if isinstance(value, requests.Response):
+        value.raise_for_status()
+        value = json.loads(value.content)
+    if isinstance(value, list):
+        return [to_typed(item) for item in value]
+    if isinstance(value.get('items'), list) and 'domainType' not in value:
+        return [to_typed(item) for item in value['items']]
+    if 'domainType' not in value and 'namespace' in value:
+        return Metadata.from_dict(value)
+    cls = _TYPED_CLASSES.get(value.get('domainType'))
+    return cls.from_dict(value) if cls is not None else value
+
+
+class _JsonStream:
+    """
+    Incrementally decodes json text arriving in chunks, holding only the undecoded part in memory.
+    """
+
+    def __init__(self, chunks, encoding):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder(encoding)(errors='replace')
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        if self._eof:
+            return False
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            self._eof = True
+            self._buffer = self._buffer[self._pos:] + self._text.decode(b"", final=True)
+        else:
+            self._buffer = self._buffer[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+        return True
+
+    def peek(self):
+        """The next non-whitespace character, or '' at the end of the text."""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, characters):
+        character = self.peek()
+        if character == '' or character not in characters:
+            raise ValueError("Expected one of " + repr(characters) + " in json but found " + repr(character))
+        self._pos += 1
+        return character
+
+    def value(self):
+        """Decodes the next complete json value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if not self._fill():
+                    raise
+                continue
+            # A number may continue in the next chunk, so a value must be followed by a delimiter or the end
+            if not self._eof and (end == len(self._buffer) or self._buffer[end] not in " \t\r\n,:]}"):
+                self._fill()
+                continue
+            self._pos = end
+            return value
+
+    def array(self):
+        """Yields the values of a json array one at a time."""
+        self.expect('[')
+        if self.peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.expect(',]') == ']':
+                return
+
+
+def iter_json_items(response, key="items", chunk_size=65536):
+    """
+    Yields the entries of a json response's items array one at a time while the response downloads, so memory is
+    bounded by a single entry rather than the whole body. The first entry is available before the download ends.
+
+    The response should have been requested with stream=True. A response whose body is itself an array has its
+    entries yielded. The response is not closed.
+
+    :param response: :class:`Response' object
+    :param key: The key of the array to stream in the top-level object. Default value = 'items'
+    :param chunk_size: int - Number of bytes read from the socket at a time. Default value = 65536
+    :return: generator of dict
+    """
+    stream = _JsonStream(response.iter_content(chunk_size), response.encoding or 'utf-8')
+    if stream.peek() == '[':
+        yield from stream.array()
+        return
+    stream.expect('{')
+    if stream.peek() == '}':
+        return
+    while True:
+        name = stream.value()
+        stream.expect(':')
+        if name == key:
+            yield from stream.array()
+        else:
+            stream.value()
+        if stream.expect(',}') == '}':
+            return
+
+
+class Metrics:
+    """
+    The instrumentation hooks called by :class:`Transport` and :class:`BaseClient`. This base class does nothing and
+    is the default; subclass it to export measurements elsewhere, or use :class:`MetricsRecorder`.
+
+    Endpoints are identified by their method and template, e.g. 'GET /api/dataModels/{id}/dataClasses', so that
+    requests for different items are measured together.
+
+    Methods
+    -------
+    record_request
+    record_cache
+    record_coalesced
+    snapshot
+
+    """
+
+    def record_request(self, endpoint, status, elapsed, request_bytes, response_bytes, retries, reused, error=None):
+        """
+        Called after every request sent by a transport.
+
+        :param endpoint: str - The method and endpoint template
+        :param status: int - The response status code, or None if no response was received
+        :param elapsed: float - Seconds taken, including any retries
+        :param request_bytes: int - Size of the request body
+        :param response_bytes: int - Size of the response body, or its Content-Length if streamed
+        :param retries: int - Number of retries made
+        :param reused: bool - Whether the request was sent over an already open connection
+        :param error: - (optional) The exception raised if no response was received
+        """
+
+    def record_cache(self, endpoint, hit):
+        """
+        Called when a client with a cache looks up a GET request.
+
+        :param endpoint: str - The method and endpoint template
+        :param hit: bool - Whether the response was served from the cache, including after revalidation
+        """
+
+    def record_coalesced(self, endpoint):
+        """
+        Called when a GET request waits for an identical request in flight instead of being sent.
+
+        :param endpoint: str - The method and endpoint template
+        """
+
+    def snapshot(self):
+        """
+        The measurements recorded so far.
+
+        :return: dict
+        """
+        return dict()
+
+
+_NO_METRICS = Metrics()
+
+_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+
+
+class _EndpointStats:
+    __slots__ = ("requests", "errors", "total_seconds", "min_seconds", "max_seconds", "buckets", "statuses",
+                 "request_bytes", "response_bytes", "retries", "reused", "cache_hits", "cache_misses", "coalesced")
+
+    def __init__(self):
+        self.requests = self.errors = self.retries = self.reused = 0
+        self.request_bytes = self.response_bytes = 0
+        self.cache_hits = self.cache_misses = self.coalesced = 0
+        self.total_seconds = 0.0
+        self.min_seconds = None
+        self.max_seconds = None
+        self.buckets = [0] * len(_LATENCY_BUCKETS)
+        self.statuses = dict()
+
+    def quantile(self, fraction):
+        """The upper bound of the latency bucket holding the given fraction of requests."""
+        rank = fraction * self.requests
+        seen = 0
+        for bound, count in zip(_LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if count and seen >= rank:
+                return min(bound, self.max_seconds)
+        return None
+
+    def to_dict(self):
+        return dict(requests=self.requests, errors=self.errors, statuses=dict(self.statuses),
+                    total_seconds=self.total_seconds, min_seconds=self.min_seconds, max_seconds=self.max_seconds,
+                    mean_seconds=self.total_seconds / self.requests if self.requests else None,
+                    p50_seconds=self.quantile(0.5), p90_seconds=self.quantile(0.9), p99_seconds=self.quantile(0.99),
+                    latency_buckets=dict(("le_" + str(bound), count)
+                                         for bound, count in zip(_LATENCY_BUCKETS, self.buckets)),
+                    request_bytes=self.request_bytes, response_bytes=self.response_bytes, retries=self.retries,
+                    reused_connections=self.reused, cache_hits=self.cache_hits, cache_misses=self.cache_misses,
+                    coalesced=self.coalesced)
+
+
+class MetricsRecorder(Metrics):
+    """
+    :class:`Metrics` that keeps per endpoint counts in memory: latency histograms with estimated percentiles, request
+    and response bytes, status codes, retries, connection reuse, cache hits and misses and coalesced requests.
+
+    Methods
+    -------
+    snapshot
+    to_json
+    reset
+
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = dict()
+
+    def __repr__(self):
+        return "Mauro Metrics Recorder Object"
+
+    def _stats(self, endpoint):
+        stats = self._endpoints.get(endpoint)
+        if stats is None:
+            stats = self._endpoints[endpoint] = _EndpointStats()
+        return stats
+
+    def record_request(self, endpoint, status, elapsed, request_bytes, response_bytes, retries, reused, error=None):
+        with self._lock:
+            stats = self._stats(endpoint)
+            stats.requests += 1
+            if error is not None:
+                stats.errors += 1
+            else:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+            stats.total_seconds += elapsed
+            stats.min_seconds = elapsed if stats.min_seconds is None else min(stats.min_seconds, elapsed)
+            stats.max_seconds = elapsed if stats.max_seconds is None else max(stats.max_seconds, elapsed)
+            stats.buckets[bisect.bisect_left(_LATENCY_BUCKETS, elapsed)] += 1
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.retries += retries
+            stats.reused += bool(reused)
+
+    def record_cache(self, endpoint, hit):
+        with self._lock:
+            stats = self._stats(endpoint)
+            if hit:
+                stats.cache_hits += 1
+            else:
+                stats.cache_misses += 1
+
+    def record_coalesced(self, endpoint):
+        with self._lock:
+            self._stats(endpoint).coalesced += 1
+
+    def snapshot(self):
+        """
+        The measurements recorded so far, by endpoint, with totals across all endpoints.
+
+        :return: dict
+        """
+        with self._lock:
+            endpoints = dict((endpoint, stats.to_dict()) for endpoint, stats in sorted(self._endpoints.items()))
+        totals = dict((name, sum(stats[name] for stats in endpoints.values()))
+                      for name in ("requests", "errors", "total_seconds", "request_bytes", "response_bytes",
+                                   "retries", "reused_connections", "cache_hits", "cache_misses", "coalesced"))
+        return dict(endpoints=endpoints, totals=totals)
+
+    def to_json(self, **kwargs):
+        """
+        The snapshot as a json string.
+
+        :param kwargs: - (optional) Arguments passed to :func:`json.dumps`, e.g. indent
+        :return: str
+        """
+        return json.dumps(self.snapshot(), **kwargs)
+
+    def reset(self):
+        """
+        Discards everything recorded so far.
+        """
+        with self._lock:
+            self._endpoints.clear()
+
+
+_LOGIN_RETRY_INTERVAL = 5.0  # Seconds between attempts to log in again after a login fails
+
+_connection_state = threading.local()  # Whether the current thread's request had to open a new connection
+
+
+class _TrackedHTTPConnectionPool(HTTPConnectionPool):
+    def _new_conn(self):
+        _connection_state.opened = True
+        return super()._new_conn()
+
+
+class _TrackedHTTPSConnectionPool(HTTPSConnectionPool):
+    def _new_conn(self):
+        _connection_state.opened = True
+        return super()._new_conn()
+
+
+class _TrackedHTTPAdapter(HTTPAdapter):
+    """An HTTPAdapter whose pools note when a request opens a new connection rather than reusing one."""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(http=_TrackedHTTPConnectionPool,
+                                                       https=_TrackedHTTPSConnectionPool)
+
+
+def _retry_after(response):
+    """The seconds a response's Retry-After header asks the client to wait, or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """
+    Adaptive back-pressure for the requests sent through a :class:`Transport`, so that concurrent work runs as fast
+    as the Mauro instance can take and backs off when it is overloaded.
+
+    The number of requests in flight is capped by a limit adjusted by additive increase, multiplicative decrease:
+    each response grows the limit by 1/limit, i.e. by one per round of requests, while it is in use, and the limit is
+    multiplied by backoff when the instance answers 429 or 503, a request times out, or the smoothed latency rises
+    above latency_tolerance times the lowest latency recently seen. The limit is decreased at most once per smoothed
+    latency, so one burst of overloaded responses counts once. Overloaded responses also pause every request for
+    their Retry-After, or otherwise for one smoothed latency.
+
+    A token bucket can additionally cap the rate at which requests are started.
+
+    A limiter is thread-safe and is shared by every client using the transport.
+
+    Attributes
+    ----------
+    initial_limit : int
+        Requests allowed in flight at first. Default value = 8
+    min_limit : int
+        The lowest the limit is decreased to. Default value = 1
+    max_limit : int
+        The highest the limit is increased to. Default value = 64
+    backoff : float
+        Factor the limit is multiplied by when the instance is overloaded. Default value = 0.5
+    latency_tolerance : float
+        Ratio of smoothed to lowest latency above which the instance is considered overloaded. Default value = 2.0
+    rate : float
+        (optional) Maximum requests started per second. Default value = None (no cap)
+    burst : int
+        (optional) Requests that may be started at once within the rate. Default value = rate, at least 1
+    max_retries : int
+        Times a request answered 429 or 503 is sent again, once the pause has passed. A request answered 503 is only
+        sent again if the transport's retry policy allows its method to be retried, i.e. not POST. Default value = 3
+
+    Methods
+    -------
+    acquire
+    release
+    stats
+
+    """
+
+    def __init__(self, initial_limit=8, min_limit=1, max_limit=64, backoff=0.5, latency_tolerance=2.0, rate=None,
+                 burst=None, max_retries=3):
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError("The limits must satisfy 1 <= min_limit <= initial_limit <= max_limit.")
+        if not 0 < backoff < 1:
+            raise ValueError("backoff must be between 0 and 1.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, rate or 1)
+        self.max_retries = max_retries
+        self._condition = threading.Condition()
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._tokens = float(self.burst)
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased = 0.0
+        self._smoothed = None
+        self._lowest = None
+        self._overloaded = 0
+
+    def __repr__(self):
+        return "Mauro AdaptiveLimiter Object (limit " + str(int(self._limit)) + ")"
+
+    def acquire(self):
+        """
+        Waits until a request may be sent and counts it as in flight. Every acquire must be followed by a release.
+        """
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    self._condition.wait(self._paused_until - now)
+                    continue
+                if self._in_flight >= int(self._limit):
+                    self._condition.wait()
+                    continue
+                if self.rate is not None:
+                    self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate)
+                    self._refilled = now
+                    if self._tokens < 1:
+                        self._condition.wait((1 - self._tokens) / self.rate)
+                        continue
+                    self._tokens -= 1
+                self._in_flight += 1
+                return
+
+    def release(self, elapsed, overloaded=False, retry_after=None):
+        """
+        Counts a request as finished and adjusts the limit.
+
+        :param elapsed: float - Seconds the request took
+        :param overloaded: bool - Whether the instance answered 429 or 503, or the request timed out
+        :param retry_after: float - (optional) Seconds the instance asked the client to wait
+        """
+        with self._condition:
+            used = self._in_flight >= self._limit / 2
+            self._in_flight -= 1
+            now = time.monotonic()
+            if not overloaded:
+                self._smoothed = elapsed if self._smoothed is None else 0.8 * self._smoothed + 0.2 * elapsed
+                # Let the lowest latency drift up slowly so it follows lasting changes in the instance's speed
+                self._lowest = elapsed if self._lowest is None \
+                    else min(elapsed, self._lowest + 0.01 * (self._smoothed - self._lowest))
+                overloaded = self._smoothed > self.latency_tolerance * self._lowest
+            else:
+                self._overloaded += 1
+                pause = retry_after if retry_after is not None else (self._smoothed or 0.1)
+                self._paused_until = max(self._paused_until, now + pause)
+            if overloaded:
+                if now - self._decreased >= (self._smoothed or 0):
+                    self._limit = max(self.min_limit, self._limit * self.backoff)
+                    self._decreased = now
+            elif used:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    def stats(self):
+        """
+        The limiter's current state.
+
+        :return: dict
+        """
+        with self._condition:
+            return dict(limit=int(self._limit), in_flight=self._in_flight, smoothed_latency=self._smoothed,
+                        lowest_latency=self._lowest, overloaded=self._overloaded, rate=self.rate)
+
+
+class Transport:
+    """
+    A pooled, keep-alive HTTP transport to a single Mauro Data Mapper instance.
+
+    Every request made by a :class:`BaseClient` is sent through its transport, so connections to the instance are
+    reused rather than a new TCP/TLS connection being opened per call. A transport holds no credentials or cookies -
+    these are supplied on each request by the client - so one transport may be shared between several clients that
+    point at the same base URL, e.g. clients for different service accounts.
+
+    A transport is thread-safe. Each thread sends its requests through its own :class:`requests.Session`, so threads
+    never contend on session state, while all of the sessions draw on one shared connection pool. The pool hands out
+    the most recently returned connection first, so a thread making back-to-back requests tends to keep reusing the
+    same warm connection.
+
+    Attributes
+    ----------
+    baseurl : str
+        The base URL of the Mauro instance
+    pool_size : int
+        Maximum number of connections kept alive to the instance. Default value = 10
+    pool_block : bool
+        Whether a thread wanting a connection when all pool_size are in use waits for one to be returned, rather than
+        opening an extra connection that is discarded afterwards. Default value = False
+    timeout : float or tuple
+        (optional) Seconds to wait for the server, or a (connect, read) tuple, applied to every request.
+        Default value = None (wait forever)
+    retries : int or :class:`urllib3.util.retry.Retry`
+        Number of retries on connection errors and 502/504 responses, or a fully configured Retry policy.
+        Only idempotent methods (i.e. not POST) are retried. Default value = 3
+    backoff_factor : float
+        Backoff factor between retries when retries is an int. Default value = 0.3
+    metrics : :class:`Metrics`
+        (optional) Receives measurements of every request, e.g. a :class:`MetricsRecorder`. Clients using the
+        transport also report cache hits and coalesced requests to it. Default value = a no-op Metrics
+    limiter : :class:`AdaptiveLimiter`
+        (optional) Limits the requests in flight and their rate, adapting to the instance's responses, and resends
+        requests answered 429, and those answered 503 if their method may be retried. Request bodies must then be
+        resendable, i.e. not file objects or generators.
+        Default value = None (no limit beyond pool_size with pool_block)
+
+    Methods
+    -------
+    request
+    close
+
+    """
+
+    def __init__(self, baseurl, pool_size=10, timeout=None, retries=3, backoff_factor=0.3, pool_block=False,
+                 metrics=None, limiter=None):
+        self._baseURL = baseurl
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else _NO_METRICS
+        self.limiter = limiter
+        if not isinstance(retries, Retry):
+            retries = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(502, 504),
+                            raise_on_status=False)
+        self._adapter = _TrackedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries,
+                                            pool_block=pool_block)
+        self._local = threading.local()
+
+    @property
+    def _session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            # Cookies are passed explicitly by each client, never stored, so a shared transport cannot leak sessions
+            session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+            session.mount("http://", self._adapter)
+            session.mount("https://", self._adapter)
+            self._local.session = session
+        return session
+
+    @property
+    def baseURL(self):
+        return self._baseURL
+
+    def __repr__(self):
+        return "Mauro Transport Object"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def request(self, method, path, **kwargs):
+        """
+        Sends a request to the baseurl appended with path over a pooled connection.
+
+        :param method: The HTTP method e.g. 'get'
+        :param path: The path to append to the baseurl, e.g. /api/folders
+        :param kwargs: - (optional) Further arguments passed to :meth:`requests.Session.request`
+        :return: :class:`Response' object
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        if self.limiter is None:
+            return self._send(method, path, **kwargs)
+        for attempt in range(self.limiter.max_retries + 1):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self._send(method, path, **kwargs)
+            except requests.Timeout:
+                self.limiter.release(time.perf_counter() - start, overloaded=True)
+                raise
+            except BaseException:
+                self.limiter.release(time.perf_counter() - start)
+                raise
+            overloaded = response.status_code in (429, 503)
+            self.limiter.release(time.perf_counter() - start, overloaded, _retry_after(response))
+            if not overloaded or attempt == self.limiter.max_retries or not self._resendable(method, response):
+                return response
+            response.close()
+
+    def _resendable(self, method, response):
+        """
+        Whether an overloaded response may be answered by sending the request again: always for 429, as the request
+        was refused without being processed, but for 503 only if its method may be retried, as for the retry policy,
+        since a proxy's 503 may follow a POST the instance has already processed.
+        """
+        if response.status_code == 429:
+            return True
+        allowed = self._adapter.max_retries.allowed_methods
+        return allowed is False or method.upper() in allowed
+
+    def _send(self, method, path, **kwargs):
+        _connection_state.opened = False
+        start = time.perf_counter()
+        try:
+            response = self._session.request(method.upper(), self.baseURL + path, **kwargs)
+        except requests.RequestException as error:
+            self.metrics.record_request(method.upper() + " " + _endpoint_template(path), None,
+                                        time.perf_counter() - start, 0, 0, 0, False, error=error)
+            raise
+        elapsed = time.perf_counter() - start
+        body = response.request.body
+        retries = getattr(response.raw, 'retries', None)
+        if kwargs.get('stream'):
+            response_bytes = int(response.headers.get('Content-Length') or 0)
+        else:
+            response_bytes = len(response.content)
+        self.metrics.record_request(method.upper() + " " + _endpoint_template(path), response.status_code, elapsed,
+                                    len(body) if body is not None else 0, response_bytes,
+                                    len(retries.history) if retries is not None else 0,
+                                    not getattr(_connection_state, 'opened', False))
+        return response
+
+    def close(self):
+        """
+        Closes all pooled connections.
+        """
+        self._adapter.close()
+
+
+class BaseClient:
+    """
+    A class to connect to a Mauro Data Mapper instance.
+
+    It is recommended that you provide both a username/password and API key as some methods only operate off the
+    provision of one and not the other.
+
+    The user must provide at least a username and password or an API key. A type error will return if the arguments
+    provided do not abide by this rule. When possible the called method will use the API key over the session id created
+    by login via username/password to prevent session time-outs.
+
+    All requests are sent over a pooled :class:`Transport`. One is created for the client unless a transport is
+    provided, in which case it may be shared with other clients of the same Mauro instance.
+
+    If a :class:`ResponseCache` is provided, GET responses are cached and revalidated with the server once they
+    expire, and requests that modify the catalogue invalidate the cached responses they affect.
+
+    A client is thread-safe and is intended to be shared, e.g. by every worker of a ThreadPoolExecutor, rather than
+    created per thread: the workers then share one login and one connection pool. Give the client a transport with a
+    pool_size matching the number of workers, e.g. Transport(baseurl, pool_size=64, pool_block=True). If the session
+    expires, the first thread to notice logs in again while the others wait and then reuse the new session, and each
+    request that was refused is retried once with it. If logging in fails, requests try again at most every few
+    seconds rather than every thread at once. Give a session_timeout to refresh the session in the background
+    before it expires, so that long-running jobs never stall on an expired session.
+
+
+    Attributes
+    ----------
+    baseurl : str
+        The base URL of the Mauro instance
+    username : str
+        Login username
+    password : str
+        Login password
+    api_key: str
+        The API key to authenticate
+    transport: :class:`Transport`
+        (optional) A transport to send requests over. It must share the client's baseurl.
+    cache: :class:`ResponseCache`
+        (optional) A cache for GET responses, e.g. a :class:`SQLiteCache` to share it between processes. Caching is
+        disabled by default.
+    coalesce: bool
+        Whether identical GET requests made at the same time from several threads share one request and its
+        response. Default value = True
+    session_timeout: float
+        (optional) Seconds of inactivity after which the instance expires a login session. If given, a background
+        thread keeps an idle session alive by checking it once it has been idle for half this time, and logs in
+        again before the next request if it has expired anyway. Default value = None (no keep-alive)
+
+    Methods
+    -------
+    close
+    get_current_user
+    refresh_session
+    test_my_connection
+    check_for_valid_session
+    logout
+    admin_check
+    list_api_keys
+    create_new_api_key
+    delete_api_key
+    enable_api_key
+    disable_api_key
+    refresh_api_key
+    list_folders
+    get_metadata
+    permissions
+    post_metadata
+    get_classifiers
+    get_data_classes
+    get_codesets
+    get_data_element
+    get_data_model
+    get_versioned_folder
+    build_versioned_folder
+    create_data_model
+    build_folder
+    create_new_data_class
+    update_data_class
+    create_data_element
+    get_many_data_models
+    get_metadata_many
+    post_metadata_many
+    permissions_many
+    import_data_classes
+    crawl_data_model
+    crawl_folder
+    sync_catalogue
+    index_catalogue
+    harvest_metadata
+    audit_permissions
+    iter_folders
+    iter_data_models
+    iter_data_classes
+    iter_data_elements
+    iter_metadata
+    iter_classifiers
+    iter_codesets
+    iter_versioned_folders
+    stream_folders
+    stream_data_models
+    stream_data_classes
+    stream_data_elements
+    method_constructor
+
+    Each method possesses its own docstring.
+
+
+    """
+
+    def __init__(self, baseurl, username=None, password=None, api_key=None, transport=None, cache=None,
+                 coalesce=True, session_timeout=None):
+        self._baseURL = baseurl  # Non-public to prevent accidental editing
+        self._username = username  # Non-public to prevent accidental editing
+        self.__password = password  # Name mangled to prevent accidental disclosure
+        self.api_key = api_key
+        if (self._username is None or self.__password is None) and self.api_key is None \
+                or self._username is not None and self.__password is None \
+                or self._username is None and self.__password is not None:
+            raise TypeError("You must provide at a minimum: the username and password as a pairing or an API Key.")
+        if transport is None:
+            self._transport = Transport(baseurl)
+            self._owns_transport = True
+        elif transport.baseURL != baseurl:
+            raise ValueError("The transport must point at the same base URL as the client.")
+        else:
+            self._transport = transport
+            self._owns_transport = False
+        self._cache = cache
+        self._single_flight = _SingleFlight() if coalesce else None
+        self._session_lock = threading.RLock()  # Guards logging in and the cookie and user it sets
+        self.headers = dict()
+        if self.api_key is not None:
+            self.headers['apiKey'] = self.api_key
+        self.cookie = None
+        self._user = None  # The catalogue user returned by login, cached to avoid logging in per call
+        self._login_failed = None  # When the last login failed, so that requests retry it at most so often
+        self._last_used = time.monotonic()  # When the session cookie was last accepted
+        self.session_timeout = session_timeout
+        self._closing = threading.Event()
+        self._keep_alive = None
+        if self._username is not None:
+            self._login()
+            if session_timeout is not None:
+                self._keep_alive = threading.Thread(target=self._keep_session_alive, name="pymauro-keep-alive",
+                                                    daemon=True)
+                self._keep_alive.start()
+
+    @property
+    def username(self):
+        return self._username
+
+    @property
+    def baseURL(self):
+        return self._baseURL
+
+    @property
+    def transport(self):
+        return self._transport
+
+    @property
+    def cache(self):
+        return self._cache
+
+    def __repr__(self):
+        return "Mauro Client Object"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Closes the client's pooled connections and stops keeping its session alive, waiting for the background
+        thread to finish. A transport provided to the client is left open as it may be shared.
+        """
+        self._closing.set()
+        if self._keep_alive is not None and self._keep_alive is not threading.current_thread():
+            self._keep_alive.join()
+        if self._owns_transport:
+            self._transport.close()
+
+    def _request(self, method, path, **kwargs):
+        """
+        Sends a request over the client's transport, authenticating with the API key when present and the session
+        cookie otherwise. Explicit cookies in kwargs take precedence and explicit headers are sent alongside the
+        API key.
+
+        If the session cookie has expired the client logs in again and the request is retried once. When the client
+        has a cache, GET requests are served from it where possible and other requests invalidate the affected
+        entries. Identical GET requests made concurrently from several threads are coalesced into one, but a GET made
+        after a request modifying its path has returned never joins one sent before it. GET requests
+        that are streamed, or that carry a body, explicit headers or cookies, are neither cached nor coalesced, as
+        the cache and coalescing only tell requests apart by user, path and params.
+
+        :param method: The HTTP method e.g. 'get'
+        :param path: The path to append to the baseurl
+        :param kwargs: - (optional) Further arguments passed to :meth:`Transport.request`
+        :return: :class:`Response' object
+        """
+        if method.lower() != "get":
+            try:
+                return self._send(method, path, **kwargs)
+            finally:
+                if self._single_flight is not None:
+                    # A GET made after this write must not join one sent before it
+                    tags = _invalidation_tags(path)
+                    self._single_flight.forget(lambda key: not tags.isdisjoint(_cache_tags(key[1])))
+                if self._cache is not None:
+                    self._cache.invalidate(path)
+        if kwargs.get('stream') or 'cookies' in kwargs \
+                or any(kwargs.get(name) is not None for name in ('json', 'data', 'headers')):
+            return self._send(method, path, **kwargs)
+        get = self._send if self._cache is None else self._cached_get
+        if self._single_flight is None:
+            return get("get", path, **kwargs)
+        identity = self.api_key if self.api_key is not None else self.username
+        key = _request_key(identity, path, kwargs.get('params'))
+        return self._single_flight.do(
+            key, lambda: get("get", path, **kwargs),
+            lambda: self._transport.metrics.record_coalesced("GET " + _endpoint_template(path)))
+
+    def _send(self, method, path, **kwargs):
+        headers = kwargs.pop('headers', None)
+        if 'cookies' in kwargs:
+            return self._transport.request(method, path, headers=headers, **kwargs)
+        if self.api_key is not None:
+            if headers:
+                headers = dict(self.headers, **headers)
+            return self._transport.request(method, path, headers=headers or self.headers, **kwargs)
+        cookie = self.cookie
+        if cookie is None and self._login_failed is not None:
+            with self._session_lock:
+                # Retry a failed login, but no more often than every _LOGIN_RETRY_INTERVAL however many threads wait
+                if self.cookie is None and self._login_failed is not None \
+                        and time.monotonic() - self._login_failed >= _LOGIN_RETRY_INTERVAL:
+                    self._login()
+                cookie = self.cookie
+        response = self._transport.request(method, path, headers=headers, cookies=cookie, **kwargs)
+        if cookie is not None and response.status_code != 401:
+            self._last_used = time.monotonic()
+        elif cookie is not None:
+            with self._session_lock:
+                # Only log in if no other thread has already replaced the expired cookie
+                if self.cookie is cookie:
+                    self._login()
+                cookie = self.cookie
+            if cookie is not None:
+                response = self._transport.request(method, path, headers=headers, cookies=cookie, **kwargs)
+        return response
+
+    def _cached_get(self, method, path, **kwargs):
+        identity = self.api_key if self.api_key is not None else self.username
+        key = self._cache.make_key(identity, path, kwargs.get('params'))
+        metrics = self._transport.metrics
+        generation = self._cache.generation()
+        entry = self._cache.lookup(key)
+        if entry is not None and entry.fresh():
+            metrics.record_cache("GET " + _endpoint_template(path), True)
+            return entry.response
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **entry.validators())
+        response = self._send("get", path, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self._cache.revalidated(key, entry)
+            metrics.record_cache("GET " + _endpoint_template(path), True)
+            return entry.response
+        metrics.record_cache("GET " + _endpoint_template(path), False)
+        self._cache.store(key, path, response, generation)
+        return response
+
+    def _login(self):
+        """
+        Logs in, storing the session cookie and catalogue user on success.
+
+        :return: :class:`Response' object
+        """
+        with self._session_lock:
+            self._login_failed = time.monotonic()  # Cleared below once logged in
+            try:
+                response = self.test_my_connection()
+                user = response.json()
+            except (requests.RequestException, ValueError):
+                # Drop the expired cookie, so that requests wait for _LOGIN_RETRY_INTERVAL rather than log in again
+                self._user = None
+                self.cookie = None
+                raise
+            if 'id' in user.keys():
+                self._user = user
+                self.cookie = response.cookies
+                self._login_failed = None
+                self._last_used = time.monotonic()
+            else:
+                self._user = None
+                self.cookie = None
+            return response
+
+    def _keep_session_alive(self):
+        """
+        Runs in the background while the client is open, checking a session that has been idle for half the
+        session_timeout so that the check itself keeps it alive, and logging in again if it has nevertheless expired.
+        """
+        while not self._closing.wait(self.session_timeout / 4):
+            if time.monotonic() - self._last_used < self.session_timeout / 2:
+                continue
+            cookie = self.cookie
+            try:
+                response = self._transport.request("get", "/api/session/isAuthenticated", cookies=cookie)
+                valid = response.ok and bool(response.json().get('authenticatedSession'))
+            except (requests.RequestException, ValueError):
+                continue  # The instance is unreachable; requests will log in again once it is back
+            if valid:
+                self._last_used = time.monotonic()
+                continue
+            with self._session_lock:
+                if self.cookie is cookie:
+                    try:
+                        self._login()
+                    except (requests.RequestException, ValueError):
+                        pass
+
+    def refresh_session(self):
+        """
+        Logs in again to replace an expired session cookie and refreshes the cached catalogue user.
+
+        :return: :class:`Response' object
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        return self._login()
+
+    def get_current_user(self):
+        """
+        The catalogue user the client is logged in as, as returned by /api/authentication/login. The user is fetched
+        once and cached, so repeated calls do not log in again.
+
+        :return: dict - The catalogue user, including its 'id'
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        with self._session_lock:
+            if self._user is None:
+                self._login()
+                if self._user is None:
+                    raise ValueError("Unable to log in as " + str(self.username))
+            return self._user
+
+    def test_my_connection(self):
+        """
+        Executes a post request with username and password as json payload to the baseurl appended with
+        /api/authentication/login. The response is returned.
+
+        :return: :class:`Response' object
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        json_payload = dict(username=self.username, password=self.__password)
+        response = self._transport.request("post", "/api/authentication/login", json=json_payload)
+        return response
+
+    def check_for_valid_session(self):
+        """
+        Executes a get request to the url + /api/session/isAuthenticated
+        with the session ID in the cookies header.
+        The response is returned.
+
+        :return: :class:`Response' object
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        response = self._request("get", "/api/session/isAuthenticated", cookies=self.cookie)
+        return response
+
+    def logout(self):
+        """
+        A logout get request is sent to baseurl appended with /api/authentication/logout with the session ID in the
+        cookies header. The response is returned.
+
+        :return: :class:`Response' object
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        with self._session_lock:
+            response = self._request("get", "/api/authentication/logout", cookies=self.cookie)
+            self.cookie = None
+            self._user = None
+            return response
+
+    def admin_check(self):
+        """
+        Get request to determine whether user is an admin.
+
+        :return: :class:`Response' object
+        """
+        response = self._request("get", "/api/session/isApplicationAdministration")
+        return response
+
+    def list_api_keys(self, catalogue_user_id=None):
+        """
+        Lists api keys.
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id "
+                            "method argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        response = self._request("get", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys")
+        return response
+
+    def create_new_api_key(self, key_name='My First Key', expiry=365, refreshable=True, catalogue_user_id=None):
+        """
+        Creates a new API key depending on arguments provided,
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param key_name: The name of the created key. Default value is 'My First Key'
+        :param expiry: int - Number of days until key expiry. Default value is 365.
+        :param refreshable: bool - Make key refreshable. Default value is True.
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id "
+                            "method argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        json_payload = dict(name=key_name, expiresInDays=expiry, refreshable=refreshable)
+        response = self._request("post", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys",
+                                 json=json_payload)
+        return response
+
+    def delete_api_key(self, key_to_delete, catalogue_user_id=None):
+        """
+        Deletes API key.
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param key_to_delete: API key id to delete
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id "
+                            "method argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        response = self._request("delete", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                 + str(key_to_delete))
+        return response
+
+    def disable_api_key(self, key_to_disable, catalogue_user_id=None):
+        """
+        Disables API key
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param key_to_disable: API key to disable
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id "
+                            "method argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        response = self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                 + str(key_to_disable) + "/disable")
+        return response
+
+    def enable_api_key(self, key_to_enable, catalogue_user_id=None):
+        """
+        Enables API key
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param key_to_enable: API key to enable
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        response = self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                 + str(key_to_enable) + "/enable")
+        return response
+
+    def refresh_api_key(self, key_to_refresh, days_until_expiry=365, catalogue_user_id=None):
+        """
+        Refreshes API key
+
+        If catalogue_user_id is provided, request will return response for request using the provided catalogue
+        as opposed to current user's default value.
+
+        :param key_to_refresh: API key to refresh
+        :param days_until_expiry: int - Number of days until key expiry. Default value is 365
+        :param catalogue_user_id: - (optional) A catalogue user id
+        :return: :class:`Response' object
+        """
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id "
+                            "method argument is required for this method to work")
+        elif catalogue_user_id is None:
+            catalogue_user_id = self.get_current_user()['id']
+        response = self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                 + str(key_to_refresh) + "/refresh/" + str(days_until_expiry))
+        return response
+
+    def list_folders(self, offset=0, max_limit=10, show_all=False):
+        """
+        Lists the folders present in a Mauro instance.
+
+        :param offset: int - pagination offset value. Default value = 0
+        :param max_limit: int - maximum number of folders returned. Default value = 10
+        :param show_all: bool - show all folders (overrides max and offset limit). Default value = False
+        :return: :class:`Response' object
+        """
+        if not show_all:
+            response = self._request("get", "/api/folders?offset=" + str(offset) + "&max=" + str(max_limit))
+        else:
+            response = self._request("get", "/api/folders?all=true")
+        return response
+
+    def get_metadata(self, catalogue_item_domain_type, catalogue_item_id, metadata_id=None):
+        """
+        Get the metadata information on a catalogue item or metadata item within a catalogue id.
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses", "dataElements",
+         "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        :param catalogue_item_id: The id of the catalogue item.
+        :param metadata_id: - (optional) A catalogue user id.
+        :return: :class:`Response' object.
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        if metadata_id is None:
+            response = self._request(
+                "get", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata")
+        else:
+            response = self._request(
+                "get", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata/"
+                + str(metadata_id))
+        return response
+
+    def permissions(self, catalogue_item_domain_type, catalogue_item_id):
+        """
+        Get the permissions of a catalogue item id
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels"
+        :param catalogue_item_id: The catalogue item id
+        :return: :class:`Response' object
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        response = self._request(
+            "get", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/permissions")
+        return response
+
+    def post_metadata(self, catalogue_item_domain_type, catalogue_item_id, namespace_inp, key_val, value_inp):
+        """
+        Post metadata
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        :param catalogue_item_id: The catalogue item id.
+        :param namespace_inp: The namespace
+        :param key_val: The key
+        :param value_inp: The value
+        :return: :class:`Response' object
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        json_payload = dict(id=catalogue_item_id, namespace=namespace_inp, key=key_val, value=value_inp)
+        response = self._request(
+            "post", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata",
+            json=json_payload)
+        return response
+
+    def get_classifiers(self, classifier_id=None, id_input=None):
+        """
+        Get classifiers - paginated list or specific id
+
+        :param classifier_id: Parent classifier id
+        :param id_input: Child classifier id
+        :return: :class:`Response' object
+        """
+        if classifier_id is None and id_input is None:
+            response = self._request("get", "/api/classifiers")
+        elif classifier_id and id_input is None:
+            response = self._request("get", "/api/classifiers/" + str(classifier_id) + "/classifiers")
+        elif id_input and classifier_id is None:
+            response = self._request("get", "/api/classifiers/" + str(id_input))
+        else:
+            response = self._request(
+                "get", "/api/classifiers/" + str(classifier_id) + "/classifiers/" + str(id_input))
+        return response
+
+    def get_data_classes(self, data_model_id, data_class_id=None, id_input=None):
+        """
+        Get data classes - paginated list or specific id
+
+        :param data_model_id: The data model id
+        :param data_class_id: The data class id
+        :param id_input: Specific data class id
+        :return: :class:`Response' object
+        """
+        if data_class_id is None and id_input is None:
+            response = self._request("get", "/api/dataModels/" + str(data_model_id) + "/dataClasses")
+        elif data_class_id and id_input is None:
+            response = self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses")
+        elif id_input and data_class_id is None:
+            response = self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(id_input))
+        else:
+            response = self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses/" + str(id_input))
+        return response
+
+    def get_codesets(self, folder_id=None, codeset_id=None):
+        """
+        Get codesets - paginated list or specific id
+
+        :param folder_id: The folder id
+        :param codeset_id: Specific codeset id
+        :return: :class:`Response' object
+        """
+        if folder_id is None and codeset_id is None:
+            response = self._request("get", "/api/codeSets/")
+        elif codeset_id is None:
+            response = self._request("get", "/api/folders/" + str(folder_id) + "/codeSets/")
+        else:
+            response = self._request("get", "/api/codeSets/" + str(codeset_id))
+        return response
+
+    def get_data_element(self, data_model_id, data_class_id, id_input=None):
+        """
+        Get data element - paginated list or specific id
+
+        :param data_model_id: The data model id
+        :param data_class_id: The data class id
+        :param id_input: Specific data element id
+        :return: :class:`Response' object
+        """
+        if id_input is None:
+            response = self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataElements")
+        else:
+            response = self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataElements/" + str(id_input))
+        return response
+
+    def get_data_model(self, folder_id=None, id_input=None):
+        """
+        Get data model - paginated list or specific id
+
+        :param folder_id: The folder id
+        :param id_input: Specific data model id
+        :return: :class:`Response' object
+        """
+        if folder_id is None and id_input is None:
+            response = self._request("get", "/api/dataModels")
+        elif folder_id is None and id_input is not None:
+            response = self._request("get", "/api/dataModels/" + str(id_input))
+        else:
+            response = self._request("get", "/api/folders/" + str(folder_id) + "/dataModels")
+        return response
+
+    def get_versioned_folders(self, folder_id=None, id_input=None):
+        """
+        List versioned folders - paginated list or specific id
+
+        :param folder_id: The folder id
+        :param id_input: Specific versioned folder id
+        :return: :class:`Response' object
+        """
+        if folder_id is None and id_input is None:
+            response = self._request("get", "/api/versionedFolders")
+        elif folder_id is None and id_input is not None:
+            response = self._request("get", "/api/versionedFolders/" + str(id_input))
+        else:
+            response = self._request("get", "/api/folders/" + str(folder_id) + "/versionedFolders")
+        return response
+
+    def build_versioned_folder(self, json_payload):
+        """
+        Builds a versioned folder
+
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :return: :class:`Response' object
+        """
+        response = self._request("post", "/api/versionedFolders", json=json_payload)
+        return response
+
+    def create_data_model(self, folder_id, json_payload):
+        """
+        Creates a data model in the specified folder
+
+        :param folder_id: Folder id to create data model in
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :return: :class:`Response' object
+        """
+        response = self._request("post", "/api/folders/" + str(folder_id) + "/dataModels", json=json_payload)
+        return response
+
+    def build_folder(self, json_payload, folder_id=None):
+        """
+        Build a new folder.
+
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :param folder_id: - (optional) The folder id to build the new folder within
+        :return: :class:`Response' object
+        """
+        if folder_id is None:
+            response = self._request("post", "/api/folders", json=json_payload)
+        else:
+            response = self._request("post", "/api/folders/" + str(folder_id) + "/folders", json=json_payload)
+        return response
+
+    def create_new_data_class(self, json_payload, data_model_id, data_class_id=None):
+        """
+        Create a new data class
+
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :param data_model_id: The data model id to which the new class will belong
+        :param data_class_id: - (optional) The data class id to which the new class will belong
+        :return: :class:`Response' object
+        """
+        if data_class_id is None:
+            response = self._request("post", "/api/dataModels/" + str(data_model_id) + "/dataClasses",
+                                     json=json_payload)
+        else:
+            response = self._request(
+                "post", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses", json=json_payload)
+        return response
+
+    def update_data_class(self, json_payload, data_model_id, data_class_id=None):
+        """
+        Updates a data class
+
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :param data_model_id: The data model id to which the class belongs
+        :param data_class_id: The data class to update
+        :return: :class:`Response' object
+        """
+        if data_class_id is None:
+            response = self._request("put", "/api/dataModels/" + str(data_model_id), json=json_payload)
+        else:
+            response = self._request(
+                "put", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id),
+                json=json_payload)
+        return response
+
+    def create_data_element(self, json_payload, data_model_id, data_class_id):
+        """
+        Creates a data element
+
+        :param json_payload: json data to send in the body of the :class: 'Request'
+        :param data_model_id: The data model id to which the element should belong
+        :param data_class_id: The data class id to which the element should belong
+        :return: :class:`Response' object
+        """
+        response = self._request(
+            "post", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id) + "/dataElements",
+            json=json_payload)
+        return response
+
+    def import_data_classes(self, data_model_id, data_classes, max_workers=8, resume=True):
+        """
+        Imports a nested description of data classes and their data elements into a data model.
+
+        Each data class is described by a dict holding the json payload for :meth:`create_new_data_class`, plus
+        optional 'dataClasses' and 'dataElements' lists describing its child data classes and the json payloads of
+        its data elements for :meth:`create_data_element`. Parents are created before their children and independent
+        siblings are created concurrently.
+
+        With resume, data classes and data elements that already exist under their parent with the same label are
+        reused rather than created again, so an interrupted import can be rerun without creating duplicates.
+
+        :param data_model_id: The data model id to import into
+        :param data_classes: list of dict - The top-level data classes to import
+        :param max_workers: int - Maximum number of items created at once. Default value = 8
+        :param resume: bool - Reuse existing items with matching labels. Default value = True
+        :return: list of :class:`Result` - One per data class and data element, in completion order. Each is keyed
+            by ("dataClasses" or "dataElements", path), path being the tuple of labels down from the top-level data
+            class, and holds the item id as its value. Descendants of an item that failed are reported as failed.
+        """
+        results = []
+
+        def existing_children(data_class_id):
+            if not resume:
+                return {}, {}
+            child_classes = dict((item['label'], item['id'])
+                                 for item in self.iter_data_classes(data_model_id, data_class_id))
+            if data_class_id is None:
+                return child_classes, {}
+            child_elements = dict((item['label'], item['id'])
+                                  for item in self.iter_data_elements(data_model_id, data_class_id))
+            return child_classes, child_elements
+
+        def fail_descendants(spec, path, error):
+            for child in spec.get('dataClasses', ()):
+                child_path = path + (child.get('label'),)
+                results.append(Result(("dataClasses", child_path), error=error))
+                fail_descendants(child, child_path, error)
+            for element in spec.get('dataElements', ()):
+                results.append(Result(("dataElements", path + (element.get('label'),)), error=error))
+
+        def children(data_class_id, path, spec, existing):
+            child_classes, child_elements = existing
+            return [("dataClasses", data_class_id, path + (child.get('label'),), child, child_classes)
+                    for child in spec.get('dataClasses', ())] + \
+                   [("dataElements", data_class_id, path + (element.get('label'),), element, child_elements)
+                    for element in spec.get('dataElements', ())]
+
+        def visit(task):
+            domain, parent_id, path, spec, existing = task
+            payload = dict((key, value) for key, value in spec.items() if key not in ('dataClasses', 'dataElements'))
+            response = None
+            try:
+                if spec.get('label') in existing:
+                    item_id = existing[spec['label']]
+                elif domain == "dataClasses":
+                    response = self.create_new_data_class(payload, data_model_id, parent_id)
+                else:
+                    response = self.create_data_element(payload, data_model_id, parent_id)
+                if response is not None:
+                    if not response.ok:
+                        results.append(Result((domain, path), response=response))
+                        fail_descendants(spec, path, ValueError("Parent data class " + repr(path) + " was not created"))
+                        return []
+                    item_id = response.json()['id']
+                if domain == "dataElements":
+                    results.append(Result((domain, path), value=item_id, response=response))
+                    return []
+                grandchildren = existing_children(item_id) if response is None else ({}, {})
+            except (requests.RequestException, ValueError, KeyError) as error:
+                results.append(Result((domain, path), response=response, error=error))
+                fail_descendants(spec, path, error)
+                return []
+            results.append(Result((domain, path), value=item_id, response=response))
+            return children(item_id, path, spec, grandchildren)
+
+        top_level = existing_children(None)
+        _run_tree(children(None, (), dict(dataClasses=data_classes), top_level), visit, max_workers)
+        return results
+
+    def _iter_children(self, kind, parent_id, data_model_id, page_size):
+        """
+        Iterates over the children of one kind of a folder, data model or data class, parent_id None listing the
+        top-level folders and parent_id equal to data_model_id the top-level data classes.
+        """
+        if kind == "folders":
+            return self.iter_folders(parent_id, page_size=page_size, prefetch=False)
+        if kind == "dataModels":
+            return self.iter_data_models(parent_id, page_size=page_size, prefetch=False)
+        if kind == "dataClasses":
+            data_class_id = None if parent_id == data_model_id else parent_id
+            return self.iter_data_classes(data_model_id, data_class_id, page_size=page_size, prefetch=False)
+        return self.iter_data_elements(data_model_id, parent_id, page_size=page_size, prefetch=False)
+
+    def _crawl(self, root, tasks, max_workers, callback, page_size):
+        """
+        Walks the catalogue below root, listing each (kind, node, data_model_id) task's children of that kind and
+        queuing tasks for their own children. Siblings are listed concurrently by max_workers threads.
+
+        :return: The root with its children nested under their kind, or None when streaming to callback
+        """
+        callback_lock = threading.Lock()
+
+        def visit(task):
+            kind, node, data_model_id = task
+            items = list(self._iter_children(kind, node['id'], data_model_id, page_size))
+            if callback is None:
+                node[kind] = items
+            else:
+                with callback_lock:
+                    for item in items:
+                        callback(item, node)
+            if kind == "folders":
+                return [(child_kind, item, None) for item in items for child_kind in ("folders", "dataModels")]
+            if kind == "dataModels":
+                return [("dataClasses", item, item['id']) for item in items]
+            if kind == "dataClasses":
+                return [(child_kind, item, data_model_id) for item in items
+                        for child_kind in ("dataClasses", "dataElements")]
+            return []
+
+        if callback is not None:
+            callback(root, None)
+        _run_tree(tasks, visit, max_workers)
+        return root if callback is None else None
+
+    def crawl_data_model(self, data_model_id, max_workers=8, callback=None, page_size=100):
+        """
+        Fetches the whole hierarchy of a data model: its data classes, their child data classes and their data
+        elements. Sibling subtrees are fetched concurrently, so the time taken grows with the depth of the model
+        rather than its number of items.
+
+        By default the hierarchy is returned as the data model dict with each item's children listed under its
+        'dataClasses' and 'dataElements' keys. If a callback is provided nothing is retained; instead
+        callback(item, parent) is called once for the data model (with parent None) and then for each item as it is
+        fetched. Calls to callback are never made concurrently. A failed request raises :class:`requests.HTTPError`.
+
+        :param data_model_id: The data model id
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param callback: - (optional) Callable taking an item dict and the dict of its parent
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: dict - The data model, or None if a callback is provided
+        """
+        response = self.get_data_model(id_input=data_model_id)
+        response.raise_for_status()
+        root = response.json()
+        return self._crawl(root, [("dataClasses", root, root['id'])], max_workers, callback, page_size)
+
+    def crawl_folder(self, folder_id, max_workers=8, callback=None, page_size=100):
+        """
+        Fetches the whole hierarchy of a folder: its child folders and data models recursively, down to every data
+        class and data element. Sibling subtrees are fetched concurrently.
+
+        By default the hierarchy is returned as the folder dict with each item's children listed under its
+        'folders', 'dataModels', 'dataClasses' and 'dataElements' keys. If a callback is provided nothing is
+        retained; see :meth:`crawl_data_model`.
+
+        :param folder_id: The folder id
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param callback: - (optional) Callable taking an item dict and the dict of its parent
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: dict - The folder, or None if a callback is provided
+        """
+        response = self._request("get", "/api/folders/" + str(folder_id))
+        response.raise_for_status()
+        root = response.json()
+        return self._crawl(root, [("folders", root, None), ("dataModels", root, None)], max_workers, callback,
+                           page_size)
+
+    def index_catalogue(self, folder_id=None, metadata=True, classifiers=True, max_workers=8, page_size=100):
+        """
+        Loads the folders, data models, data classes and data elements below a folder, or in the whole catalogue,
+        into a :class:`CatalogueIndex` that answers queries locally.
+
+        The hierarchy is crawled as in :meth:`crawl_folder`, then the metadata of every item is fetched
+        concurrently, and the classifiers are walked concurrently, listing each one's child classifiers and
+        catalogue items. A failed request raises :class:`requests.HTTPError`.
+
+        :param folder_id: (optional) The folder to index. Default value = None (every top-level folder)
+        :param metadata: bool - Fetch and index each item's metadata. Default value = True
+        :param classifiers: bool - Fetch and index which items each classifier classifies. Default value = True
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: :class:`CatalogueIndex`
+        """
+        index = CatalogueIndex()
+
+        def add(item, parent):
+            if item.get('id') is not None:
+                index.add_item(item, parent['id'] if parent is not None else None)
+
+        if folder_id is None:
+            self._crawl(dict(id=None), [("folders", dict(id=None), None)], max_workers, add, page_size)
+        else:
+            self.crawl_folder(folder_id, max_workers=max_workers, callback=add, page_size=page_size)
+
+        def fetch_metadata(item_id):
+            return list(self.iter_metadata(index.kind(item_id), item_id, page_size=page_size, prefetch=False))
+
+        def fetch_classified(classifier):
+            return list(self._iter_pages("/api/classifiers/" + str(classifier['id']) + "/catalogueItems", page_size,
+                                         prefetch=False))
+
+        def visit_classifier(task):
+            position, classifier = task
+            children = list(self.iter_classifiers(classifier['id'], page_size=page_size, prefetch=False))
+            classified = fetch_classified(classifier)
+            with lock:
+                found.append((position, classifier, classified))
+            return [(position + (number,), child) for number, child in enumerate(children)]
+
+        if metadata:
+            item_ids = list(index._items)
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pymauro") as executor:
+                for item_id, entries in zip(item_ids, executor.map(fetch_metadata, item_ids)):
+                    index.add_metadata(item_id, entries)
+        if classifiers:
+            lock = threading.Lock()
+            found = []
+            top_level = self.iter_classifiers(page_size=page_size, prefetch=False)
+            _run_tree([((number,), classifier) for number, classifier in enumerate(top_level)], visit_classifier,
+                      max_workers)
+            # Added depth first, parents before their children, whatever order their listings arrived in
+            for _, classifier, classified in sorted(found, key=lambda entry: entry[0]):
+                for item in classified:
+                    if item.get('id') in index:
+                        index.add_classifier(item['id'], classifier)
+        return index
+
+    def harvest_metadata(self, writer, folder_id=None, max_workers=8, page_size=100):
+        """
+        Walks the folders, data models, data classes and data elements below a folder, or in the whole catalogue,
+        fetching each item's metadata concurrently and writing one flat row per metadata entry.
+
+        Rows are tuples in the order of METADATA_COLUMNS: the item id, its domain type, its path of labels from the
+        top-level folder in the form 'fo:Folder|dm:Model|dc:Class|de:Element', and the entry's namespace, key and
+        value. They are written as they arrive, in no particular order, and writer.write is never called
+        concurrently. The catalogue is walked depth first with a bounded queue, so memory use does not grow with
+        the size of the catalogue unless the writer keeps the rows, as a :class:`ColumnarTable` does. A failed
+        request raises :class:`requests.HTTPError`; the writer is left open either way.
+
+        :param writer: :class:`CSVWriter`, :class:`NDJSONWriter`, :class:`ColumnarTable` or any object with a
+            write(row) method
+        :param folder_id: (optional) The folder to harvest. Default value = None (every top-level folder)
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: int - Number of rows written
+        """
+        lock = threading.Lock()
+        written = [0]
+
+        def visit(task):
+            if task[0] == "metadata":
+                _, kind, item_id, domain_type, path = task
+                rows = [(item_id, domain_type, path, entry.get('namespace'), entry.get('key'), entry.get('value'))
+                        for entry in self.iter_metadata(kind, item_id, page_size=page_size, prefetch=False)]
+                with lock:
+                    for row in rows:
+                        writer.write(row)
+                    written[0] += len(rows)
+                return []
+            kind, parent_id, data_model_id, path = task
+            tasks = []
+            for item in self._iter_children(kind, parent_id, data_model_id, page_size):
+                item_path = (path + "|" if path else "") + _PATH_PREFIXES[kind] + ":" + str(item.get('label'))
+                tasks.append(("metadata", kind, item['id'], item.get('domainType'), item_path))
+                model_id = item['id'] if kind == "dataModels" else data_model_id
+                tasks.extend(child + (item_path,) for child in _child_listings(kind, item['id'], model_id))
+            return tasks
+
+        if folder_id is None:
+            roots = [("folders", None, None, "")]
+        else:
+            response = self._request("get", "/api/folders/" + str(folder_id))
+            response.raise_for_status()
+            folder = response.json()
+            path = "fo:" + str(folder.get('label'))
+            roots = [("metadata", "folders", folder_id, folder.get('domainType'), path)]
+            roots.extend(child + (path,) for child in _child_listings("folders", folder_id, None))
+        _run_tree(roots, visit, max_workers, max_pending=max_workers * 4)
+        return written[0]
+
+    def audit_permissions(self, previous=None, folder_id=None, max_workers=8, page_size=100):
+        """
+        Fetches who can read and write every folder, data model and terminology below a folder, or in the whole
+        catalogue, concurrently.
+
+        Every folder is listed, and the permissions of each item are fetched with at most max_workers requests in
+        flight. Given a previous audit, items whose lastUpdated and version are unchanged keep their previous
+        permissions without being checked again, so a re-run costs the listings plus one request per new or changed
+        item. Permission changes that do not update an item's lastUpdated are only found by a full audit, made by
+        leaving out previous. Items whose permissions could not be fetched are reported in the audit's errors and
+        checked again by the next run; a failed listing raises :class:`requests.HTTPError`.
+
+        :param previous: :class:`PermissionsAudit` - (optional) The last audit, to only check what changed since
+        :param folder_id: (optional) The folder to audit. Default value = None (every top-level folder)
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: :class:`PermissionsAudit`
+        """
+        audit = PermissionsAudit()
+        lock = threading.Lock()
+
+        def visit(task):
+            if task[0] == "check":
+                _, kind, item, parent_id = task
+                try:
+                    response = self.permissions(kind, item['id'])
+                    response.raise_for_status()
+                    permission_set = _permission_set(response.json())
+                except (requests.RequestException, ValueError) as error:
+                    with lock:
+                        audit.errors[item['id']] = error
+                    return []
+                with lock:
+                    audit.checked += 1
+                    audit._record(item['id'], kind, item.get('label'), parent_id, _watermark(item), permission_set)
+                return []
+            _, kind, parent_id = task
+            if kind == "terminologies":
+                items = self._iter_pages("/api/folders/" + str(parent_id) + "/terminologies", page_size,
+                                         prefetch=False)
+            else:
+                items = self._iter_children(kind, parent_id, None, page_size)
+            tasks = []
+            for item in items:
+                known = previous._items.get(item['id']) if previous is not None else None
+                if known is not None and known[3] == _watermark(item):
+                    with lock:
+                        audit._record(item['id'], kind, item.get('label'), parent_id, known[3],
+                                      previous._sets[known[4]])
+                else:
+                    tasks.append(("check", kind, item, parent_id))
+                if kind == "folders":
+                    tasks.extend(("list", child_kind, item['id'])
+                                 for child_kind in ("folders", "dataModels", "terminologies"))
+            return tasks
+
+        if folder_id is None:
+            roots = [("list", "folders", None)]
+        else:
+            response = self._request("get", "/api/folders/" + str(folder_id))
+            response.raise_for_status()
+            folder = response.json()
+            roots = [("check", "folders", folder, folder.get('parentFolder'))]
+            roots.extend(("list", child_kind, folder_id) for child_kind in ("folders", "dataModels", "terminologies"))
+        _run_tree(roots, visit, max_workers)
+        audit.audited = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        return audit
+
+    def sync_catalogue(self, state, folder_id=None, max_workers=8, page_size=100):
+        """
+        Incrementally syncs the folders, data models, data classes and data elements below a folder, or in the whole
+        catalogue, against the watermarks recorded in state by the previous sync.
+
+        Each container's children are listed and their lastUpdated and version compared with state. Every folder is
+        listed, as Mauro does not update a folder's lastUpdated when the data models in it change, but only the
+        children of new or changed data models and data classes are listed in turn, so an unchanged data model
+        costs no requests beyond the listing it appears in and the time taken grows with the number of folders and
+        the amount of change rather than the size of the catalogue. This relies on Mauro updating a data model's or
+        data class's lastUpdated when its contents change; clear the state to fetch everything again. Sibling
+        subtrees are listed concurrently.
+
+        state is updated and saved only once every listing has succeeded, so a failed sync can simply be run again.
+        A failed request raises :class:`requests.HTTPError`.
+
+        :param state: :class:`SyncState` - The watermarks of the previous sync, updated in place
+        :param folder_id: (optional) The folder to sync. Default value = None (every top-level folder)
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :return: :class:`ChangeSet`
+        """
+        changes = ChangeSet()
+        seen = dict()
+        missing = []
+        lock = threading.Lock()
+
+        def compare(kind, parent_id, data_model_id, item):
+            """Records an item as added or modified, returning whether it changed."""
+            entry = [kind, parent_id, item['id'] if kind == "dataModels" else data_model_id, _watermark(item)]
+            previous = state._items.get(item['id'])
+            if previous is not None and previous[1] == parent_id and previous[3] == entry[3]:
+                return False
+            with lock:
+                seen[item['id']] = entry
+                (changes.added if previous is None else changes.modified).append(item)
+            return True
+
+        def visit(task):
+            kind, parent_id, data_model_id = task
+            items = list(self._iter_children(kind, parent_id, data_model_id, page_size))
+            listed = set(item['id'] for item in items)
+            with lock:
+                changes.listings += 1
+                missing.extend(child for child in state._children_of(parent_id, kind) if child not in listed)
+            # A folder's lastUpdated doesn't change with its contents, so only prune below models and classes
+            return [child for item in items if compare(kind, parent_id, data_model_id, item) or kind == "folders"
+                    for child in _child_listings(kind, item['id'], data_model_id)]
+
+        if folder_id is None:
+            roots = [("folders", None, None)]
+        else:
+            response = self._request("get", "/api/folders/" + str(folder_id))
+            response.raise_for_status()
+            folder = response.json()
+            compare("folders", folder.get('parentFolder'), None, folder)
+            roots = _child_listings("folders", folder_id, None)
+        _run_tree(roots, visit, max_workers)
+        for item_id in missing:
+            if item_id not in seen:
+                changes.deleted.extend(state._remove(item_id, keep=seen))
+        for item_id, entry in seen.items():
+            state._put(item_id, entry)
+        state.save()
+        return changes
+
+    def get_many_data_models(self, ids, max_workers=8):
+        """
+        Gets many data models by id concurrently. Duplicate ids are requested once.
+
+        The client's transport should have a pool_size of at least max_workers for every request to reuse a
+        connection.
+
+        :param ids: Iterable of data model ids
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :return: dict of id to :class:`Result` - Each holds the response, its json as value if successful, or the
+            error raised
+        """
+        return _map_concurrent(lambda data_model_id: self.get_data_model(id_input=data_model_id), ids, max_workers)
+
+    def get_metadata_many(self, catalogue_item_domain_type, ids, max_workers=8):
+        """
+        Gets the metadata of many catalogue items of one domain type concurrently. Duplicate ids are requested once.
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        :param ids: Iterable of catalogue item ids
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :return: dict of id to :class:`Result` - see :meth:`get_many_data_models`
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        return _map_concurrent(lambda item_id: self.get_metadata(catalogue_item_domain_type, item_id), ids,
+                               max_workers)
+
+    def post_metadata_many(self, records, max_workers=8, skip_unchanged=True):
+        """
+        Writes many metadata entries concurrently.
+
+        Records are grouped by catalogue item. With skip_unchanged each item's existing metadata is read once, and
+        records whose namespace and key already hold the same value are skipped while those holding a different
+        value are updated in place; otherwise every record is posted as a new entry. Only the last of several
+        records for the same item, namespace and key is written. Items are read and written concurrently, with at
+        most max_workers requests in flight.
+
+        :param records: Iterable of (catalogue_item_domain_type, catalogue_item_id, namespace, key, value) tuples.
+            Each domain type must be one of those accepted by :meth:`post_metadata`.
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :param skip_unchanged: bool - Read each item's metadata to skip or update existing entries.
+            Default value = True
+        :return: list of :class:`Result` - One per record, in the order given, keyed by the record. Each holds the
+            metadata entry id as value if written or already held, with no response if no request was needed; a
+            record superseded by a later one for the same key has no value.
+        """
+        records = [tuple(record) for record in records]
+        items = OrderedDict()
+        for position, (domain_type, item_id, namespace, key, value) in enumerate(records):
+            _check_domain_type(domain_type)
+            # Keyed by namespace and key, so that a later record for the same key replaces an earlier one
+            writes = items.setdefault((domain_type, item_id), OrderedDict())
+            writes.pop((namespace, key), None)
+            writes[(namespace, key)] = position
+        results = [Result(record) for record in records]
+
+        def visit(task):
+            if task[0] == "item":
+                _, (domain_type, item_id), writes = task
+                existing = dict()
+                if skip_unchanged:
+                    try:
+                        for entry in self.iter_metadata(domain_type, item_id, prefetch=False):
+                            existing[(entry.get('namespace'), entry.get('key'))] = entry
+                    except (requests.RequestException, ValueError) as error:
+                        for position in writes.values():
+                            results[position] = Result(records[position], error=error,
+                                                       response=getattr(error, 'response', None))
+                        return []
+                return [("write", position, existing.get(namespace_key)) for namespace_key, position in writes.items()]
+            _, position, entry = task
+            domain_type, item_id, namespace, key, value = records[position]
+            if entry is not None and entry.get('value') == value:
+                results[position] = Result(records[position], value=entry.get('id'))
+                return []
+            path = "/api/" + str(domain_type) + "/" + str(item_id) + "/metadata"
+            response = None
+            try:
+                if entry is None:
+                    response = self._request("post", path, json=dict(namespace=namespace, key=key, value=value))
+                else:
+                    response = self._request("put", path + "/" + str(entry['id']),
+                                             json=dict(id=entry['id'], namespace=namespace, key=key, value=value))
+                results[position] = Result(records[position], value=response.json().get('id') if response.ok
+                                           else None, response=response)
+            except (requests.RequestException, ValueError) as error:
+                results[position] = Result(records[position], response=response, error=error)
+            return []
+
+        _run_tree([("item", item, writes) for item, writes in items.items()], visit, max_workers)
+        return results
+
+    def permissions_many(self, catalogue_item_domain_type, ids, max_workers=8):
+        """
+        Gets the permissions of many catalogue items of one domain type concurrently. Duplicate ids are requested
+        once.
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        :param ids: Iterable of catalogue item ids
+        :param max_workers: int - Maximum number of requests in flight at once. Default value = 8
+        :return: dict of id to :class:`Result` - see :meth:`get_many_data_models`
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        return _map_concurrent(lambda item_id: self.permissions(catalogue_item_domain_type, item_id), ids,
+                               max_workers)
+
+    def _iter_pages(self, path, page_size=100, prefetch=True):
+        """
+        Yields the items of a paginated list endpoint one at a time, requesting page_size items per request.
+
+        With prefetch the next page is requested in a background thread while the current page is being consumed,
+        so at most two pages are held in memory. A page that is not successful raises :class:`requests.HTTPError`.
+
+        :param path: The path of the list endpoint
+        :param page_size: int - Number of items requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        def fetch(offset):
+            page_response = self._request("get", path, params=dict(offset=offset, max=page_size))
+            page_response.raise_for_status()
+            return page_response.json()
+
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pymauro-prefetch") if prefetch else None
+        try:
+            offset = 0
+            page = fetch(offset)
+            while True:
+                items = page.get('items', [])
+                offset += len(items)
+                if page.get('count') is not None:
+                    more = 0 < len(items) and offset < page['count']
+                else:
+                    more = len(items) == page_size
+                next_page = executor.submit(fetch, offset) if more and executor is not None else None
+                for item in items:
+                    yield item
+                if not more:
+                    return
+                page = next_page.result() if next_page is not None else fetch(offset)
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_folders(self, folder_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over the folders present in a Mauro instance, or the child folders of a folder, fetching a page at a
+        time as the iterator is consumed.
+
+        :param folder_id: - (optional) The parent folder id
+        :param page_size: int - Number of folders requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if folder_id is None:
+            return self._iter_pages("/api/folders", page_size, prefetch)
+        return self._iter_pages("/api/folders/" + str(folder_id) + "/folders", page_size, prefetch)
+
+    def iter_data_models(self, folder_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over all data models, or the data models within a folder, fetching a page at a time as the iterator
+        is consumed.
+
+        :param folder_id: - (optional) The folder id
+        :param page_size: int - Number of data models requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if folder_id is None:
+            return self._iter_pages("/api/dataModels", page_size, prefetch)
+        return self._iter_pages("/api/folders/" + str(folder_id) + "/dataModels", page_size, prefetch)
+
+    def iter_data_classes(self, data_model_id, data_class_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over the data classes of a data model, or the child classes of a data class, fetching a page at a
+        time as the iterator is consumed.
+
+        :param data_model_id: The data model id
+        :param data_class_id: - (optional) The parent data class id
+        :param page_size: int - Number of data classes requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if data_class_id is None:
+            return self._iter_pages("/api/dataModels/" + str(data_model_id) + "/dataClasses", page_size, prefetch)
+        return self._iter_pages("/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                                + "/dataClasses", page_size, prefetch)
+
+    def iter_data_elements(self, data_model_id, data_class_id, page_size=100, prefetch=True):
+        """
+        Iterates over the data elements of a data class, fetching a page at a time as the iterator is consumed.
+
+        :param data_model_id: The data model id
+        :param data_class_id: The data class id
+        :param page_size: int - Number of data elements requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        return self._iter_pages("/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                                + "/dataElements", page_size, prefetch)
+
+    def iter_metadata(self, catalogue_item_domain_type, catalogue_item_id, page_size=100, prefetch=True):
+        """
+        Iterates over the metadata of a catalogue item, fetching a page at a time as the iterator is consumed.
+
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses", "dataElements",
+         "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        :param catalogue_item_id: The id of the catalogue item.
+        :param page_size: int - Number of metadata entries requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        return self._iter_pages("/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id)
+                                + "/metadata", page_size, prefetch)
+
+    def iter_classifiers(self, classifier_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over all classifiers, or the child classifiers of a classifier, fetching a page at a time as the
+        iterator is consumed.
+
+        :param classifier_id: - (optional) Parent classifier id
+        :param page_size: int - Number of classifiers requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if classifier_id is None:
+            return self._iter_pages("/api/classifiers", page_size, prefetch)
+        return self._iter_pages("/api/classifiers/" + str(classifier_id) + "/classifiers", page_size, prefetch)
+
+    def iter_codesets(self, folder_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over all codesets, or the codesets within a folder, fetching a page at a time as the iterator is
+        consumed.
+
+        :param folder_id: - (optional) The folder id
+        :param page_size: int - Number of codesets requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if folder_id is None:
+            return self._iter_pages("/api/codeSets/", page_size, prefetch)
+        return self._iter_pages("/api/folders/" + str(folder_id) + "/codeSets/", page_size, prefetch)
+
+    def iter_versioned_folders(self, folder_id=None, page_size=100, prefetch=True):
+        """
+        Iterates over all versioned folders, or the versioned folders within a folder, fetching a page at a time as
+        the iterator is consumed.
+
+        :param folder_id: - (optional) The folder id
+        :param page_size: int - Number of versioned folders requested per page. Default value = 100
+        :param prefetch: bool - Fetch the next page in the background. Default value = True
+        :return: generator of dict
+        """
+        if folder_id is None:
+            return self._iter_pages("/api/versionedFolders", page_size, prefetch)
+        return self._iter_pages("/api/folders/" + str(folder_id) + "/versionedFolders", page_size, prefetch)
+
+    def _stream_items(self, path, typed):
+        """
+        Requests every item of a list endpoint in one response and yields them as the response downloads. A response
+        that is not successful raises :class:`requests.HTTPError`.
+
+        :param path: The path of the list endpoint
+        :param typed: bool - Yield typed objects, see :func:`to_typed`, rather than dicts
+        :return: generator of dict or :class:`MauroObject`
+        """
+        response = self._request("get", path, params=dict(all='true'), stream=True)
+        try:
+            response.raise_for_status()
+            for item in iter_json_items(response):
+                yield to_typed(item) if typed else item
+        finally:
+            response.close()
+
+    def stream_folders(self, folder_id=None, typed=False):
+        """
+        Streams every folder, or every child folder of a folder, from a single response, yielding each folder as soon
+        as it has downloaded without holding the whole response in memory.
+
+        :param folder_id: - (optional) The parent folder id
+        :param typed: bool - Yield :class:`Folder` objects rather than dicts. Default value = False
+        :return: generator of dict or :class:`Folder`
+        """
+        if folder_id is None:
+            return self._stream_items("/api/folders", typed)
+        return self._stream_items("/api/folders/" + str(folder_id) + "/folders", typed)
+
+    def stream_data_models(self, folder_id=None, typed=False):
+        """
+        Streams every data model, or every data model within a folder, from a single response, yielding each data
+        model as soon as it has downloaded without holding the whole response in memory.
+
+        :param folder_id: - (optional) The folder id
+        :param typed: bool - Yield :class:`DataModel` objects rather than dicts. Default value = False
+        :return: generator of dict or :class:`DataModel`
+        """
+        if folder_id is None:
+            return self._stream_items("/api/dataModels", typed)
+        return self._stream_items("/api/folders/" + str(folder_id) + "/dataModels", typed)
+
+    def stream_data_classes(self, data_model_id, data_class_id=None, typed=False):
+        """
+        Streams every data class of a data model, or every child class of a data class, from a single response,
+        yielding each data class as soon as it has downloaded without holding the whole response in memory.
+
+        :param data_model_id: The data model id
+        :param data_class_id: - (optional) The parent data class id
+        :param typed: bool - Yield :class:`DataClass` objects rather than dicts. Default value = False
+        :return: generator of dict or :class:`DataClass`
+        """
+        if data_class_id is None:
+            return self._stream_items("/api/dataModels/" + str(data_model_id) + "/dataClasses", typed)
+        return self._stream_items("/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                                  + "/dataClasses", typed)
+
+    def stream_data_elements(self, data_model_id, data_class_id, typed=False):
+        """
+        Streams every data element of a data class from a single response, yielding each data element as soon as it
+        has downloaded without holding the whole response in memory.
+
+        :param data_model_id: The data model id
+        :param data_class_id: The data class id
+        :param typed: bool - Yield :class:`DataElement` objects rather than dicts. Default value = False
+        :return: generator of dict or :class:`DataElement`
+        """
+        return self._stream_items("/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                                  + "/dataElements", typed)
+
+    def method_constructor(self, command, json_payload=None, *args):
+        """
+        A generalised way of creating any endpoint. Any additional arguments provided via args will be appended
+        to baseurl allowing custom endpoints to be rapidly built.
+
+        :param command: String value that must be one of 'put', 'post', 'get' or 'delete'
+        :param json_payload: - (optional) json data to send in the body of the :class: 'Request'
+        :param args: - (optional) String to compose endpoints
+        :return: :class:`Response' object
+        """
+        if command not in ['put', 'post', 'get', "delete"]:
+            raise ValueError("Must be put, post, delete or get")
+        append_string = ""
+        for vals in args:
+            append_string = append_string + vals
+        response = self._request(command, append_string, json=json_payload)
+        return response
+
+
+class _ItemWrites:
+    """The writes queued for one catalogue item: a merged update and the latest value of each metadata key."""
+    __slots__ = ("path", "payload", "futures", "metadata", "queued", "count")
+
+    def __init__(self):
+        self.path = None
+        self.payload = None
+        self.futures = []
+        self.metadata = OrderedDict()  # (namespace, key) -> [domain type, value, futures]
+        self.queued = time.monotonic()
+        self.count = 0
+
+
+class WriteBehindQueue:
+    """
+    Buffers writes made through a :class:`BaseClient` and sends them in the background, so that callers do not wait
+    on the network.
+
+    Successive updates to the same data model or data class are merged into one PUT, later fields replacing earlier
+    ones, and successive metadata writes to the same item, namespace and key are merged into one write of the
+    latest value, sent as by :meth:`BaseClient.post_metadata_many`. Writes are flushed once max_pending are queued,
+    once the oldest has waited max_delay seconds, or on :meth:`flush`. Items are written concurrently by up to
+    max_workers threads, but an item's writes queued while its previous batch is being sent wait for that batch to
+    finish. Within a batch the item's merged update is sent first and then its metadata writes, whatever order they
+    were queued in.
+
+    Each queued write returns a :class:`concurrent.futures.Future` resolving to the :class:`Response` of the request
+    that carried it, which is shared by merged writes, or to None for a metadata value the item already held. A
+    request that could not be sent sets the exception raised on the future instead.
+
+    Attributes
+    ----------
+    client : :class:`BaseClient`
+        The client to write through
+    max_pending : int
+        Number of queued writes that triggers a flush. Default value = 100
+    max_delay : float
+        Seconds a write may wait before it is flushed. Default value = 1.0
+    max_workers : int
+        Maximum number of items written at once. Default value = 8
+
+    Methods
+    -------
+    update_data_class
+    post_metadata
+    flush
+    close
+
+    """
+
+    def __init__(self, client, max_pending=100, max_delay=1.0, max_workers=8):
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.client = client
+        self.max_pending = max_pending
+        self.max_delay = max_delay
+        self._condition = threading.Condition()
+        self._pending = OrderedDict()  # item id -> _ItemWrites
+        self._in_flight = set()
+        self._flushing = 0
+        self._closed = False
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pymauro-write")
+        self._thread = threading.Thread(target=self._run, name="pymauro-write-behind", daemon=True)
+        self._thread.start()
+
+    def __repr__(self):
+        return "Mauro Write Behind Queue Object (" + str(len(self)) + " pending)"
+
+    def __len__(self):
+        with self._condition:
+            return sum(writes.count for writes in self._pending.values())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _queue(self, item_id):
+        """The writes pending for an item, to be added to while holding the lock."""
+        if self._closed:
+            raise ValueError("The write behind queue is closed.")
+        writes = self._pending.get(item_id)
+        if writes is None:
+            writes = self._pending[item_id] = _ItemWrites()
+        writes.count += 1
+        return writes
+
+    def update_data_class(self, json_payload, data_model_id, data_class_id=None):
+        """
+        Queues an update of a data class, or of the data model if no data class is given, see
+        :meth:`BaseClient.update_data_class`.
+
+        :param json_payload: dict - The fields to update
+        :param data_model_id: The data model id to which the class belongs
+        :param data_class_id: - (optional) The data class to update
+        :return: :class:`concurrent.futures.Future`
+        """
+        future = Future()
+        with self._condition:
+            writes = self._queue(data_class_id if data_class_id is not None else data_model_id)
+            writes.path = "/api/dataModels/" + str(data_model_id)
+            if data_class_id is not None:
+                writes.path += "/dataClasses/" + str(data_class_id)
+            writes.payload = dict(writes.payload or {}, **json_payload)
+            writes.futures.append(future)
+            self._condition.notify_all()
+        return future
+
+    def post_metadata(self, catalogue_item_domain_type, catalogue_item_id, namespace_inp, key_val, value_inp):
+        """
+        Queues a metadata write, see :meth:`BaseClient.post_metadata`. An existing entry with the same namespace and
+        key is updated rather than duplicated.
+
+        :param catalogue_item_domain_type: Must be one of those accepted by :meth:`BaseClient.post_metadata`
+        :param catalogue_item_id: The catalogue item id
+        :param namespace_inp: The namespace
+        :param key_val: The key
+        :param value_inp: The value
+        :return: :class:`concurrent.futures.Future`
+        """
+        _check_domain_type(catalogue_item_domain_type)
+        future = Future()
+        with self._condition:
+            writes = self._queue(catalogue_item_id)
+            entry = writes.metadata.pop((namespace_inp, key_val), None)
+            futures = entry[2] if entry is not None else []
+            futures.append(future)
+            writes.metadata[(namespace_inp, key_val)] = [catalogue_item_domain_type, value_inp, futures]
+            self._condition.notify_all()
+        return future
+
+    def flush(self, timeout=None):
+        """
+        Sends every queued write and waits until all have finished.
+
+        :param timeout: float - (optional) Seconds to wait. Default value = None (wait until finished)
+        :return: bool - Whether every write finished within the timeout
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                return self._condition.wait_for(lambda: not self._pending and not self._in_flight, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self):
+        """
+        Sends every queued write, waits for them to finish and stops the background threads. Writes cannot be
+        queued once the queue is closed.
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+
+    def _run(self):
+        with self._condition:
+            while True:
+                if self._closed and not self._pending:
+                    return
+                oldest = min((writes.queued for item_id, writes in self._pending.items()
+                              if item_id not in self._in_flight), default=None)
+                now = time.monotonic()
+                if oldest is not None and (self._flushing or self._closed or now - oldest >= self.max_delay
+                                           or sum(writes.count for writes in self._pending.values())
+                                           >= self.max_pending):
+                    for item_id in [item_id for item_id in self._pending if item_id not in self._in_flight]:
+                        self._in_flight.add(item_id)
+                        self._executor.submit(self._send, item_id, self._pending.pop(item_id))
+                    continue
+                self._condition.wait(None if oldest is None else oldest + self.max_delay - now)
+
+    def _send(self, item_id, writes):
+        try:
+            if writes.payload is not None:
+                futures = [future for future in writes.futures if future.set_running_or_notify_cancel()]
+                try:
+                    response = self.client._request("put", writes.path, json=writes.payload)
+                except Exception as error:  # e.g. a payload that is not json serialisable, or a failed login
+                    for future in futures:
+                        future.set_exception(error)
+                else:
+                    for future in futures:
+                        future.set_result(response)
+            if writes.metadata:
+                records = [(domain_type, item_id, namespace, key, value)
+                           for (namespace, key), (domain_type, value, _) in writes.metadata.items()]
+                try:
+                    results = self.client.post_metadata_many(records, max_workers=1)
+                except Exception as error:
+                    results = [Result(record, error=error) for record in records]
+                for result, (_, _, futures) in zip(results, writes.metadata.values()):
+                    for future in futures:
+                        if not future.set_running_or_notify_cancel():
+                            continue
+                        if result.error is not None:
+                            future.set_exception(result.error)
+                        else:
+                            future.set_result(result.response)
+        finally:
+            # Never leave a caller waiting on a write that will not be sent
+            for future in writes.futures + [future for _, _, futures in writes.metadata.values()
+                                            for future in futures]:
+                if not future.done() and (future.running() or future.set_running_or_notify_cancel()):
+                    future.set_exception(RuntimeError("The write to " + str(item_id) + " was not sent"))
+            with self._condition:
+                self._in_flight.discard(item_id)
+                self._condition.notify_all()
+
+
+class AsyncTransport:
+    """
+    A pooled, keep-alive HTTP/1.1 transport to a single Mauro Data Mapper instance for asyncio, the counterpart of
+    :class:`Transport` used by :class:`AsyncBaseClient`.
+
+    Requests are sent over asyncio streams, so many can be in flight from one thread without blocking the event loop.
+    Connections are kept alive and reused, the most recently returned first, and at most pool_size requests are in
+    flight at once, further requests waiting for a connection. Responses are returned as :class:`requests.Response`
+    objects with their content read, so they are used exactly as those of :class:`Transport`, and failures raise
+    :class:`requests.ConnectionError` or :class:`requests.Timeout`. Like :class:`Transport` it holds no credentials
+    or cookies, so it may be shared by several clients of the same instance. A transport must only be used from one
+    event loop.
+
+    Attributes
+    ----------
+    baseurl : str
+        The base URL of the Mauro instance, http or https
+    pool_size : int
+        Maximum number of requests in flight, and of connections kept alive, at once. Default value = 10
+    timeout : float
+        (optional) Seconds to wait for each request's response. Default value = None (wait forever)
+    metrics : :class:`Metrics`
+        (optional) Receives measurements of every request, e.g. a :class:`MetricsRecorder`. Default value = a no-op
+        Metrics
+
+    Methods
+    -------
+    request
+    close
+
+    """
+    _encoder = json.JSONEncoder()  # The request's json argument hides the module
+
+    def __init__(self, baseurl, pool_size=10, timeout=None, metrics=None):
+        if pool_size < 1:
+            raise ValueError("pool_size must be at least 1")
+        url = urlsplit(baseurl)
+        if url.scheme not in ("http", "https") or not url.hostname:
+            raise ValueError("The base URL must be an http or https URL.")
+        self._baseURL = baseurl
+        self._host = url.hostname
+        self._port = url.port or (443 if url.scheme == "https" else 80)
+        self._host_header = url.netloc.rpartition("@")[2]
+        self._prefix = url.path.rstrip("/")
+        self._ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.metrics = metrics if metrics is not None else _NO_METRICS
+        self._idle = []  # (reader, writer) of open connections, the most recently returned last
+        self._slots = None  # Created in the running loop by the first request
+
+    @property
+    def baseURL(self):
+        return self._baseURL
+
+    def __repr__(self):
+        return "Mauro Async Transport Object"
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def request(self, method, path, params=None, json=None, data=None, headers=None, cookies=None,
+                      timeout=None):
+        """
+        Sends a request to the baseurl appended with path over a pooled connection.
+
+        :param method: The HTTP method e.g. 'get'
+        :param path: The path to append to the baseurl, e.g. /api/folders
+        :param params: dict - (optional) Query parameters
+        :param json: - (optional) json data to send in the body
+        :param data: bytes or str - (optional) The body to send
+        :param headers: dict - (optional) Headers to send
+        :param cookies: dict or :class:`requests.cookies.RequestsCookieJar` - (optional) Cookies to send
+        :param timeout: float - (optional) Seconds to wait for the response. Default value = the transport's timeout
+        :return: :class:`Response' object
+        """
+        method = method.upper()
+        if params:
+            path = path + ('&' if '?' in path else '?') + urlencode(params, doseq=True)
+        if json is not None:
+            body = self._encoder.encode(json).encode()
+            headers = dict({"Content-Type": "application/json"}, **(headers or {}))
+        elif isinstance(data, str):
+            body = data.encode()
+        else:
+            body = data or b""
+        lines = [method + " " + self._prefix + path + " HTTP/1.1", "Host: " + self._host_header,
+                 "User-Agent: pymauro", "Accept: */*", "Accept-Encoding: identity", "Connection: keep-alive"]
+        if body or method in ("POST", "PUT", "PATCH"):
+            lines.append("Content-Length: " + str(len(body)))
+        lines.extend(str(name) + ": " + str(value) for name, value in (headers or {}).items())
+        if cookies:
+            lines.append("Cookie: " + "; ".join(name + "=" + value for name, value in cookies.items()))
+        head = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+        endpoint = method + " " + _endpoint_template(path.split('?')[0])
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.pool_size)
+        async with self._slots:
+            start = time.perf_counter()
+            attempt = [0, False]  # Resends, and whether the last connection was reused
+            try:
+                status, reason, fields, content = await asyncio.wait_for(
+                    self._exchange(method, head + body, attempt), timeout if timeout is not None else self.timeout)
+            except asyncio.TimeoutError as error:
+                self.metrics.record_request(endpoint, None, time.perf_counter() - start, len(body), 0, attempt[0],
+                                            attempt[1], error=error)
+                raise requests.Timeout("No response to " + method + " " + path + " in time") from error
+            except (OSError, ValueError, asyncio.IncompleteReadError) as error:
+                self.metrics.record_request(endpoint, None, time.perf_counter() - start, len(body), 0, attempt[0],
+                                            attempt[1], error=error)
+                raise requests.ConnectionError("Failed to " + method + " " + path + ": " + repr(error)) from error
+            elapsed = time.perf_counter() - start
+        self.metrics.record_request(endpoint, status, elapsed, len(body), len(content), attempt[0], attempt[1])
+        response = requests.Response()
+        response.status_code = status
+        response.reason = reason
+        response.headers = CaseInsensitiveDict()
+        for name, value in fields:
+            response.headers[name] = value if name not in response.headers \
+                else response.headers[name] + ", " + value
+            if name.lower() == "set-cookie":
+                for morsel in SimpleCookie(value).values():
+                    response.cookies.set(morsel.key, morsel.value, path=morsel['path'] or "/")
+        response._content = content
+        response.url = self.baseURL + path
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        response.elapsed = datetime.timedelta(seconds=elapsed)
+        request = requests.PreparedRequest()
+        request.method, request.url, request.body = method, response.url, body or None
+        request.headers = CaseInsensitiveDict(headers or {})
+        response.request = request
+        return response
+
+    async def _connect(self):
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(self._host, self._port, ssl=self._ssl)
+        return reader, writer, False
+
+    async def _exchange(self, method, message, attempt):
+        """
+        Sends a request and reads its response over a pooled connection. A reused connection that the server closed
+        before answering is replaced once, unless the method is POST, as for the retry policy of :class:`Transport`.
+
+        :return: tuple of (status, reason, list of (name, value) header fields, content)
+        """
+        while True:
+            reader, writer, attempt[1] = await self._connect()
+            answered = False
+            try:
+                writer.write(message)
+                await writer.drain()
+                line = await reader.readline()
+                while True:
+                    if not line:
+                        raise ConnectionResetError("The connection was closed without a response")
+                    answered = True
+                    version, status, reason = (line.decode('latin-1').rstrip("\r\n").split(" ", 2) + [""])[:3]
+                    status = int(status)
+                    fields = []
+                    while True:
+                        field = await reader.readline()
+                        if field in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = field.decode('latin-1').partition(":")
+                        fields.append((name.strip(), value.strip()))
+                    if not 100 <= status < 200:
+                        break
+                    line = await reader.readline()  # An interim response, e.g. 100 Continue, precedes the answer
+                content, reusable = await self._read_body(reader, method, status, fields)
+                if not version.endswith("/1.1"):
+                    reusable = reusable and any(name.lower() == "connection" and value.lower() == "keep-alive"
+                                                for name, value in fields)
+            except BaseException as error:
+                writer.close()
+                if attempt[1] and not answered and method != "POST" and attempt[0] == 0 \
+                        and isinstance(error, (ConnectionError, asyncio.IncompleteReadError)):
+                    attempt[0] += 1
+                    continue
+                raise
+            if reusable and len(self._idle) < self.pool_size:
+                self._idle.append((reader, writer))
+            else:
+                writer.close()
+            return status, reason, fields, content
+
+    @staticmethod
+    async def _read_body(reader, method, status, fields):
+        """
+        Reads a response body delimited by Content-Length, chunked or by the server closing the connection.
+
+        :return: tuple of (content, whether the connection may be reused)
+        """
+        headers = CaseInsensitiveDict(fields)
+        reusable = (headers.get("Connection") or "").lower() != "close"
+        if method == "HEAD" or status in (204, 304):
+            return b"", reusable
+        if "chunked" in (headers.get("Transfer-Encoding") or "").lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b";")[0].strip(), 16)
+                if size == 0:
+                    while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass  # Trailer fields
+                    return b"".join(chunks), reusable
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+        if headers.get("Content-Length") is not None:
+            return await reader.readexactly(int(headers["Content-Length"])), reusable
+        return await reader.read(), False
+
+    async def close(self):
+        """
+        Closes all pooled connections.
+        """
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+        for _, writer in idle:
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+class AsyncBaseClient:
+    """
+    An asyncio client for a Mauro Data Mapper instance, offering the endpoint methods of :class:`BaseClient` as
+    coroutines.
+
+    Requests are sent over an :class:`AsyncTransport`, so a single thread can keep many requests in flight over one
+    pool of keep-alive connections; at most max_concurrency are in flight at once however many coroutines are
+    awaiting. Authentication, caching and coalescing behave as for :class:`BaseClient`: an expired session is
+    replaced by one login shared by every waiting coroutine, each refused request being retried once; identical GET
+    requests awaited at the same time share one request; and with a cache, GET responses are cached and invalidated
+    by the requests that modify them. Arguments and return values match the equivalent :class:`BaseClient` method.
 
+    Logging in is itself a request, made by ``await AsyncBaseClient.create(...)``, on entering ``async with`` or
+    otherwise by the first request. A client must only be used from one event loop, and closed with
+    ``await client.close()`` or by leaving ``async with``.
 
     Attributes
     ----------
@@ -54,9 +4688,27 @@ class BaseClient:
         Login password
     api_key: str
         The API key to authenticate
+    transport: :class:`AsyncTransport`
+        (optional) A transport to send requests over. It must share the client's baseurl, and its pool_size then
+        limits the requests in flight rather than max_concurrency.
+    cache: :class:`ResponseCache`
+        (optional) A cache for GET responses. Caching is disabled by default.
+    max_concurrency : int
+        Maximum number of requests in flight at once. Default value = 10
+    coalesce: bool
+        Whether identical GET requests awaited at the same time share one request and its response.
+        Default value = True
+    session_timeout: float
+        (optional) Seconds of inactivity after which the instance expires a login session. If given, a background
+        task keeps an idle session alive as the keep-alive thread of :class:`BaseClient` does.
+        Default value = None (no keep-alive)
 
     Methods
     -------
+    create
+    close
+    get_current_user
+    refresh_session
     test_my_connection
     check_for_valid_session
     logout
@@ -71,26 +4723,13 @@ class BaseClient:
     get_metadata
     permissions
     post_metadata
-    get_classifiers
-    get_data_classes
-    get_codesets
-    get_data_element
-    get_data_model
-    get_versioned_folder
-    build_versioned_folder
-    create_data_model
-    build_folder
-    create_new_data_class
-    update_data_class
-    create_data_element
-    method_constructor
-
-    Each method possesses its own docstring.
-
 
     """
 
-    def __init__(self, baseurl, username=None, password=None, api_key=None):
+    def __init__(self, baseurl, username=None, password=None, api_key=None, transport=None, cache=None,
+                 max_concurrency=10, coalesce=True, session_timeout=None):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
         self._baseURL = baseurl  # Non-public to prevent accidental editing
         self._username = username  # Non-public to prevent accidental editing
         self.__password = password  # Name mangled to prevent accidental disclosure
@@ -99,13 +4738,28 @@ class BaseClient:
                 or self._username is not None and self.__password is None \
                 or self._username is None and self.__password is not None:
             raise TypeError("You must provide at a minimum: the username and password as a pairing or an API Key.")
+        if transport is None:
+            self._transport = AsyncTransport(baseurl, pool_size=max_concurrency)
+            self._owns_transport = True
+        elif transport.baseURL != baseurl:
+            raise ValueError("The transport must point at the same base URL as the client.")
+        else:
+            self._transport = transport
+            self._owns_transport = False
+        self.max_concurrency = max_concurrency
+        self._cache = cache
+        self._in_flight = dict() if coalesce else None  # Coalesced GET requests by request key
+        self._session_lock = None  # Created in the running loop; guards logging in and the cookie and user it sets
+        self.headers = dict()
         if self.api_key is not None:
-            self.headers = dict()
             self.headers['apiKey'] = self.api_key
-        if self._username is not None and 'id' in self.test_my_connection().json().keys():
-            self.cookie = self.test_my_connection().cookies
-        else:
-            self.cookie = None
+        self.cookie = None
+        self._user = None
+        self._login_failed = None
+        self._last_used = time.monotonic()
+        self.session_timeout = session_timeout
+        self._started = False
+        self._keep_alive = None
 
     @property
     def username(self):
@@ -115,10 +4769,244 @@ class BaseClient:
     def baseURL(self):
         return self._baseURL
 
+    @property
+    def transport(self):
+        return self._transport
+
+    @property
+    def cache(self):
+        return self._cache
+
     def __repr__(self):
-        return "Mauro Client Object"
+        return "Mauro Async Client Object"
 
-    def test_my_connection(self):
+    @classmethod
+    async def create(cls, *args, **kwargs):
+        """
+        Constructs a client and logs in.
+
+        :param args: - Positional arguments as for the constructor
+        :param kwargs: - Keyword arguments as for the constructor
+        :return: :class:`AsyncBaseClient`
+        """
+        client = cls(*args, **kwargs)
+        await client._start()
+        return client
+
+    async def __aenter__(self):
+        await self._start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Stops keeping the session alive and closes the client's pooled connections. A transport provided to the
+        client is left open as it may be shared.
+        """
+        if self._keep_alive is not None:
+            self._keep_alive.cancel()
+            try:
+                await self._keep_alive
+            except asyncio.CancelledError:
+                pass
+            self._keep_alive = None
+        if self._owns_transport:
+            await self._transport.close()
+
+    def _lock(self):
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        return self._session_lock
+
+    async def _start(self):
+        """
+        Logs in and starts keeping the session alive, once.
+        """
+        if self._started:
+            return
+        async with self._lock():
+            if self._started:
+                return
+            self._started = True
+            if self._username is not None:
+                if self.session_timeout is not None:
+                    self._keep_alive = asyncio.ensure_future(self._keep_session_alive())
+                await self._login()
+
+    async def _request(self, method, path, **kwargs):
+        """
+        Sends a request over the client's transport as :meth:`BaseClient._request` does, logging in first if the
+        client has not yet done so.
+
+        :param method: The HTTP method e.g. 'get'
+        :param path: The path to append to the baseurl
+        :param kwargs: - (optional) Further arguments passed to :meth:`AsyncTransport.request`
+        :return: :class:`Response' object
+        """
+        await self._start()
+        if method.lower() != "get":
+            try:
+                return await self._send(method, path, **kwargs)
+            finally:
+                if self._in_flight:
+                    # A GET made after this write must not join one sent before it
+                    tags = _invalidation_tags(path)
+                    for key in [key for key in self._in_flight if not tags.isdisjoint(_cache_tags(key[1]))]:
+                        del self._in_flight[key]
+                if self._cache is not None:
+                    self._cache.invalidate(path)
+        if 'cookies' in kwargs or any(kwargs.get(name) is not None for name in ('json', 'data', 'headers')):
+            return await self._send(method, path, **kwargs)
+        get = self._send if self._cache is None else self._cached_get
+        if self._in_flight is None:
+            return await get("get", path, **kwargs)
+        identity = self.api_key if self.api_key is not None else self.username
+        key = _request_key(identity, path, kwargs.get('params'))
+        task = self._in_flight.get(key)
+        if task is None:
+            task = self._in_flight[key] = asyncio.ensure_future(get("get", path, **kwargs))
+
+            def forget(done):
+                if self._in_flight.get(key) is done:
+                    del self._in_flight[key]
+
+            task.add_done_callback(forget)
+        else:
+            self._transport.metrics.record_coalesced("GET " + _endpoint_template(path))
+        # Shielded, so that one awaiting coroutine being cancelled does not cancel the request for the others
+        return await asyncio.shield(task)
+
+    async def _send(self, method, path, **kwargs):
+        headers = kwargs.pop('headers', None)
+        if 'cookies' in kwargs:
+            return await self._transport.request(method, path, headers=headers, **kwargs)
+        if self.api_key is not None:
+            if headers:
+                headers = dict(self.headers, **headers)
+            return await self._transport.request(method, path, headers=headers or self.headers, **kwargs)
+        cookie = self.cookie
+        if cookie is None and self._login_failed is not None:
+            async with self._lock():
+                # Retry a failed login, but no more often than every _LOGIN_RETRY_INTERVAL however many coroutines wait
+                if self.cookie is None and self._login_failed is not None \
+                        and time.monotonic() - self._login_failed >= _LOGIN_RETRY_INTERVAL:
+                    await self._login()
+                cookie = self.cookie
+        response = await self._transport.request(method, path, headers=headers, cookies=cookie, **kwargs)
+        if cookie is not None and response.status_code != 401:
+            self._last_used = time.monotonic()
+        elif cookie is not None:
+            async with self._lock():
+                # Only log in if no other coroutine has already replaced the expired cookie
+                if self.cookie is cookie:
+                    await self._login()
+                cookie = self.cookie
+            if cookie is not None:
+                response = await self._transport.request(method, path, headers=headers, cookies=cookie, **kwargs)
+        return response
+
+    async def _cached_get(self, method, path, **kwargs):
+        identity = self.api_key if self.api_key is not None else self.username
+        key = self._cache.make_key(identity, path, kwargs.get('params'))
+        metrics = self._transport.metrics
+        generation = self._cache.generation()
+        entry = self._cache.lookup(key)
+        if entry is not None and entry.fresh():
+            metrics.record_cache("GET " + _endpoint_template(path), True)
+            return entry.response
+        if entry is not None:
+            kwargs['headers'] = dict(kwargs.get('headers') or {}, **entry.validators())
+        response = await self._send("get", path, **kwargs)
+        if entry is not None and response.status_code == 304:
+            self._cache.revalidated(key, entry)
+            metrics.record_cache("GET " + _endpoint_template(path), True)
+            return entry.response
+        metrics.record_cache("GET " + _endpoint_template(path), False)
+        self._cache.store(key, path, response, generation)
+        return response
+
+    async def _login(self):
+        """
+        Logs in, storing the session cookie and catalogue user on success. Called with the session lock held.
+
+        :return: :class:`Response' object
+        """
+        self._login_failed = time.monotonic()  # Cleared below once logged in
+        try:
+            response = await self.test_my_connection()
+            user = response.json()
+        except (requests.RequestException, ValueError):
+            # Drop the expired cookie, so that requests wait for _LOGIN_RETRY_INTERVAL rather than log in again
+            self._user = None
+            self.cookie = None
+            raise
+        if 'id' in user.keys():
+            self._user = user
+            self.cookie = response.cookies
+            self._login_failed = None
+            self._last_used = time.monotonic()
+        else:
+            self._user = None
+            self.cookie = None
+        return response
+
+    async def _keep_session_alive(self):
+        """
+        Runs in the background while the client is open, checking a session that has been idle for half the
+        session_timeout so that the check itself keeps it alive, and logging in again if it has nevertheless expired.
+        """
+        while True:
+            await asyncio.sleep(self.session_timeout / 4)
+            if time.monotonic() - self._last_used < self.session_timeout / 2:
+                continue
+            cookie = self.cookie
+            try:
+                response = await self._transport.request("get", "/api/session/isAuthenticated", cookies=cookie)
+                valid = response.ok and bool(response.json().get('authenticatedSession'))
+            except (requests.RequestException, ValueError):
+                continue  # The instance is unreachable; requests will log in again once it is back
+            if valid:
+                self._last_used = time.monotonic()
+                continue
+            async with self._lock():
+                if self.cookie is cookie:
+                    try:
+                        await self._login()
+                    except (requests.RequestException, ValueError):
+                        pass
+
+    async def refresh_session(self):
+        """
+        Logs in again to replace an expired session cookie and refreshes the cached catalogue user.
+
+        :return: :class:`Response' object
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        await self._start()
+        async with self._lock():
+            return await self._login()
+
+    async def get_current_user(self):
+        """
+        The catalogue user the client is logged in as, as returned by /api/authentication/login. The user is fetched
+        once and cached, so repeated calls do not log in again.
+
+        :return: dict - The catalogue user, including its 'id'
+        """
+        if self.username is None:
+            raise TypeError("You must provide a username and password to access this method")
+        await self._start()
+        async with self._lock():
+            if self._user is None:
+                await self._login()
+                if self._user is None:
+                    raise ValueError("Unable to log in as " + str(self.username))
+            return self._user
+
+    async def test_my_connection(self):
         """
         Executes a post request with username and password as json payload to the baseurl appended with
         /api/authentication/login. The response is returned.
@@ -128,10 +5016,10 @@ class BaseClient:
         if self.username is None:
             raise TypeError("You must provide a username and password to access this method")
         json_payload = dict(username=self.username, password=self.__password)
-        response = requests.post(self.baseURL + "/api/authentication/login", json=json_payload)
+        response = await self._transport.request("post", "/api/authentication/login", json=json_payload)
         return response
 
-    def check_for_valid_session(self):
+    async def check_for_valid_session(self):
         """
         Executes a get request to the url + /api/session/isAuthenticated
         with the session ID in the cookies header.
@@ -141,10 +5029,11 @@ class BaseClient:
         """
         if self.username is None:
             raise TypeError("You must provide a username and password to access this method")
-        response = requests.get(self.baseURL + "/api/session/isAuthenticated", cookies=self.cookie)
+        await self._start()
+        response = await self._request("get", "/api/session/isAuthenticated", cookies=self.cookie)
         return response
 
-    def logout(self):
+    async def logout(self):
         """
         A logout get request is sent to baseurl appended with /api/authentication/logout with the session ID in the
         cookies header. The response is returned.
@@ -153,24 +5042,30 @@ class BaseClient:
         """
         if self.username is None:
             raise TypeError("You must provide a username and password to access this method")
-        response = requests.get(self.baseURL + "/api/authentication/logout", cookies=self.cookie)
-        return response
+        await self._start()
+        async with self._lock():
+            response = await self._request("get", "/api/authentication/logout", cookies=self.cookie)
+            self.cookie = None
+            self._user = None
+            return response
 
-    def admin_check(self):
+    async def admin_check(self):
         """
         Get request to determine whether user is an admin.
 
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            response = requests.get(self.baseURL + "/api/session/isApplicationAdministration",
-                                    headers={'apiKey': self.api_key})
-        else:
-            response = requests.get(self.baseURL + "/api/session/isApplicationAdministration",
-                                    cookies=self.cookie)
+        response = await self._request("get", "/api/session/isApplicationAdministration")
         return response
 
-    def list_api_keys(self, catalogue_user_id=None):
+    async def _catalogue_user_id(self, catalogue_user_id):
+        if self.username is None and catalogue_user_id is None:
+            raise TypeError("A username/password or an id argument is required for this method to work")
+        if catalogue_user_id is None:
+            catalogue_user_id = (await self.get_current_user())['id']
+        return catalogue_user_id
+
+    async def list_api_keys(self, catalogue_user_id=None):
         """
         Lists api keys.
 
@@ -180,26 +5075,11 @@ class BaseClient:
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id "
-                            "method argument is required for this method to work")
-        elif self.api_key is None and catalogue_user_id is None:
-            default_id = self.test_my_connection().json()['id']
-            response = requests.get(self.baseURL + "/api/catalogueUsers/" + default_id + "/apiKeys",
-                                    cookies=self.cookie)
-        elif self.api_key is None and catalogue_user_id is not None:
-            response = requests.get(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys",
-                                    cookies=self.cookie)
-        elif self.api_key is not None and catalogue_user_id is None:
-            default_id = self.test_my_connection().json()['id']
-            response = requests.get(self.baseURL + "/api/catalogueUsers/" + default_id + "/apiKeys",
-                                    headers={'apiKey': self.api_key})
-        elif self.api_key is not None and catalogue_user_id is not None:
-            response = requests.get(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys",
-                                    headers={'apiKey': self.api_key})
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        response = await self._request("get", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys")
         return response
 
-    def create_new_api_key(self, key_name='My First Key', expiry=365, refreshable=True, catalogue_user_id=None):
+    async def create_new_api_key(self, key_name='My First Key', expiry=365, refreshable=True, catalogue_user_id=None):
         """
         Creates a new API key depending on arguments provided,
 
@@ -212,171 +5092,66 @@ class BaseClient:
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id "
-                            "method argument is required for this method to work")
-        elif self.api_key is not None:
-            json_payload = dict(name=key_name, expiresInDays=expiry, refreshable=refreshable)
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.post(self.baseURL + "/api/catalogueUsers/" + default_id + "/apiKeys",
-                                         headers={'apiKey': self.api_key}, json=json_payload)
-            else:
-                response = requests.post(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys",
-                                         headers={'apiKey': self.api_key}, json=json_payload)
-        else:
-            if catalogue_user_id is None:
-                json_payload = dict(name=key_name, expiresInDays=expiry, refreshable=refreshable)
-                default_id = self.test_my_connection().json()['id']
-                response = requests.post(self.baseURL + "/api/catalogueUsers/" + default_id + "/apiKeys",
-                                         cookies=self.cookie, json=json_payload)
-            else:
-                json_payload = dict(name=key_name, expiresInDays=expiry, refreshable=refreshable)
-                response = requests.post(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys",
-                                         cookies=self.cookie, json=json_payload)
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        json_payload = dict(name=key_name, expiresInDays=expiry, refreshable=refreshable)
+        response = await self._request("post", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys",
+                                       json=json_payload)
         return response
 
-    def delete_api_key(self, key_to_delete, catalogue_user_id=None):
+    async def delete_api_key(self, key_to_delete, catalogue_user_id=None):
         """
         Deletes API key.
 
-        If catalogue_user_id is provided, request will return response for request using the provided catalogue
-        as opposed to current user's default value.
-
         :param key_to_delete: API key id to delete
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id "
-                            "method argument is required for this method to work")
-        elif self.api_key is not None:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.delete(
-                    self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/" + str(key_to_delete),
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.delete(
-                    self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" + str(key_to_delete),
-                    headers={'apiKey': self.api_key})
-            return response
-        else:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                print(default_id)
-                response = requests.delete(
-                    self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/" + str(key_to_delete),
-                    cookies=self.cookie)
-            else:
-                response = requests.delete(
-                    self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" + str(key_to_delete),
-                    cookies=self.cookie)
-            return response
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        response = await self._request("delete", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                       + str(key_to_delete))
+        return response
 
-    def disable_api_key(self, key_to_disable, catalogue_user_id=None):
+    async def disable_api_key(self, key_to_disable, catalogue_user_id=None):
         """
         Disables API key
 
-        If catalogue_user_id is provided, request will return response for request using the provided catalogue
-        as opposed to current user's default value.
-
         :param key_to_disable: API key to disable
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id "
-                            "method argument is required for this method to work")
-        elif self.api_key is not None:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/"
-                                        + str(key_to_disable) + "/disable", headers={'apiKey': self.api_key})
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/"
-                                        + str(key_to_disable) + "/disable", headers={'apiKey': self.api_key})
-            return response
-        else:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/"
-                                        + str(key_to_disable) + "/disable", cookies=self.cookie)
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/"
-                                        + str(key_to_disable) + "/disable", cookies=self.cookie)
-            return response
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        response = await self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                       + str(key_to_disable) + "/disable")
+        return response
 
-    def enable_api_key(self, key_to_enable, catalogue_user_id=None):
+    async def enable_api_key(self, key_to_enable, catalogue_user_id=None):
         """
-        Disables API key
-
-        If catalogue_user_id is provided, request will return response for request using the provided catalogue
-        as opposed to current user's default value.
+        Enables API key
 
         :param key_to_enable: API key to enable
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id argument is required for this method to work")
-        elif self.api_key is not None:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + default_id + "/apiKeys/"
-                                        + str(key_to_enable) + "/enable", headers={'apiKey': self.api_key})
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" +
-                                        str(key_to_enable) + "/enable", headers={'apiKey': self.api_key})
-        else:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/"
-                                        + str(key_to_enable) + "/enable", cookies=self.cookie)
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" +
-                                        str(key_to_enable) + "/enable", cookies=self.cookie)
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        response = await self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                       + str(key_to_enable) + "/enable")
         return response
 
-    def refresh_api_key(self, key_to_refresh, days_until_expiry=365, catalogue_user_id=None):
+    async def refresh_api_key(self, key_to_refresh, days_until_expiry=365, catalogue_user_id=None):
         """
         Refreshes API key
 
-        If catalogue_user_id is provided, request will return response for request using the provided catalogue
-        as opposed to current user's default value.
-
         :param key_to_refresh: API key to refresh
         :param days_until_expiry: int - Number of days until key expiry. Default value is 365
         :param catalogue_user_id: - (optional) A catalogue user id
         :return: :class:`Response' object
         """
-        if self.username is None and catalogue_user_id is None:
-            raise TypeError("A username/password or an id "
-                            "method argument is required for this method to work")
-        elif self.api_key is not None:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/"
-                                        + str(key_to_refresh) + "/refresh/" + str(days_until_expiry),
-                                        headers={'apiKey': self.api_key})
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" +
-                                        str(key_to_refresh) + "/refresh/" + str(days_until_expiry),
-                                        headers={'apiKey': self.api_key})
-            return response
-        else:
-            if catalogue_user_id is None:
-                default_id = self.test_my_connection().json()['id']
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + str(default_id) + "/apiKeys/"
-                                        + str(key_to_refresh) + "/refresh/" + str(days_until_expiry),
-                                        cookies=self.cookie)
-            else:
-                response = requests.put(self.baseURL + "/api/catalogueUsers/" + catalogue_user_id + "/apiKeys/" +
-                                        str(key_to_refresh) + "/refresh/" + str(days_until_expiry),
-                                        cookies=self.cookie)
-            return response
+        catalogue_user_id = await self._catalogue_user_id(catalogue_user_id)
+        response = await self._request("put", "/api/catalogueUsers/" + str(catalogue_user_id) + "/apiKeys/"
+                                       + str(key_to_refresh) + "/refresh/" + str(days_until_expiry))
+        return response
 
-    def list_folders(self, offset=0, max_limit=10, show_all=False):
+    async def list_folders(self, offset=0, max_limit=10, show_all=False):
         """
         Lists the folders present in a Mauro instance.
 
@@ -385,113 +5160,63 @@ class BaseClient:
         :param show_all: bool - show all folders (overrides max and offset limit). Default value = False
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if not show_all:
-                response = requests.get(self.baseURL + "/api/folders?offset=" + str(offset) + "&max=" + str(max_limit),
-                                        headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(self.baseURL + "/api/folders?all=true", headers={'apiKey': self.api_key})
-
+        if not show_all:
+            response = await self._request("get", "/api/folders?offset=" + str(offset) + "&max=" + str(max_limit))
         else:
-            if not show_all:
-                response = requests.get(self.baseURL + "/api/folders?offset=" + str(offset) + "&max=" + str(max_limit),
-                                        cookies=self.cookie)
-            else:
-                response = requests.get(self.baseURL + "/api/folders?all=true", cookies=self.cookie)
+            response = await self._request("get", "/api/folders?all=true")
         return response
 
-    def get_metadata(self, catalogue_item_domain_type, catalogue_item_id, metadata_id=None):
+    async def get_metadata(self, catalogue_item_domain_type, catalogue_item_id, metadata_id=None):
         """
         Get the metadata information on a catalogue item or metadata item within a catalogue id.
 
-        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses", "dataTypes",
-         "terminologies", "terms" or "referenceDataModels".
+        :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses", "dataElements",
+         "dataTypes", "terminologies", "terms" or "referenceDataModels".
         :param catalogue_item_id: The id of the catalogue item.
-        :param metadata_id: - (optional) A catalogue user id.
+        :param metadata_id: - (optional) A metadata id.
         :return: :class:`Response' object.
         """
-        val_domain_types = ["folders", "dataModels", "dataClasses", "dataTypes", "terminologies", "terms",
-                            "referenceDataModels"]
-        if catalogue_item_domain_type not in val_domain_types:
-            raise ValueError("catalogueItemDomainType must be in " + str(val_domain_types))
-        if self.api_key is not None:
-            if metadata_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(
-                        catalogue_item_id) + "/metadata",
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(
-                        catalogue_item_id) + "/metadata/" + str(metadata_id),
-                    headers={'apiKey': self.api_key})
-            return response
-        else:
-            if metadata_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(
-                        catalogue_item_id) + "/metadata",
-                    cookies=self.cookie)
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(
-                        catalogue_item_id) + "/metadata/" + str(metadata_id),
-                    cookies=self.cookie)
-            return response
+        _check_domain_type(catalogue_item_domain_type)
+        path = "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata"
+        if metadata_id is not None:
+            path = path + "/" + str(metadata_id)
+        response = await self._request("get", path)
+        return response
 
-    def permissions(self, catalogue_item_domain_type, catalogue_item_id):
+    async def permissions(self, catalogue_item_domain_type, catalogue_item_id):
         """
         Get the permissions of a catalogue item id
 
         :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
-        "dataTypes", "terminologies", "terms" or "referenceDataModels"
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels"
         :param catalogue_item_id: The catalogue item id
         :return: :class:`Response' object
         """
-        val_domain_types = ["folders", "dataModels", "dataClasses", "dataTypes", "terminologies", "terms",
-                            "referenceDataModels"]
-        if catalogue_item_domain_type not in val_domain_types:
-            raise ValueError("catalogueItemDomainType must be in " + str(val_domain_types))
-        if self.api_key is not None:
-            response = requests.get(self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" +
-                                    str(catalogue_item_id) + "/permissions",
-                                    headers={'apiKey': self.api_key})
-            return response
-        else:
-            response = requests.get(
-                self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) +
-                "/permissions", cookies=self.cookie)
-            return response
+        _check_domain_type(catalogue_item_domain_type)
+        response = await self._request(
+            "get", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/permissions")
+        return response
 
-    def post_metadata(self, catalogue_item_domain_type, catalogue_item_id, namespace_inp, key_val, value_inp):
+    async def post_metadata(self, catalogue_item_domain_type, catalogue_item_id, namespace_inp, key_val, value_inp):
         """
         Post metadata
 
         :param catalogue_item_domain_type: Must be one of "folders", "dataModels", "dataClasses",
-        "dataTypes", "terminologies", "terms" or "referenceDataModels".
+        "dataElements", "dataTypes", "terminologies", "terms" or "referenceDataModels".
         :param catalogue_item_id: The catalogue item id.
         :param namespace_inp: The namespace
         :param key_val: The key
         :param value_inp: The value
         :return: :class:`Response' object
         """
-        val_domain_types = ["folders", "dataModels", "dataClasses", "dataTypes", "terminologies", "terms",
-                            "referenceDataModels"]
-        if catalogue_item_domain_type not in val_domain_types:
-            raise ValueError("catalogueItemDomainType must be in " + str(val_domain_types))
+        _check_domain_type(catalogue_item_domain_type)
         json_payload = dict(id=catalogue_item_id, namespace=namespace_inp, key=key_val, value=value_inp)
-        if self.api_key is not None:
-            response = requests.post(
-                self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata",
-                headers={'apiKey': self.api_key}, json=json_payload)
-            return response
-        else:
-            response = requests.post(
-                self.baseURL + "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata",
-                cookies=self.cookie, json=json_payload)
-            return response
+        response = await self._request(
+            "post", "/api/" + str(catalogue_item_domain_type) + "/" + str(catalogue_item_id) + "/metadata",
+            json=json_payload)
+        return response
 
-    def get_classifiers(self, classifier_id=None, id_input=None):
+    async def get_classifiers(self, classifier_id=None, id_input=None):
         """
         Get classifiers - paginated list or specific id
 
@@ -499,43 +5224,18 @@ class BaseClient:
         :param id_input: Child classifier id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if classifier_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers",
-                    headers={'apiKey': self.api_key})
-            elif classifier_id and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(classifier_id) + "/classifiers",
-                    headers={'apiKey': self.api_key})
-            elif id_input and classifier_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-            elif id_input and id_input:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(classifier_id) + "/classifiers/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-        else:
-            if classifier_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers",
-                    cookies=self.cookie)
-            elif classifier_id and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(classifier_id) + "/classifiers",
-                    cookies=self.cookie)
-            elif id_input and classifier_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(id_input),
-                    cookies=self.cookie)
-            elif id_input and id_input:
-                response = requests.get(
-                    self.baseURL + "/api/classifiers/" + str(classifier_id) + "/classifiers/" + str(id_input),
-                    cookies=self.cookie)
+        if classifier_id is None and id_input is None:
+            response = await self._request("get", "/api/classifiers")
+        elif classifier_id and id_input is None:
+            response = await self._request("get", "/api/classifiers/" + str(classifier_id) + "/classifiers")
+        elif id_input and classifier_id is None:
+            response = await self._request("get", "/api/classifiers/" + str(id_input))
+        else:
+            response = await self._request(
+                "get", "/api/classifiers/" + str(classifier_id) + "/classifiers/" + str(id_input))
         return response
 
-    def get_data_classes(self, data_model_id, data_class_id=None, id_input=None):
+    async def get_data_classes(self, data_model_id, data_class_id=None, id_input=None):
         """
         Get data classes - paginated list or specific id
 
@@ -544,47 +5244,22 @@ class BaseClient:
         :param id_input: Specific data class id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if data_class_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses",
-                    headers={'apiKey': self.api_key})
-            elif data_class_id and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataClasses",
-                    headers={'apiKey': self.api_key})
-            elif id_input and data_class_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-            elif id_input and id_input:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id) +
-                    "/dataClasses/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-        else:
-            if data_class_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses",
-                    cookies=self.cookie)
-            elif data_class_id and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataClasses",
-                    cookies=self.cookie)
-            elif id_input and data_class_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + str(id_input),
-                    cookies=self.cookie)
-            elif id_input and id_input:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id) +
-                    "/dataClasses/" + str(id_input),
-                    cookies=self.cookie)
+        if data_class_id is None and id_input is None:
+            response = await self._request("get", "/api/dataModels/" + str(data_model_id) + "/dataClasses")
+        elif data_class_id and id_input is None:
+            response = await self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses")
+        elif id_input and data_class_id is None:
+            response = await self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(id_input))
+        else:
+            response = await self._request(
+                "get", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses/" + str(id_input))
         return response
 
-    def get_codesets(self, folder_id=None, codeset_id=None):
+    async def get_codesets(self, folder_id=None, codeset_id=None):
         """
         Get codesets - paginated list or specific id
 
@@ -592,35 +5267,15 @@ class BaseClient:
         :param codeset_id: Specific codeset id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if folder_id is None and codeset_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/codeSets/",
-                    headers={'apiKey': self.api_key})
-            elif codeset_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/codeSets/",
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/codeSets/" + str(codeset_id),
-                    headers={'apiKey': self.api_key})
-        else:
-            if folder_id is None and codeset_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/codeSets/",
-                    cookies=self.cookie)
-            elif codeset_id is None:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/codeSets/",
-                    cookies=self.cookie)
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/codeSets/" + str(codeset_id),
-                    cookies=self.cookie)
+        if folder_id is None and codeset_id is None:
+            response = await self._request("get", "/api/codeSets/")
+        elif codeset_id is None:
+            response = await self._request("get", "/api/folders/" + str(folder_id) + "/codeSets/")
+        else:
+            response = await self._request("get", "/api/codeSets/" + str(codeset_id))
         return response
 
-    def get_data_element(self, data_model_id, data_class_id, id_input=None):
+    async def get_data_element(self, data_model_id, data_class_id, id_input=None):
         """
         Get data element - paginated list or specific id
 
@@ -629,31 +5284,13 @@ class BaseClient:
         :param id_input: Specific data element id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataElements",
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataElements/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-        else:
-            if id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataElements",
-                    cookies=self.cookie)
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
-                    + "/dataElements/" + str(id_input),
-                    cookies=self.cookie)
+        path = "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id) + "/dataElements"
+        if id_input is not None:
+            path = path + "/" + str(id_input)
+        response = await self._request("get", path)
         return response
 
-    def get_data_model(self, folder_id=None, id_input=None):
+    async def get_data_model(self, folder_id=None, id_input=None):
         """
         Get data model - paginated list or specific id
 
@@ -661,36 +5298,15 @@ class BaseClient:
         :param id_input: Specific data model id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if folder_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels",
-                    headers={'apiKey': self.api_key})
-            elif folder_id is None and id_input is not None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(id_input),
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/dataModels",
-                    headers={'apiKey': self.api_key})
-        else:
-            if folder_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels",
-                    cookies=self.cookie)
-                return response
-            elif folder_id is None and id_input is not None:
-                response = requests.get(
-                    self.baseURL + "/api/dataModels/" + str(id_input),
-                    cookies=self.cookie)
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/dataModels",
-                    cookies=self.cookie)
+        if folder_id is None and id_input is None:
+            response = await self._request("get", "/api/dataModels")
+        elif folder_id is None and id_input is not None:
+            response = await self._request("get", "/api/dataModels/" + str(id_input))
+        else:
+            response = await self._request("get", "/api/folders/" + str(folder_id) + "/dataModels")
         return response
 
-    def get_versioned_folders(self, folder_id=None, id_input=None):
+    async def get_versioned_folders(self, folder_id=None, id_input=None):
         """
         List versioned folders - paginated list or specific id
 
@@ -698,53 +5314,25 @@ class BaseClient:
         :param id_input: Specific versioned folder id
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if folder_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/versionedFolders",
-                    headers={'apiKey': self.api_key})
-            elif folder_id is None and id_input is not None:
-                response = requests.get(
-                    self.baseURL + "/api/versionedFolders" + str(id_input),
-                    headers={'apiKey': self.api_key})
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/versionedFolders",
-                    headers={'apiKey': self.api_key})
-        else:
-            if folder_id is None and id_input is None:
-                response = requests.get(
-                    self.baseURL + "/api/versionedFolders",
-                    cookies=self.cookie)
-                return response
-            elif folder_id is None and id_input is not None:
-                response = requests.get(
-                    self.baseURL + "/api/versionedFolders" + str(id_input),
-                    cookies=self.cookie)
-            else:
-                response = requests.get(
-                    self.baseURL + "/api/folders/" + str(folder_id) + "/versionedFolders",
-                    cookies=self.cookie)
+        if folder_id is None and id_input is None:
+            response = await self._request("get", "/api/versionedFolders")
+        elif folder_id is None and id_input is not None:
+            response = await self._request("get", "/api/versionedFolders/" + str(id_input))
+        else:
+            response = await self._request("get", "/api/folders/" + str(folder_id) + "/versionedFolders")
         return response
 
-    def build_versioned_folder(self, json_payload):
+    async def build_versioned_folder(self, json_payload):
         """
         Builds a versioned folder
 
         :param json_payload: json data to send in the body of the :class: 'Request'
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            response = requests.post(
-                self.baseURL + "/api/versionedFolders",
-                headers={'apiKey': self.api_key}, json=json_payload)
-        else:
-            response = requests.post(
-                self.baseURL + "/api/versionedFolders",
-                cookies=self.cookie, json=json_payload)
+        response = await self._request("post", "/api/versionedFolders", json=json_payload)
         return response
 
-    def create_data_model(self, folder_id, json_payload):
+    async def create_data_model(self, folder_id, json_payload):
         """
         Creates a data model in the specified folder
 
@@ -752,17 +5340,10 @@ class BaseClient:
         :param json_payload: json data to send in the body of the :class: 'Request'
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            response = requests.post(
-                self.baseURL + "/api/folders/" + str(folder_id) + "/dataModels",
-                headers={'apiKey': self.api_key}, json=json_payload)
-        else:
-            response = requests.post(
-                self.baseURL + "/api/folders/" + str(folder_id) + "/dataModels",
-                cookies=self.cookie, json=json_payload)
+        response = await self._request("post", "/api/folders/" + str(folder_id) + "/dataModels", json=json_payload)
         return response
 
-    def build_folder(self, json_payload, folder_id=None):
+    async def build_folder(self, json_payload, folder_id=None):
         """
         Build a new folder.
 
@@ -771,27 +5352,12 @@ class BaseClient:
         :return: :class:`Response' object
         """
         if folder_id is None:
-            if self.api_key is not None:
-                response = requests.post(
-                    self.baseURL + "/api/folders",
-                    headers={'apiKey': self.api_key}, json=json_payload)
-            else:
-                response = requests.post(
-                    self.baseURL + "/api/folders",
-                    cookies=self.cookie, json=json_payload)
-        else:
-            if self.api_key is not None:
-                response = requests.post(
-                    self.baseURL + "/api/folders/" + folder_id + "/folders",
-                    headers={'apiKey': self.api_key}, json=json_payload)
-            else:
-                response = requests.post(
-                    self.baseURL + "/api/folders/" + folder_id + "/folders",
-                    cookies=self.cookie, json=json_payload)
-
+            response = await self._request("post", "/api/folders", json=json_payload)
+        else:
+            response = await self._request("post", "/api/folders/" + str(folder_id) + "/folders", json=json_payload)
         return response
 
-    def create_new_data_class(self, json_payload, data_model_id, data_class_id=None):
+    async def create_new_data_class(self, json_payload, data_model_id, data_class_id=None):
         """
         Create a new data class
 
@@ -800,29 +5366,16 @@ class BaseClient:
         :param data_class_id: - (optional) The data class id to which the new class will belong
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if data_class_id is None:
-                response = requests.post(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses",
-                    headers={'apiKey': self.api_key}, json=json_payload)
-            else:
-                response = requests.post(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/"
-                    + data_class_id + "/dataClasses",
-                    headers={'apiKey': self.api_key}, json=json_payload)
+        if data_class_id is None:
+            response = await self._request("post", "/api/dataModels/" + str(data_model_id) + "/dataClasses",
+                                           json=json_payload)
         else:
-            if data_class_id is None:
-                response = requests.post(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses",
-                    cookies=self.cookie, json=json_payload)
-            else:
-                response = requests.post(
-                    self.baseURL + "/api/dataModels/" + data_model_id +
-                    "/dataClasses/" + data_class_id + "/dataClasses",
-                    cookies=self.cookie, json=json_payload)
+            response = await self._request(
+                "post", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id)
+                + "/dataClasses", json=json_payload)
         return response
 
-    def update_data_class(self, json_payload, data_model_id, data_class_id=None):
+    async def update_data_class(self, json_payload, data_model_id, data_class_id=None):
         """
         Updates a data class
 
@@ -831,27 +5384,15 @@ class BaseClient:
         :param data_class_id: The data class to update
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            if data_class_id is None:
-                response = requests.put(
-                    self.baseURL + "/api/dataModels/" + data_model_id,
-                    headers={'apiKey': self.api_key}, json=json_payload)
-            else:
-                response = requests.put(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + data_class_id,
-                    headers={'apiKey': self.api_key}, json=json_payload)
+        if data_class_id is None:
+            response = await self._request("put", "/api/dataModels/" + str(data_model_id), json=json_payload)
         else:
-            if data_class_id is None:
-                response = requests.put(
-                    self.baseURL + "/api/dataModels/" + data_model_id,
-                    cookies=self.cookie, json=json_payload)
-            else:
-                response = requests.put(
-                    self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + data_class_id,
-                    cookies=self.cookie, json=json_payload)
+            response = await self._request(
+                "put", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id),
+                json=json_payload)
         return response
 
-    def create_data_element(self, json_payload, data_model_id, data_class_id):
+    async def create_data_element(self, json_payload, data_model_id, data_class_id):
         """
         Creates a data element
 
@@ -860,17 +5401,12 @@ class BaseClient:
         :param data_class_id: The data class id to which the element should belong
         :return: :class:`Response' object
         """
-        if self.api_key is not None:
-            response = requests.post(
-                self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + data_class_id + "/dataElements",
-                headers={'apiKey': self.api_key}, json=json_payload)
-        else:
-            response = requests.post(
-                self.baseURL + "/api/dataModels/" + data_model_id + "/dataClasses/" + data_class_id + "/dataElements",
-                cookies=self.cookie, json=json_payload)
+        response = await self._request(
+            "post", "/api/dataModels/" + str(data_model_id) + "/dataClasses/" + str(data_class_id) + "/dataElements",
+            json=json_payload)
         return response
 
-    def method_constructor(self, command, json_payload=None, *args):
+    async def method_constructor(self, command, json_payload=None, *args):
         """
         A generalised way of creating any endpoint. Any additional arguments provided via args will be appended
         to baseurl allowing custom endpoints to be rapidly built.
@@ -885,30 +5421,216 @@ class BaseClient:
         append_string = ""
         for vals in args:
             append_string = append_string + vals
-        if self.api_key is not None:
-            if command == "put":
-                response = requests.put(self.baseURL + append_string,
-                                        headers={'apiKey': self.api_key}, json=json_payload)
-            elif command == "post":
-                response = requests.post(self.baseURL + append_string,
-                                         headers={'apiKey': self.api_key}, json=json_payload)
-            elif command == "get":
-                response = requests.get(self.baseURL + append_string,
-                                        headers={'apiKey': self.api_key}, json=json_payload)
-            elif command == "delete":
-                response = requests.delete(self.baseURL + append_string,
-                                           headers={'apiKey': self.api_key}, json=json_payload)
-        else:
-            if command == "put":
-                response = requests.put(self.baseURL + append_string,
-                                        cookies=self.cookie, json=json_payload)
-            elif command == "post":
-                response = requests.post(self.baseURL + append_string,
-                                         cookies=self.cookie, json=json_payload)
-            elif command == "get":
-                response = requests.get(self.baseURL + append_string,
-                                        cookies=self.cookie, json=json_payload)
-            elif command == "delete":
-                response = requests.delete(self.baseURL + append_string,
-                                           cookies=self.cookie, json=json_payload)
+        response = await self._request(command, append_string, json=json_payload)
         return response
+
+
+_RESTART_DELAY = 0.5  # Seconds before crawl_sharded restarts a worker, doubled each time in a row it fails to start
+
+
+def _shard_worker(baseurl, credentials, parts, tasks, events, worker_number, threads, page_size):
+    """
+    Runs in each process of :func:`crawl_sharded`: crawls the data models sent on tasks with a client of its own,
+    writing each to its own part file, until sent None.
+    """
+    client = BaseClient(baseurl, **credentials)
+    try:
+        events.put(("ready", worker_number, None, None))
+        while True:
+            data_model_id = tasks.get()
+            if data_model_id is None:
+                return
+            path = os.path.join(parts, str(data_model_id) + ".ndjson")
+            written = [0]
+            try:
+                with open(path + ".tmp", "w", encoding="utf-8") as part:
+
+                    def write(item, parent):
+                        if parent is not None:  # The data model itself was written when the folders were listed
+                            part.write(json.dumps(dict(parent=parent['id'], item=item), separators=(',', ':')) +
+                                       "\n")
+                            written[0] += 1
+
+                    client.crawl_data_model(data_model_id, max_workers=threads, callback=write, page_size=page_size)
+                os.replace(path + ".tmp", path)
+            except (requests.RequestException, ValueError, OSError) as error:
+                events.put(("failed", worker_number, data_model_id, repr(error)))
+            else:
+                events.put(("done", worker_number, data_model_id, written[0]))
+    finally:
+        client.close()
+
+
+def crawl_sharded(baseurl, output, username=None, password=None, api_key=None, folder_id=None, processes=None,
+                  threads=8, page_size=100, max_attempts=3):
+    """
+    Crawls every folder, data model, data class and data element below a folder, or in the whole catalogue, with a
+    pool of worker processes, for catalogues too large for one process to parse quickly.
+
+    The folders are listed first and each data model becomes a task. Whenever a worker is free it is sent the next
+    data model, which it crawls with its own :class:`BaseClient`, connection pool and session, using threads
+    concurrent requests, so that throughput grows with the number of processes. Each data model is written to its
+    own part file in the directory output + '.parts', which doubles as the checkpoint: a crawl that is interrupted
+    can be run again with the same arguments and only crawls the data models that have no part file yet. A worker
+    that dies is restarted after a short wait and its data model crawled again, up to max_attempts times. A worker
+    that dies max_attempts times in a row before it is ready, e.g. because it cannot log in, is not restarted, and
+    once no worker is left the remaining data models are reported as failed.
+
+    Once every data model is done the parts are merged into output, one json object per line with the item under
+    'item' and its parent's id under 'parent', folders and data models first and then each data model's contents,
+    parents before their children. The parts directory is then removed. The output can be loaded with
+    :meth:`CatalogueIndex.from_ndjson`.
+
+    :param baseurl: The base URL of the Mauro instance
+    :param output: str - The file to write
+    :param username: - (optional) Login username
+    :param password: - (optional) Login password
+    :param api_key: - (optional) The API key to authenticate
+    :param folder_id: - (optional) The folder to crawl. Default value = None (every top-level folder)
+    :param processes: int - Number of worker processes. Default value = the number of CPUs
+    :param threads: int - Concurrent requests made by each worker. Default value = 8
+    :param page_size: int - Number of items requested per page. Default value = 100
+    :param max_attempts: int - Times a data model is attempted before it is reported as failed. Default value = 3
+    :return: list of :class:`Result` - One per data model, keyed by its id, holding the number of items below it
+        as value, or the error of its last attempt. Data models crawled by an earlier, interrupted run hold None.
+    """
+    credentials = dict(username=username, password=password, api_key=api_key)
+    processes = processes or os.cpu_count() or 1
+    parts = output + ".parts"
+    os.makedirs(parts, exist_ok=True)
+
+    # List the folders and data models, which is quick, in this process
+    client = BaseClient(baseurl, **credentials)
+    lock = threading.Lock()
+    data_models = []
+    try:
+        with open(os.path.join(parts, "folders.ndjson.tmp"), "w", encoding="utf-8") as folders:
+
+            def visit(task):
+                kind, parent_id = task
+                items = list(client._iter_children(kind, parent_id, None, page_size))
+                with lock:
+                    for item in items:
+                        folders.write(json.dumps(dict(parent=parent_id, item=item), separators=(',', ':')) + "\n")
+                        if kind == "dataModels":
+                            data_models.append(item['id'])
+                return [(child_kind, item['id']) for item in items if kind == "folders"
+                        for child_kind in ("folders", "dataModels")]
+
+            if folder_id is None:
+                roots = [("folders", None)]
+            else:
+                response = client._request("get", "/api/folders/" + str(folder_id))
+                response.raise_for_status()
+                folders.write(json.dumps(dict(parent=None, item=response.json()), separators=(',', ':')) + "\n")
+                roots = [("folders", folder_id), ("dataModels", folder_id)]
+            _run_tree(roots, visit, threads)
+        os.replace(os.path.join(parts, "folders.ndjson.tmp"), os.path.join(parts, "folders.ndjson"))
+    finally:
+        client.close()
+
+    results = OrderedDict((data_model_id, Result(data_model_id)) for data_model_id in data_models)
+    todo = [data_model_id for data_model_id in data_models
+            if not os.path.exists(os.path.join(parts, str(data_model_id) + ".ndjson"))]
+    attempts = dict()
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    workers = dict()
+    current = dict()
+    ready = set()
+    failed_starts = dict()  # worker number -> times in a row its process died before it was ready
+    restarts = dict()  # worker number -> when to restart its process
+
+    def start(worker_number):
+        if worker_number in workers:
+            workers[worker_number][1].close()
+        tasks = context.Queue()
+        process = context.Process(target=_shard_worker, name="pymauro-crawl-" + str(worker_number),
+                                  args=(baseurl, credentials, parts, tasks, events, worker_number, threads,
+                                        page_size), daemon=True)
+        process.start()
+        workers[worker_number] = (process, tasks)
+
+    def retry(data_model_id, error):
+        attempts[data_model_id] = attempts.get(data_model_id, 0) + 1
+        if attempts[data_model_id] < max_attempts:
+            todo.insert(0, data_model_id)
+        else:
+            results[data_model_id] = Result(data_model_id, error=error)
+
+    def assign(worker_number):
+        if todo:
+            current[worker_number] = todo.pop(0)
+            workers[worker_number][1].put(current[worker_number])
+
+    try:
+        for worker_number in range(min(processes, len(todo))):
+            start(worker_number)
+        while todo or current:
+            # Note which workers have died before reading the events, so that every event they sent is read first
+            dead = [worker_number for worker_number, (process, _) in workers.items()
+                    if not process.is_alive() and worker_number not in restarts
+                    and failed_starts.get(worker_number, 0) < max_attempts]
+            received = []
+            try:
+                received.append(events.get(timeout=0.01 if dead else 0.5))
+                while True:
+                    received.append(events.get_nowait())
+            except queue.Empty:
+                pass
+            for event, worker_number, data_model_id, value in received:
+                if event == "ready":
+                    ready.add(worker_number)
+                    failed_starts[worker_number] = 0
+                elif event == "done":
+                    results[data_model_id] = Result(data_model_id, value=value)
+                elif event == "failed":
+                    retry(data_model_id, RuntimeError(value))
+                current.pop(worker_number, None)
+                if worker_number not in dead:
+                    assign(worker_number)
+            for worker_number in dead:
+                if not (todo or worker_number in current):
+                    continue
+                error = RuntimeError("The worker process " + str(worker_number) + " exited with code "
+                                     + str(workers[worker_number][0].exitcode))
+                data_model_id = current.pop(worker_number, None)
+                if data_model_id is not None:
+                    retry(data_model_id, error)
+                if worker_number not in ready:
+                    failed_starts[worker_number] = failed_starts.get(worker_number, 0) + 1
+                ready.discard(worker_number)
+                if failed_starts.get(worker_number, 0) < max_attempts:
+                    restarts[worker_number] = time.monotonic() + min(
+                        _RESTART_DELAY * 2 ** failed_starts.get(worker_number, 0), 30.0)
+                elif all(failed_starts.get(number, 0) >= max_attempts for number in workers):
+                    for data_model_id in todo:
+                        results[data_model_id] = Result(data_model_id, error=error)
+                    del todo[:]
+            for worker_number, when in list(restarts.items()):
+                if when <= time.monotonic():
+                    del restarts[worker_number]
+                    start(worker_number)
+    finally:
+        for process, tasks in workers.values():
+            if process.is_alive():
+                tasks.put(None)
+        for process, tasks in workers.values():
+            process.join(5)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+            tasks.close()
+            tasks.join_thread()
+        events.close()
+        events.join_thread()
+
+    if any(not result.ok for result in results.values()):
+        return list(results.values())  # Keep the parts as a checkpoint for another run
+    with open(output + ".tmp", "wb") as merged:
+        for name in ["folders"] + [str(data_model_id) for data_model_id in data_models]:
+            with open(os.path.join(parts, name + ".ndjson"), "rb") as part:
+                shutil.copyfileobj(part, merged)
+    os.replace(output + ".tmp", output)
+    shutil.rmtree(parts)
+    return list(results.values())
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+from mock_server import Catalogue, MockMauroServer  # noqa: E402
+
+
+@pytest.fixture
+def catalogue():
+    return Catalogue(folders=2, data_models=2, classes=2, child_classes=1, elements=2, metadata=1, classifiers=2)
+
+
+@pytest.fixture
+def server(catalogue):
+    with MockMauroServer(catalogue) as server:
+        yield server
@@ -0,0 +1,130 @@
+import asyncio
+
+import pymauro
+from mock_server import MockMauroServer
+
+
+def _data_model_ids(catalogue):
+    return [item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel"]
+
+
+def test_coroutines_share_one_login(server, catalogue):
+    model_ids = _data_model_ids(catalogue)
+
+    async def run():
+        async with await pymauro.AsyncBaseClient.create(server.url, username="user", password="password",
+                                                        max_concurrency=4) as client:
+            responses = await asyncio.gather(*(client.get_data_model(id_input=model_id) for model_id in model_ids))
+            return [response.json()['id'] for response in responses]
+
+    assert asyncio.run(run()) == model_ids
+    assert catalogue.logins == 1
+
+
+def test_expired_session_logs_in_once_across_coroutines(server, catalogue):
+    model_ids = _data_model_ids(catalogue) * 4
+
+    async def run():
+        async with pymauro.AsyncBaseClient(server.url, username="user", password="password",
+                                           coalesce=False) as client:
+            catalogue.sessions.clear()
+            responses = await asyncio.gather(*(client.get_data_model(id_input=model_id) for model_id in model_ids))
+            return [response.status_code for response in responses]
+
+    assert asyncio.run(run()) == [200] * len(model_ids)
+    assert catalogue.logins == 2
+
+
+def test_idle_session_is_renewed_in_the_background(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+
+    async def run():
+        client = await pymauro.AsyncBaseClient.create(server.url, username="user", password="password",
+                                                      session_timeout=0.8)
+        cookie = client.cookie
+        catalogue.sessions.clear()
+        for _ in range(1000):
+            if client.cookie is not cookie:
+                break
+            await asyncio.sleep(0.01)
+        assert catalogue.logins == 2
+        requests = catalogue.requests
+        assert (await client.get_data_model(id_input=model_id)).status_code == 200
+        assert catalogue.requests == requests + 1
+        task = client._keep_alive
+        await client.close()
+        return task.done()
+
+    assert asyncio.run(run())
+
+
+def test_requests_in_flight_are_bounded_and_connections_reused(catalogue):
+    model_ids = _data_model_ids(catalogue) * 3
+    metrics = pymauro.MetricsRecorder()
+
+    async def run(url):
+        transport = pymauro.AsyncTransport(url, pool_size=2, metrics=metrics)
+        async with pymauro.AsyncBaseClient(url, api_key="key", transport=transport, coalesce=False) as client:
+            responses = await asyncio.gather(*(client.get_data_model(id_input=model_id) for model_id in model_ids))
+        assert transport._idle  # A provided transport is left open
+        await transport.close()
+        return [response.status_code for response in responses]
+
+    # The mock server answers 429 to any request beyond two in flight
+    with MockMauroServer(catalogue, latency=0.02, max_in_flight=2) as server:
+        assert asyncio.run(run(server.url)) == [200] * len(model_ids)
+    totals = metrics.snapshot()['totals']
+    assert totals['requests'] == len(model_ids)
+    assert totals['reused_connections'] == len(model_ids) - 2
+
+
+def test_identical_gets_are_coalesced_and_cached_until_a_write(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+
+    async def run(url):
+        async with pymauro.AsyncBaseClient(url, api_key="key", cache=pymauro.ResponseCache()) as client:
+            labels = [response.json()['label'] for response in
+                      await asyncio.gather(*(client.get_data_model(id_input=model_id) for _ in range(8)))]
+            requests = catalogue.requests
+            await client.get_data_model(id_input=model_id)
+            assert catalogue.requests == requests
+            await client.update_data_class(dict(label="Renamed"), model_id)
+            labels.append((await client.get_data_model(id_input=model_id)).json()['label'])
+            assert client.transport._idle
+        assert client.transport._idle == []  # The transport the client created is closed with it
+        return labels
+
+    with MockMauroServer(catalogue, latency=0.1) as server:
+        labels = asyncio.run(run(server.url))
+    assert labels == ["Data Model 0"] * 8 + ["Renamed"]
+    assert catalogue.requests == 3
+
+
+def test_transport_reads_chunked_responses_over_one_connection():
+    connections = []
+
+    async def handle(reader, writer):
+        connections.append(writer)
+        while True:
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+            except asyncio.IncompleteReadError:
+                return  # The client closed the connection
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json; charset=utf-8\r\n"
+                         b"Set-Cookie: JSESSIONID=abc; Path=/\r\nTransfer-Encoding: chunked\r\n\r\n"
+                         b"4\r\n{\"id\r\n8;ext=1\r\n\": \"\xc3\xa9\"}\r\n0\r\n\r\n")
+            await writer.drain()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        url = "http://127.0.0.1:" + str(server.sockets[0].getsockname()[1])
+        async with pymauro.AsyncTransport(url) as transport:
+            responses = [await transport.request("get", "/api/folders", params=dict(all="true")) for _ in range(3)]
+        server.close()
+        return responses
+
+    responses = asyncio.run(run())
+    assert [response.json() for response in responses] == [dict(id="é")] * 3
+    assert responses[0].cookies.get("JSESSIONID") == "abc"
+    assert responses[0].url.endswith("/api/folders?all=true")
+    assert len(connections) == 1
@@ -0,0 +1,34 @@
+import pymauro
+
+
+def _permission_requests(metrics):
+    return sum(stats['requests'] for endpoint, stats in metrics.snapshot()['endpoints'].items()
+               if endpoint.endswith("/permissions"))
+
+
+def test_rerun_from_a_saved_audit_checks_only_changed_items(server, catalogue, tmp_path):
+    metrics = pymauro.MetricsRecorder()
+    client = pymauro.BaseClient(server.url, api_key="key", transport=pymauro.Transport(server.url, metrics=metrics))
+    audited = [item['id'] for item in catalogue.items.values() if item['domainType'] in ("Folder", "DataModel")]
+    audit = client.audit_permissions(max_workers=4)
+    assert audit.checked == len(audited) == _permission_requests(metrics)
+    assert sorted(item['id'] for item in audit.items()) == sorted(audited)
+
+    audit.save(str(tmp_path / "audit.json"))
+    loaded = pymauro.PermissionsAudit.load(str(tmp_path / "audit.json"))
+    assert loaded.audited == audit.audited and loaded.checked == audit.checked
+    assert loaded.items() == audit.items() and loaded.matrix() == audit.matrix()
+
+    metrics.reset()
+    rerun = client.audit_permissions(previous=loaded, max_workers=4)
+    assert rerun.checked == 0 and _permission_requests(metrics) == 0
+    assert rerun.matrix() == audit.matrix() and not rerun.errors
+
+    changed = next(item for item in catalogue.items.values() if item['domainType'] == "DataModel")
+    changed['lastUpdated'] = "2099-01-01T00:00:00.000Z"
+    metrics.reset()
+    third = client.audit_permissions(previous=rerun, max_workers=4)
+    client.close()
+    assert third.checked == 1 and _permission_requests(metrics) == 1
+    assert third.permissions(changed['id']) == audit.permissions(changed['id'])
+    assert len(third) == len(audited)
@@ -0,0 +1,96 @@
+import pymauro
+
+
+class _Counter(pymauro.Metrics):
+
+    def __init__(self):
+        self.requests = []
+
+    def record_request(self, endpoint, status, elapsed, request_bytes, response_bytes, retries, reused, error=None):
+        self.requests.append((endpoint, status))
+
+    def methods(self):
+        return [endpoint.split(" ")[0] for endpoint, _ in self.requests]
+
+
+def _client(server):
+    metrics = _Counter()
+    return pymauro.BaseClient(server.url, api_key="key", transport=pymauro.Transport(server.url, metrics=metrics)), \
+        metrics
+
+
+def _data_model_id(catalogue):
+    return next(item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel")
+
+
+IMPORT = [dict(label="Imported", dataClasses=[dict(label="Imported child", dataElements=[dict(label="Leaf")])],
+               dataElements=[dict(label="Field " + str(number)) for number in range(3)]),
+          dict(label="Imported sibling")]
+
+
+def test_rerunning_an_import_creates_nothing_new(server, catalogue):
+    client, metrics = _client(server)
+    model_id = _data_model_id(catalogue)
+    first = client.import_data_classes(model_id, IMPORT, max_workers=4)
+    assert all(result.ok for result in first)
+    assert metrics.methods().count("POST") == 7
+    items = len(catalogue.items)
+    del metrics.requests[:]
+    second = client.import_data_classes(model_id, IMPORT, max_workers=4)
+    client.close()
+    assert "POST" not in metrics.methods()
+    assert len(catalogue.items) == items
+    ids = dict((result.key, result.value) for result in first)
+    assert dict((result.key, result.value) for result in second) == ids
+    assert catalogue.items[ids[("dataElements", ("Imported", "Imported child", "Leaf"))]]['dataClass'] == \
+        ids[("dataClasses", ("Imported", "Imported child"))]
+
+
+def test_failed_data_class_fails_its_descendants(server, catalogue):
+    client, metrics = _client(server)
+    # The mock server refuses to create an item without a label
+    broken = [dict(dataClasses=[dict(label="Orphan", dataElements=[dict(label="Leaf")])],
+                   dataElements=[dict(label="Field")]),
+              dict(label="Fine")]
+    results = dict((result.key, result) for result in client.import_data_classes(_data_model_id(catalogue), broken))
+    client.close()
+    assert set(results) == {("dataClasses", (None,)), ("dataClasses", (None, "Orphan")),
+                            ("dataElements", (None, "Orphan", "Leaf")), ("dataElements", (None, "Field")),
+                            ("dataClasses", ("Fine",))}
+    assert results[("dataClasses", (None,))].response.status_code == 404
+    for key in [("dataClasses", (None, "Orphan")), ("dataElements", (None, "Orphan", "Leaf")),
+                ("dataElements", (None, "Field"))]:
+        assert not results[key].ok and isinstance(results[key].error, ValueError)
+    assert results[("dataClasses", ("Fine",))].ok
+    assert metrics.methods().count("POST") == 2
+
+
+def test_post_metadata_many_writes_only_what_changed(server, catalogue):
+    client, metrics = _client(server)
+    first_id, second_id = [item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel"][:2]
+    records = [("dataModels", first_id, "benchmark", "key 0", "value"),
+               ("dataModels", first_id, "imported", "a", "1"),
+               ("dataModels", second_id, "benchmark", "key 0", "value"),
+               ("dataModels", first_id, "benchmark", "key 0", "changed"),
+               ("dataModels", second_id, "imported", "b", "first"),
+               ("dataModels", second_id, "imported", "b", "second")]
+    results = client.post_metadata_many(records, max_workers=4)
+    assert sorted(metrics.methods()) == ["GET", "GET", "POST", "POST", "PUT"]
+    assert [result.key for result in results] == records
+    assert results[0].value is None and results[0].response is None
+    assert results[4].value is None and results[4].response is None
+    assert results[2].response is None and results[2].value == catalogue.metadata[second_id][0]['id']
+    assert results[3].response.request.method == "PUT"
+    assert [results[number].response.status_code for number in (1, 5)] == [201, 201]
+    stored = dict((item_id, dict(((entry['namespace'], entry['key']), entry['value'])
+                                 for entry in catalogue.metadata[item_id])) for item_id in (first_id, second_id))
+    assert stored == {first_id: {("benchmark", "key 0"): "changed", ("imported", "a"): "1"},
+                      second_id: {("benchmark", "key 0"): "value", ("imported", "b"): "second"}}
+
+    del metrics.requests[:]
+    rerun = client.post_metadata_many(records, max_workers=4)
+    client.close()
+    assert metrics.methods() == ["GET", "GET"]
+    assert [result.value for result in rerun] == [result.value for result in results]
+    assert all(result.ok and result.response is None for result in rerun)
+    assert sum(len(catalogue.metadata[item_id]) for item_id in (first_id, second_id)) == 4
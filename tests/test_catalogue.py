@@ -0,0 +1,142 @@
+import pymauro
+
+
+def _ids(catalogue, domain_type):
+    return [item['id'] for item in catalogue.items.values() if item['domainType'] == domain_type]
+
+
+def test_sync_reports_only_what_changed(server, catalogue, tmp_path):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    state = pymauro.SyncState(str(tmp_path / "state.json"))
+    changes = client.sync_catalogue(state)
+    assert len(changes.added) == len(catalogue.items) - len(_ids(catalogue, "Classifier"))
+    assert not changes.modified and not changes.deleted
+
+    state = pymauro.SyncState(state.path)
+    assert len(client.sync_catalogue(state)) == 0
+
+    client.close()
+
+
+def test_index_answers_queries(server, catalogue):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    index = client.index_catalogue()
+    client.close()
+    model_id = _ids(catalogue, "DataModel")[0]
+    assert len(index) == len(catalogue.items) - len(_ids(catalogue, "Classifier"))
+    assert index.kind(model_id) == "dataModels"
+    assert set(child['id'] for child in index.children(model_id)) == set(catalogue.children[model_id])
+    assert len(index.find_by_label("Data Model 0", kind="dataModels")) == 2
+    found = index.find_by_metadata(key="key 0", namespace="benchmark", kind="dataModels")
+    assert set(item['id'] for item in found) == set(_ids(catalogue, "DataModel"))
+    classifier = catalogue.items[_ids(catalogue, "Classifier")[0]]
+    assert model_id in [item['id'] for item in index.find_by_classifier(classifier['label'])]
+
+
+def test_snapshot_round_trip(server, catalogue, tmp_path):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    index = client.index_catalogue()
+    client.close()
+    path = str(tmp_path / "catalogue.snapshot")
+    index.write_snapshot(path)
+    model_id = _ids(catalogue, "DataModel")[0]
+    with pymauro.CatalogueSnapshot(path) as snapshot:
+        assert len(snapshot) == len(index)
+        assert snapshot.get(model_id) == index.get(model_id)
+        assert snapshot.kind(model_id) == "dataModels"
+        assert snapshot.metadata(model_id) == [dict(namespace=entry['namespace'], key=entry['key'],
+                                                    value=entry['value']) for entry in index.metadata(model_id)]
+        assert snapshot.children(model_id) == index.children(model_id)
+        assert snapshot.find_by_label("Data Model 0") == index.find_by_label("Data Model 0")
+        restored = snapshot.to_index()
+    assert len(restored) == len(index)
+    assert restored.ancestors(catalogue.children[model_id][0]) == index.ancestors(catalogue.children[model_id][0])
+
+
+def test_sync_finds_changes_in_unchanged_folders(server, catalogue):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    folder_id = _ids(catalogue, "Folder")[0]
+    for number, root in enumerate((None, folder_id)):
+        state = pymauro.SyncState()
+        client.sync_catalogue(state, folder_id=root)
+        model_id = client.create_data_model(folder_id, dict(label="New Model " + str(number))).json()['id']
+        changes = client.sync_catalogue(state, folder_id=root)
+        assert [item['id'] for item in changes.added] == [model_id]
+
+        existing_id = catalogue.children[folder_id][0]
+        client.update_data_class(dict(lastUpdated="203" + str(number) + "-01-01T00:00:00.000Z"), existing_id)
+        changes = client.sync_catalogue(state, folder_id=root)
+        assert [item['id'] for item in changes.modified] == [existing_id]
+        assert not changes.added and not changes.deleted
+    client.close()
+
+
+def test_sync_reports_deleted_subtrees(server, catalogue):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    state = pymauro.SyncState()
+    client.sync_catalogue(state)
+    class_id = next(item['id'] for item in catalogue.items.values()
+                    if item['domainType'] == "DataClass" and 'parentDataClass' not in item)
+    model_id = catalogue.items[class_id]['model']
+    descendants = [class_id] + catalogue.children[class_id] + [
+        element for child in catalogue.children[class_id] for element in catalogue.children.get(child, ())]
+    catalogue.children[model_id].remove(class_id)
+    catalogue.items[model_id]['lastUpdated'] = "2030-01-01T00:00:00.000Z"
+    changes = client.sync_catalogue(state)
+    client.close()
+    assert sorted(item['id'] for item in changes.deleted) == sorted(descendants)
+    assert [item['id'] for item in changes.modified] == [model_id]
+    assert class_id not in state
+
+
+def test_snapshot_keeps_classifier_links(tmp_path):
+    index = pymauro.CatalogueIndex()
+    index.add_item(dict(id="folder", domainType="Folder", label="Folder"))
+    index.add_item(dict(id="model", domainType="DataModel", label="Model"), "folder")
+    index.add_classifier("model", dict(id="classifier", label="Sensitive"))
+    path = str(tmp_path / "catalogue.snapshot")
+    index.write_snapshot(path)
+    with pymauro.CatalogueSnapshot(path) as snapshot:
+        restored = snapshot.to_index()
+    assert [item['id'] for item in restored.find_by_classifier("classifier")] == ["model"]
+    assert [item['id'] for item in restored.find_by_classifier("sensitive")] == ["model"]
+    assert restored.find_by_classifier("other") == []
+
+
+def test_replacing_an_item_drops_its_metadata_and_classifiers(tmp_path):
+    index = pymauro.CatalogueIndex()
+    index.add_item(dict(id="model", domainType="DataModel", label="Model"))
+    index.add_metadata("model", [dict(namespace="ns", key="owner", value="alice")])
+    index.add_classifier("model", dict(id="classifier", label="Sensitive"))
+    index.add_item(dict(id="model", domainType="DataModel", label="Renamed",
+                        classifiers=[dict(id="other", label="Public")]))
+    assert index.metadata("model") == []
+    assert index.find_by_metadata(key="owner") == [] and index.find_by_metadata(namespace="ns") == []
+    assert index.find_by_metadata(key="owner", value="alice") == []
+    assert index.find_by_classifier("classifier") == [] and index.find_by_classifier("sensitive") == []
+    assert [item['label'] for item in index.find_by_classifier("public")] == ["Renamed"]
+    index.add_metadata("model", [dict(namespace="ns", key="owner", value="bob")])
+    assert [entry['value'] for entry in index.metadata("model")] == ["bob"]
+    path = str(tmp_path / "catalogue.snapshot")
+    index.write_snapshot(path)
+    with pymauro.CatalogueSnapshot(path) as snapshot:
+        restored = snapshot.to_index()
+    assert restored.find_by_classifier("classifier") == []
+    assert [item['id'] for item in restored.find_by_classifier("other")] == ["model"]
+
+
+def test_index_walks_child_classifiers(server, catalogue):
+    parent_id = _ids(catalogue, "Classifier")[0]
+    child_id = catalogue.add("Classifier", parent_id, "Child")
+    grandchild_id = catalogue.add("Classifier", child_id, "Grandchild")
+    model = catalogue.items[_ids(catalogue, "DataModel")[-1]]
+    model['classifiers'] = model['classifiers'] + [dict(id=child_id, label="Child"),
+                                                   dict(id=grandchild_id, label="Grandchild")]
+    metrics = pymauro.MetricsRecorder()
+    client = pymauro.BaseClient(server.url, api_key="key", transport=pymauro.Transport(server.url, metrics=metrics))
+    index = client.index_catalogue(metadata=False, max_workers=4)
+    client.close()
+    endpoints = metrics.snapshot()['endpoints']
+    assert endpoints["GET /api/classifiers/{id}/catalogueItems"]['requests'] == len(_ids(catalogue, "Classifier"))
+    assert [item['id'] for item in index.find_by_classifier(child_id)] == [model['id']]
+    assert [item['id'] for item in index.find_by_classifier("grandchild")] == [model['id']]
@@ -0,0 +1,194 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pymauro
+from mock_server import MockMauroServer
+
+
+def _data_model_ids(catalogue):
+    return [item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel"]
+
+
+def test_expired_session_logs_in_once_across_threads(server, catalogue):
+    client = pymauro.BaseClient(server.url, username="user", password="password")
+    assert catalogue.logins == 1
+    catalogue.sessions.clear()
+    model_ids = _data_model_ids(catalogue) * 4
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        statuses = list(executor.map(lambda model_id: client.get_data_model(id_input=model_id).status_code,
+                                     model_ids))
+    client.close()
+    assert statuses == [200] * len(model_ids)
+    assert catalogue.logins == 2
+
+
+def test_concurrent_identical_gets_are_coalesced(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    with MockMauroServer(catalogue, latency=0.2) as server:
+        client = pymauro.BaseClient(server.url, api_key="key")
+        barrier = threading.Barrier(8)
+
+        def get(_):
+            barrier.wait()
+            return client.get_data_model(id_input=model_id).json()['id']
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            ids = list(executor.map(get, range(8)))
+        client.close()
+    assert ids == [model_id] * 8
+    assert catalogue.requests < 8
+
+
+def test_gets_with_a_body_are_neither_coalesced_nor_cached(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    with MockMauroServer(catalogue, latency=0.2) as server:
+        client = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.ResponseCache())
+        barrier = threading.Barrier(2)
+
+        def get(number):
+            barrier.wait()
+            return client.method_constructor("get", dict(number=number), "/api/dataModels/", model_id).status_code
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            assert list(executor.map(get, range(2))) == [200, 200]
+        assert catalogue.requests == 2
+        client.method_constructor("get", dict(number=0), "/api/dataModels/", model_id)
+        assert catalogue.requests == 3
+        client.close()
+
+
+def test_cache_serves_repeated_gets_and_invalidates_on_update(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    client = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.ResponseCache())
+    assert client.get_data_model(id_input=model_id).json()['label'] == "Data Model 0"
+    requests = catalogue.requests
+    client.get_data_model(id_input=model_id)
+    assert catalogue.requests == requests
+    client.update_data_class(dict(label="Renamed"), model_id)
+    assert client.get_data_model(id_input=model_id).json()['label'] == "Renamed"
+    client.close()
+
+
+def test_updating_a_data_model_invalidates_its_folder_listing(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    folder_id = catalogue.items[model_id]['folder']
+    other_id = [item_id for item_id in catalogue.children[None] if item_id != folder_id
+                and catalogue.items[item_id]['domainType'] == "Folder"][0]
+    client = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.ResponseCache())
+    client.get_data_model(folder_id=folder_id)
+    client.get_data_model(folder_id=other_id)
+    client.get_data_classes(model_id)
+    for other_model in catalogue.children[other_id]:
+        client.get_data_classes(other_model)
+    client.update_data_class(dict(label="Renamed"), model_id)
+    listed = client.get_data_model(folder_id=folder_id).json()['items']
+    assert "Renamed" in [item['label'] for item in listed]
+    # Only the entries for the data model and the data model listings are invalidated
+    assert client.cache.stats()['invalidations'] == 3
+    client.close()
+
+
+def test_sqlite_cache_is_shared_between_clients(server, catalogue, tmp_path):
+    model_id = _data_model_ids(catalogue)[0]
+    cache = pymauro.SQLiteCache(str(tmp_path / "cache.sqlite"))
+    first = pymauro.BaseClient(server.url, api_key="key", cache=cache)
+    first.get_data_model(id_input=model_id)
+    requests = catalogue.requests
+    second = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.SQLiteCache(cache.path))
+    assert second.get_data_model(id_input=model_id).json()['id'] == model_id
+    assert catalogue.requests == requests
+    second.update_data_class(dict(label="Renamed"), model_id)
+    assert first.get_data_model(id_input=model_id).json()['label'] == "Renamed"
+    first.close()
+    second.close()
+
+
+def test_sqlite_cache_keeps_its_totals_and_evicts_the_oldest(server, catalogue, tmp_path):
+    model_ids = _data_model_ids(catalogue)
+    cache = pymauro.SQLiteCache(str(tmp_path / "cache.sqlite"), max_entries=3)
+    client = pymauro.BaseClient(server.url, api_key="key", cache=cache)
+    for model_id in model_ids:
+        client.get_data_model(id_input=model_id)
+        client.get_data_classes(model_id)
+    stats = cache.stats()
+    assert stats['entries'] == len(cache) == 3
+    assert stats['evictions'] == 2 * len(model_ids) - 3
+    assert stats['bytes'] == cache._connection.execute("SELECT SUM(size) FROM responses").fetchone()[0]
+    client.update_data_class(dict(label="Renamed"), model_ids[-1])
+    assert cache.stats()['invalidations'] == 2
+    assert len(cache) == 1
+    assert cache._connection.execute("SELECT COUNT(*) FROM tags WHERE path LIKE ?",
+                                     ("%" + model_ids[-1] + "%",)).fetchone()[0] == 0
+    client.close()
+
+
+def test_response_read_before_a_write_is_not_cached_after_it(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    with MockMauroServer(catalogue, latency=dict(GET=0.5)) as server:
+        client = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.ResponseCache())
+        thread = threading.Thread(target=client.get_data_model, kwargs=dict(id_input=model_id))
+        thread.start()
+        time.sleep(0.2)
+        client.update_data_class(dict(label="Renamed"), model_id)
+        thread.join()
+        assert client.get_data_model(id_input=model_id).json()['label'] == "Renamed"
+        client.close()
+
+
+def test_creating_an_item_invalidates_the_listings_of_its_collection(server, catalogue):
+    folder_id = catalogue.children[None][0]
+    client = pymauro.BaseClient(server.url, api_key="key", cache=pymauro.ResponseCache())
+    count = client.get_data_model().json()['count']
+    client.create_data_model(folder_id, dict(label="New Model"))
+    assert client.get_data_model().json()['count'] == count + 1
+    client.close()
+
+
+def test_get_after_a_write_does_not_join_a_get_sent_before_it(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    with MockMauroServer(catalogue, latency=dict(GET=0.5)) as server:
+        client = pymauro.BaseClient(server.url, api_key="key")
+        thread = threading.Thread(target=client.get_data_model, kwargs=dict(id_input=model_id))
+        thread.start()
+        time.sleep(0.2)
+        client.update_data_class(dict(label="Renamed"), model_id)
+        assert client.get_data_model(id_input=model_id).json()['label'] == "Renamed"
+        thread.join()
+        client.close()
+
+
+def test_idle_session_is_renewed_in_the_background(server, catalogue):
+    client = pymauro.BaseClient(server.url, username="user", password="password", session_timeout=0.8)
+    model_id = _data_model_ids(catalogue)[0]
+    cookie = client.cookie
+    catalogue.sessions.clear()
+    deadline = time.monotonic() + 10
+    while client.cookie is cookie and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert catalogue.logins == 2
+    requests = catalogue.requests
+    assert client.get_data_model(id_input=model_id).status_code == 200
+    assert catalogue.requests == requests + 1
+    client.close()
+    assert not client._keep_alive.is_alive()
+
+
+def test_failed_login_is_retried_at_most_every_interval(catalogue, monkeypatch):
+    with MockMauroServer(catalogue, max_logins=1) as server:
+        client = pymauro.BaseClient(server.url, username="user", password="password")
+        model_id = _data_model_ids(catalogue)[0]
+        catalogue.sessions.clear()
+        with pytest.raises(ValueError):  # The html error page refusing the login
+            client.get_data_model(id_input=model_id)
+        assert catalogue.refused_logins == 1
+        statuses = [client.get_data_model(id_input=model_id).status_code for _ in range(3)]
+        assert statuses == [401] * 3
+        assert catalogue.refused_logins == 1
+        server._server.RequestHandlerClass.max_logins = None
+        monkeypatch.setattr(pymauro, "_LOGIN_RETRY_INTERVAL", 0.0)
+        assert client.get_data_model(id_input=model_id).status_code == 200
+        client.close()
+    assert catalogue.logins == 2
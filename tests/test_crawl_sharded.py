@@ -0,0 +1,67 @@
+import json
+import os
+import threading
+import time
+
+import pymauro
+from mock_server import MockMauroServer
+
+
+def _read(path):
+    with open(path) as output:
+        return [json.loads(line) for line in output]
+
+
+def test_crawl_writes_every_item(server, catalogue, tmp_path):
+    output = str(tmp_path / "catalogue.ndjson")
+    results = pymauro.crawl_sharded(server.url, output, api_key="key", processes=2, threads=2)
+    assert all(result.ok for result in results)
+    assert len(results) == 4
+    lines = _read(output)
+    assert len(lines) == len(catalogue.items) - 2
+    assert not os.path.exists(output + ".parts")
+    assert len(pymauro.CatalogueIndex.from_ndjson(output)) == len(lines)
+
+
+def test_interrupted_crawl_resumes_from_its_parts(server, catalogue, tmp_path):
+    output = str(tmp_path / "catalogue.ndjson")
+    model_id = [item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel"][0]
+    os.makedirs(output + ".parts")
+    with open(os.path.join(output + ".parts", model_id + ".ndjson"), "w") as part:
+        part.write(json.dumps(dict(parent=model_id, item=dict(id="checkpointed", label="Checkpointed"))) + "\n")
+    results = pymauro.crawl_sharded(server.url, output, api_key="key", processes=1, threads=2)
+    assert all(result.ok for result in results)
+    assert [result.value for result in results if result.key == model_id] == [None]
+    assert "checkpointed" in [line['item']['id'] for line in _read(output)]
+
+
+def test_workers_that_cannot_log_in_are_not_restarted_forever(catalogue, tmp_path):
+    output = str(tmp_path / "catalogue.ndjson")
+    with MockMauroServer(catalogue, max_logins=1) as server:
+        start = time.monotonic()
+        results = pymauro.crawl_sharded(server.url, output, username="user", password="password", processes=2,
+                                        threads=2, max_attempts=2)
+        elapsed = time.monotonic() - start
+    assert len(results) == 4
+    assert all(isinstance(result.error, RuntimeError) for result in results)
+    assert catalogue.logins == 1
+    assert elapsed < 30
+    assert os.path.exists(output + ".parts") and not os.path.exists(output)
+
+
+def test_worker_that_fails_to_start_is_restarted(catalogue, tmp_path):
+    output = str(tmp_path / "catalogue.ndjson")
+    with MockMauroServer(catalogue, max_logins=1) as server:
+
+        def allow_logins():
+            while not catalogue.refused_logins:
+                time.sleep(0.01)
+            server._server.RequestHandlerClass.max_logins = None
+
+        thread = threading.Thread(target=allow_logins, daemon=True)
+        thread.start()
+        results = pymauro.crawl_sharded(server.url, output, username="user", password="password", processes=1,
+                                        threads=2)
+    assert all(result.ok for result in results)
+    assert catalogue.refused_logins == 1
+    assert len(_read(output)) == len(catalogue.items) - 2
@@ -0,0 +1,62 @@
+import io
+import json
+
+import pytest
+import requests
+
+import pymauro
+
+ITEMS = [dict(id="1", label="Ünïcødé – 数据类 🙂", value=1234567890.125, count=-42, tags=[]),
+         dict(id="2", label="plain", value=1e-7, nested=dict(items=[1, 2, 3]), empty={}),
+         dict(id="3", label="", value=None, flag=True)]
+
+
+def _response(body, encoding='utf-8'):
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = io.BytesIO(body)
+    response.encoding = encoding
+    return response
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 65536])
+def test_items_are_decoded_whatever_the_chunk_size(chunk_size):
+    body = json.dumps(dict(count=len(ITEMS), items=ITEMS, after="ignored"), ensure_ascii=False).encode('utf-8')
+    assert list(pymauro.iter_json_items(_response(body), chunk_size=chunk_size)) == ITEMS
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 7])
+def test_numbers_are_not_cut_at_chunk_boundaries(chunk_size):
+    numbers = [1234567, -98765.4321, 1e+21, 0, 31415926535]
+    body = json.dumps(dict(items=numbers)).encode('utf-8')
+    assert list(pymauro.iter_json_items(_response(body), chunk_size=chunk_size)) == numbers
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7])
+def test_top_level_array_yields_its_entries(chunk_size):
+    body = json.dumps(ITEMS, ensure_ascii=False).encode('utf-8')
+    assert list(pymauro.iter_json_items(_response(body), chunk_size=chunk_size)) == ITEMS
+
+
+def test_empty_items_and_empty_bodies_yield_nothing():
+    assert list(pymauro.iter_json_items(_response(b'{"count": 0, "items": []}'), chunk_size=1)) == []
+    assert list(pymauro.iter_json_items(_response(b' [ ] '), chunk_size=1)) == []
+    assert list(pymauro.iter_json_items(_response(b'{}'), chunk_size=1)) == []
+
+
+@pytest.mark.parametrize("body", [b'{"items": [{"id": "1"}, {"id": "2"', b'{"items": [{"id": "1"}', b'{"items": [1, 2',
+                                  b'{"items": [', b''])
+def test_truncated_body_raises_value_error(body):
+    with pytest.raises(ValueError):
+        list(pymauro.iter_json_items(_response(body), chunk_size=2))
+
+
+def test_stream_data_classes_matches_the_listing(server, catalogue):
+    client = pymauro.BaseClient(server.url, api_key="key")
+    model_id = next(item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel")
+    streamed = list(client.stream_data_classes(model_id))
+    listed = list(client.iter_data_classes(model_id))
+    typed = list(client.stream_data_classes(model_id, typed=True))
+    client.close()
+    assert streamed and [item['id'] for item in streamed] == [item['id'] for item in listed]
+    assert [item.id for item in typed] == [item['id'] for item in streamed]
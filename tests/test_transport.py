@@ -0,0 +1,39 @@
+import pymauro
+from mock_server import MockMauroServer
+
+
+class _Counter(pymauro.Metrics):
+
+    def __init__(self):
+        self.requests = []
+
+    def record_request(self, endpoint, status, elapsed, request_bytes, response_bytes, retries, reused, error=None):
+        self.requests.append((endpoint, status))
+
+
+def test_limiter_resends_every_request_refused_with_429(catalogue):
+    with MockMauroServer(catalogue, max_in_flight=0) as server:
+        metrics = _Counter()
+        transport = pymauro.Transport(server.url, metrics=metrics,
+                                      limiter=pymauro.AdaptiveLimiter(max_retries=2))
+        assert transport.request("get", "/api/folders", headers=dict(apiKey="key")).status_code == 429
+        assert len(metrics.requests) == 3
+        del metrics.requests[:]
+        response = transport.request("post", "/api/folders", headers=dict(apiKey="key"), json=dict(label="New"))
+        assert response.status_code == 429
+        assert len(metrics.requests) == 3
+        transport.close()
+
+
+def test_limiter_only_resends_requests_answered_503_that_may_be_retried(catalogue):
+    with MockMauroServer(catalogue, max_in_flight=0, overload_status=503) as server:
+        metrics = _Counter()
+        transport = pymauro.Transport(server.url, metrics=metrics,
+                                      limiter=pymauro.AdaptiveLimiter(max_retries=2))
+        assert transport.request("get", "/api/folders", headers=dict(apiKey="key")).status_code == 503
+        assert len(metrics.requests) == 3
+        del metrics.requests[:]
+        response = transport.request("post", "/api/folders", headers=dict(apiKey="key"), json=dict(label="New"))
+        assert response.status_code == 503
+        assert len(metrics.requests) == 1
+        transport.close()
@@ -0,0 +1,57 @@
+import pymauro
+
+
+def _data_model_ids(catalogue):
+    return [item['id'] for item in catalogue.items.values() if item['domainType'] == "DataModel"]
+
+
+def test_repeated_updates_are_merged_into_one_request(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    client = pymauro.BaseClient(server.url, api_key="key")
+    requests = catalogue.requests
+    with pymauro.WriteBehindQueue(client, max_delay=60) as writes:
+        futures = [writes.update_data_class(dict(description="Version " + str(number)), model_id)
+                   for number in range(10)]
+        futures.append(writes.update_data_class(dict(label="Renamed"), model_id))
+        assert writes.flush(timeout=10)
+    client.close()
+    assert catalogue.requests == requests + 1
+    assert len(set(id(future.result()) for future in futures)) == 1
+    assert catalogue.items[model_id]['description'] == "Version 9"
+    assert catalogue.items[model_id]['label'] == "Renamed"
+
+
+def test_repeated_metadata_writes_send_the_latest_value(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    client = pymauro.BaseClient(server.url, api_key="key")
+    with pymauro.WriteBehindQueue(client, max_delay=60) as writes:
+        futures = [writes.post_metadata("dataModels", model_id, "test", "status", str(number))
+                   for number in range(5)]
+        assert writes.flush(timeout=10)
+    client.close()
+    assert [future.result(timeout=1).status_code for future in futures] == [201] * 5
+    entries = [entry for entry in catalogue.metadata[model_id] if entry['namespace'] == "test"]
+    assert [entry['value'] for entry in entries] == ["4"]
+
+
+def test_failed_request_sets_the_exception(catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    client = pymauro.BaseClient("http://127.0.0.1:9", api_key="key",
+                                transport=pymauro.Transport("http://127.0.0.1:9", retries=0))
+    with pymauro.WriteBehindQueue(client, max_delay=60) as writes:
+        future = writes.update_data_class(dict(label="Renamed"), model_id)
+        assert writes.flush(timeout=10)
+    client.close()
+    assert isinstance(future.exception(timeout=1), pymauro.requests.RequestException)
+
+
+def test_every_future_is_resolved_when_a_write_cannot_be_sent(server, catalogue):
+    model_id = _data_model_ids(catalogue)[0]
+    client = pymauro.BaseClient(server.url, api_key="key")
+    with pymauro.WriteBehindQueue(client, max_delay=60) as writes:
+        update = writes.update_data_class(dict(description={1, 2}), model_id)
+        metadata = writes.post_metadata("dataModels", model_id, "test", "status", "draft")
+        assert writes.flush(timeout=10)
+    client.close()
+    assert isinstance(update.exception(timeout=1), TypeError)
+    assert metadata.result(timeout=1).status_code == 201